@@ -9,12 +9,17 @@ if str(ROOT) not in sys.path:
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
 
 # Import your custom modules
-from src.data.yahoo import get_candles_yahoo
-from src.strategies.portfolio_allocation import compute_portfolio_equity
-from src.metrics.risk_analysis import compute_risk_metrics
+from src.data.service import get_data_service
+from src.strategies.portfolio_allocation import compute_portfolio_equity_from_returns
+from src.metrics.risk_analysis import compute_return_stats, volatility_metrics
+from src.viz.downsample import downsample_xy, points_budget
+from src.viz.performance import performance_expander, performance_toggle, start_page_trace
+from src.tracing import span
+from src import telemetry
+
+TRACE = start_page_trace("portfolio")
 
 # Page title (avoid set_page_config here if it's already set in main app)
 st.title("Quant B - Multi-Asset Portfolio Manager")
@@ -48,16 +53,20 @@ if len(selected_assets) > 0:
         weights = {k: 1.0 / len(selected_assets) for k in selected_assets}
 
 run_btn = st.sidebar.button("Run Simulation")
+performance_toggle()
 
 # DATA LOADING (robust + debug)
 @st.cache_data(ttl=300)
-def load_data(tickers):
+def load_data(tickers, period: str = "1y"):
+    telemetry.cache_miss()
     data = {}
     errors = {}
 
     for t in tickers:
         try:
-            df = get_candles_yahoo(t, period="1y", interval="1d")
+            df = get_data_service(snapshot_dir=str(ROOT / "data" / "snapshot")).get_candles(
+                t, interval="1d", period=period
+            )
 
             if df is None or df.empty:
                 errors[t] = "empty dataframe"
@@ -81,6 +90,48 @@ def load_data(tickers):
     return prices, errors
 
 
+# Weight-independent state, shared per (assets, window): returns matrix,
+# covariance, correlation heatmap and the asset traces. A slider move then only
+# costs a dot product (portfolio returns) and w.T * Cov * w (portfolio vol).
+@st.cache_resource(ttl=300)
+def load_risk_model(tickers: tuple, window: str = "1y") -> dict:
+    telemetry.cache_miss()
+    with telemetry.cache_lookup("st.load_data"):
+        df_prices, errors = load_data(list(tickers), period=window)
+    if df_prices.empty:
+        return {"prices": df_prices, "errors": errors}
+
+    returns, cov_matrix, corr_matrix = compute_return_stats(df_prices)
+
+    # Normalize prices to base 100 for valid visual comparison
+    norm_prices = (df_prices / df_prices.iloc[0]) * 100
+    asset_traces = {
+        asset: downsample_xy(norm_prices.index, norm_prices[asset], points_budget(1280))
+        for asset in norm_prices.columns
+    }
+
+    # Same figure object on every rerun -> unchanged chart spec, not re-rendered
+    import plotly.express as px  # only needed once per asset set
+
+    fig_corr = px.imshow(
+        corr_matrix,
+        text_auto=".2f",
+        color_continuous_scale="RdBu_r",
+        zmin=-1,
+        zmax=1,
+    )
+
+    return {
+        "prices": df_prices,
+        "errors": errors,
+        "returns": returns,
+        "cov": cov_matrix,
+        "corr": corr_matrix,
+        "asset_traces": asset_traces,
+        "fig_corr": fig_corr,
+    }
+
+
 # MAIN LOGIC 
 if run_btn or selected_assets:
     if len(selected_assets) < 3:
@@ -88,7 +139,10 @@ if run_btn or selected_assets:
         st.stop()
 
     st.info(f"Fetching data for: {', '.join(selected_assets)}...")
-    df_prices, errors = load_data(selected_assets)
+    with span("page.load_risk_model"):
+        with telemetry.cache_lookup("st.load_risk_model"):
+            risk_model = load_risk_model(tuple(selected_assets), "1y")
+    df_prices, errors = risk_model["prices"], risk_model["errors"]
 
     if errors:
         with st.expander("Data load debug (click to expand)"):
@@ -100,37 +154,41 @@ if run_btn or selected_assets:
         st.error("No data found. Please check your internet connection or ticker symbols.")
         st.stop()
 
-    # 1) Compute Portfolio Strategy
-    port_results = compute_portfolio_equity(df_prices, weights)
+    # 1) Compute Portfolio Strategy (cached returns matrix, only weights change)
+    with span("page.portfolio"):
+        port_results = compute_portfolio_equity_from_returns(risk_model["returns"], weights)
 
-    # 2) Compute Risk Metrics
-    corr_matrix, vol_metrics = compute_risk_metrics(df_prices, weights)
+    # 2) Compute Risk Metrics (cached covariance)
+    with span("page.risk"):
+        vol_metrics = volatility_metrics(risk_model["cov"], weights)
 
     #DISPLAY: VISUAL COMPARISON 
     st.subheader("Performance Comparison: Assets vs Portfolio")
 
-    # Normalize prices to base 100 for valid visual comparison
-    norm_prices = (df_prices / df_prices.iloc[0]) * 100
+    # Server-side downsampling (LTTB) keeps long histories light in the browser
+    budget = points_budget(1280)
 
     fig = go.Figure()
 
-    # Plot individual assets (faded lines)
+    # Plot individual assets (faded lines, precomputed per asset set)
     for asset in selected_assets:
-        if asset in norm_prices.columns:
+        if asset in risk_model["asset_traces"]:
+            x_ds, y_ds = risk_model["asset_traces"][asset]
             fig.add_trace(
                 go.Scatter(
-                    x=norm_prices.index,
-                    y=norm_prices[asset],
+                    x=x_ds,
+                    y=y_ds,
                     name=asset,
                     opacity=0.5,
                 )
             )
 
     # Plot Portfolio (strong line)
+    x_ds, y_ds = downsample_xy(port_results.index, port_results["equity_curve"], budget)
     fig.add_trace(
         go.Scatter(
-            x=port_results.index,
-            y=port_results["equity_curve"],
+            x=x_ds,
+            y=y_ds,
             name="PORTFOLIO",
             line=dict(color="black", width=4),
         )
@@ -141,7 +199,8 @@ if run_btn or selected_assets:
         yaxis_title="Normalized Value (Base 100)",
         legend=dict(orientation="h"),
     )
-    st.plotly_chart(fig, use_container_width=True)
+    with span("page.plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
 
     #DISPLAY: METRICS & RISK 
     col1, col2 = st.columns(2)
@@ -164,11 +223,7 @@ if run_btn or selected_assets:
 
     with col2:
         st.subheader("Correlation Matrix")
-        fig_corr = px.imshow(
-            corr_matrix,
-            text_auto=".2f",
-            color_continuous_scale="RdBu_r",
-            zmin=-1,
-            zmax=1,
-        )
-        st.plotly_chart(fig_corr, use_container_width=True)
\ No newline at end of file
+        with span("page.plotly_corr"):
+            st.plotly_chart(risk_model["fig_corr"], use_container_width=True, key="corr_heatmap")
+
+performance_expander(TRACE)
\ No newline at end of file
@@ -12,11 +12,18 @@ import plotly.graph_objects as go
 
 from streamlit_autorefresh import st_autorefresh
 
-from src.data.finnhub import get_quote as raw_get_quote
-from src.data.yahoo import get_candles_yahoo as raw_get_candles_yahoo
+from src.data.bars import PriceBars
+from src.data.export import EXPORT_FORMATS, export_file
+from src.data.middleware import fetch_deadline
+from src.data.service import get_data_service
+from src.data.snapshot import load_snapshot
 from src.strategies.buy_hold import buy_and_hold
 from src.strategies.momentum import momentum_strategy
 from src.metrics.performance import compute_metrics
+from src.viz.downsample import downsample_xy, points_budget
+from src.viz.performance import performance_expander, performance_toggle, start_page_trace
+from src.tracing import span
+from src import telemetry
 
 
 
@@ -27,6 +34,8 @@ st.set_page_config(
     page_icon="📈",
     layout="wide",
 )
+TRACE = start_page_trace("single_asset")
+
 def load_css():
     css_path = ROOT / ".streamlit" / "style.css"
     if css_path.exists():
@@ -41,19 +50,56 @@ st_autorefresh(interval=5 * 60 * 1000, key="auto_refresh_5min")
 PARIS_NOW = datetime.now(ZoneInfo("Europe/Paris"))
 
 
-# Cached data fetch wrappers
-@st.cache_data(ttl=300)
+# Shared background data service: one refresher thread per process feeds every
+# session from immutable snapshots, so viewers don't multiply provider calls.
+# On a cold start it is seeded from the cron snapshot (data/snapshot) and
+# revalidated in the background.
+SNAPSHOT_DIR = ROOT / "data" / "snapshot"
+QUOTE_DEADLINE_S = 3.0  # seconds the header quote may take before the page moves on
+DEFAULT_INITIAL_VALUE = 100.0  # the snapshot stores backtests for this value only
+
+
 def get_quote(symbol: str):
-    return raw_get_quote(symbol)
+    return get_data_service(snapshot_dir=str(SNAPSHOT_DIR)).get_quote(symbol)
 
 
-@st.cache_data(ttl=300)
-def get_candles_yahoo(symbol: str, interval: str, period: str) -> pd.DataFrame:
-    return raw_get_candles_yahoo(symbol, interval=interval, period=period)
+def load_bars(symbol: str, interval: str, period: str) -> PriceBars:
+    # validated once per fetch: strategies and metrics skip their copies and sorts
+    return get_data_service(snapshot_dir=str(SNAPSHOT_DIR)).get_bars(symbol, interval=interval, period=period)
 
 
-def load_prices(symbol: str, interval: str, period: str) -> pd.DataFrame:
-    return get_candles_yahoo(symbol, interval=interval, period=period)
+# Precomputed backtest and metrics from the cron snapshot (default settings)
+@st.cache_data(ttl=300)
+def snapshot_backtest(symbol: str, interval: str, period: str, strategy: str, lookback: int):
+    telemetry.cache_miss()
+    snap = load_snapshot(SNAPSHOT_DIR)
+    if snap is None:
+        return None
+    stored = snap.backtest(symbol, interval, period, strategy, lookback)
+    metrics = snap.metrics(symbol, interval, period, strategy, lookback)
+    if stored is None or metrics is None:
+        return None
+    return stored, metrics
+
+
+def restore_backtest(prices: pd.DataFrame, stored: pd.DataFrame, strategy: str) -> pd.DataFrame | None:
+    """
+    Strategy output for `prices` rebuilt from a stored backtest, or None if the
+    backtest was run on other bars (candles refreshed since the snapshot).
+    """
+    if len(stored) != len(prices) or not pd.Index(stored["timestamp"]).equals(pd.Index(prices["timestamp"])):
+        return None
+    out = prices.copy(deep=False)
+    out["ret"] = stored["ret"].to_numpy()
+    if strategy == "Buy & Hold":
+        out["equity_bh"] = stored["equity"].to_numpy()
+    else:
+        out["mom"] = stored["mom"].to_numpy()
+        out["signal"] = stored["signal"].to_numpy().astype(int)
+        out["signal_lag"] = stored["signal_lag"].to_numpy().astype(int)
+        out["strat_ret"] = stored["strat_ret"].to_numpy()
+        out["equity_mom"] = stored["equity"].to_numpy()
+    return out
 
 
 def format_pct(x: float) -> str:
@@ -74,7 +120,7 @@ st.markdown(
         <div><b>Last updated (Paris)</b></div>
         <div>{}</div>
         <div style="margin-top:6px; font-size:12px;">
-          Auto-refresh: <b>5 min</b> • Cache TTL: <b>300s</b>
+          Auto-refresh: <b>5 min</b> • Shared data refresh: <b>300s</b>
         </div>
       </div>
     </div>
@@ -109,7 +155,16 @@ with st.sidebar:
         step=10.0,
     )
 
-    st.info("Auto-refresh every 5 minutes.\n\nData fetches are cached for 300s to avoid API spamming.")
+    st.subheader("Chart")
+    chart_width = st.select_slider(
+        "Chart resolution (screen width, px)",
+        options=[800, 1280, 1920, 2560, 3840],
+        value=1280,
+    )
+    downsample_method = st.selectbox("Downsampling", options=["LTTB", "Min/Max envelope"], index=0)
+    performance_toggle()
+
+    st.info("Auto-refresh every 5 minutes.\n\nData is refreshed every 300s by one shared background service to avoid API spamming.")
 
 
 
@@ -120,7 +175,9 @@ kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns([1.2, 1, 1, 1, 1])
 last = None
 dp = None
 try:
-    q = get_quote(asset)
+    # the quote is optional: a slow Finnhub answer must not hold up the page
+    with span("page.quote"), fetch_deadline(QUOTE_DEADLINE_S):
+        q = get_quote(asset)
     last = q.get("c", None)
     dp = q.get("dp", None)
     kpi1.metric(
@@ -132,19 +189,34 @@ except Exception as e:
     kpi1.warning(f"Finnhub quote unavailable: {e}")
 
 # Load prices
-prices = load_prices(asset, interval, period)
+with span("page.load_prices"):
+    bars = load_bars(asset, interval, period)
+    prices = bars.frame
 
-# Strategy computation
+# Strategy computation (skipped when the snapshot already holds it for these bars)
 if strategy == "Buy & Hold":
-    out = buy_and_hold(prices, initial_value=float(initial_value))
-    equity_col = "equity_bh"
-    ret_col = "ret"
+    equity_col, ret_col, run_lookback = "equity_bh", "ret", 0
 else:
-    out = momentum_strategy(prices, lookback=int(lookback), initial_value=float(initial_value))
-    equity_col = "equity_mom"
-    ret_col = "strat_ret"
-
-m = compute_metrics(out, equity_col=equity_col, ret_col=ret_col)
+    equity_col, ret_col, run_lookback = "equity_mom", "strat_ret", int(lookback)
+
+out, m = None, None
+if float(initial_value) == DEFAULT_INITIAL_VALUE:
+    with span("page.snapshot_backtest"):
+        with telemetry.cache_lookup("st.snapshot_backtest"):
+            stored = snapshot_backtest(asset, interval, period, strategy, run_lookback)
+        if stored is not None:
+            out = restore_backtest(prices, stored[0], strategy)
+            m = stored[1] if out is not None else None
+
+if out is None:
+    with span("page.strategy"):
+        if strategy == "Buy & Hold":
+            out = buy_and_hold(bars, initial_value=float(initial_value))
+        else:
+            out = momentum_strategy(bars, lookback=int(lookback), initial_value=float(initial_value))
+
+    with span("page.metrics"):
+        m = compute_metrics(out, equity_col=equity_col, ret_col=ret_col)
 
 # Performance KPIs
 kpi2.metric("Total return", format_pct(m["total_return"]))
@@ -164,11 +236,36 @@ with tab_overview:
     if strategy == "Momentum":
         title += f" • lookback={lookback}"
 
+    # Server-side downsampling: send at most ~2 points per pixel. A box selection
+    # on the chart zooms in and re-samples that window at the full budget.
+    budget = points_budget(chart_width)
+    method = "lttb" if downsample_method == "LTTB" else "minmax"
+
+    chart_state = st.session_state.get("price_chart")
+    boxes = chart_state["selection"]["box"] if chart_state and chart_state.get("selection") else []
+    if boxes and boxes[0].get("x"):
+        box_x = tuple(sorted(boxes[0]["x"]))[:2]
+        # apply each new box once (the selection stays in widget state after "Reset zoom")
+        if box_x != st.session_state.get("zoom_box_seen"):
+            st.session_state["zoom_box_seen"] = box_x
+            st.session_state["zoom_range"] = box_x
+    zoom_range = st.session_state.get("zoom_range")
+
+    with span("page.downsample"):
+        x_price, y_price = downsample_xy(out["timestamp"], out["close"], budget, method=method, x_range=zoom_range)
+        x_eq, y_eq = downsample_xy(out["timestamp"], out[equity_col], budget, method=method, x_range=zoom_range)
+        if zoom_range is not None and len(x_price) == 0:
+            # window no longer in the data (new period / asset)
+            st.session_state.pop("zoom_range", None)
+            zoom_range = None
+            x_price, y_price = downsample_xy(out["timestamp"], out["close"], budget, method=method)
+            x_eq, y_eq = downsample_xy(out["timestamp"], out[equity_col], budget, method=method)
+
     fig = go.Figure()
     fig.add_trace(
         go.Scatter(
-            x=out["timestamp"],
-            y=out["close"],
+            x=x_price,
+            y=y_price,
             name="Price",
             yaxis="y1",
             mode="lines",
@@ -176,8 +273,8 @@ with tab_overview:
     )
     fig.add_trace(
         go.Scatter(
-            x=out["timestamp"],
-            y=out[equity_col],
+            x=x_eq,
+            y=y_eq,
             name="Strategy equity",
             yaxis="y2",
             mode="lines",
@@ -209,12 +306,23 @@ with tab_overview:
         ),
     )
 
-    st.plotly_chart(fig, width="stretch")
+    fig.update_layout(dragmode="select", selectdirection="h")
+    # Plotly figure -> JSON serialization happens here
+    with span("page.plotly_chart"):
+        st.plotly_chart(fig, width="stretch", key="price_chart", on_select="rerun", selection_mode="box")
+
+    if zoom_range is not None:
+        z1, z2 = st.columns([4, 1])
+        z1.caption(f"Zoomed: {zoom_range[0]} → {zoom_range[1]}")
+        if z2.button("Reset zoom"):
+            st.session_state.pop("zoom_range", None)
+            st.rerun()
 
     # Quick context line
     st.caption(
         f"Data: Yahoo intraday ({interval}, {period}). Strategy: {strategy}. "
-        f"Auto-refresh 5 min, cache TTL 300s."
+        f"Plotted {len(x_price):,} of {len(out):,} bars ({downsample_method}). "
+        f"Auto-refresh 5 min, shared data refresh 300s."
     )
 
 with tab_strategy:
@@ -271,12 +379,15 @@ with tab_strategy:
 
     st.divider()
     st.subheader("Download backtest output")
-    csv_bytes = out.to_csv(index=False).encode("utf-8")
+    export_fmt = st.radio("Format", options=list(EXPORT_FORMATS), index=0, horizontal=True)
+    ext, mime = EXPORT_FORMATS[export_fmt]
+    # The file is only generated when the button is clicked (streamed in chunks)
     st.download_button(
-        label="⬇️ Download backtest CSV",
-        data=csv_bytes,
-        file_name=f"{asset}_{interval}_{period}_{strategy.replace(' ', '_')}.csv",
-        mime="text/csv",
+        label=f"⬇️ Download backtest {export_fmt}",
+        data=lambda: export_file(out, export_fmt),
+        file_name=f"{asset}_{interval}_{period}_{strategy.replace(' ', '_')}{ext}",
+        mime=mime,
+        on_click="ignore",
     )
 
 with tab_data:
@@ -290,7 +401,7 @@ with tab_data:
 
     st.caption(
         "Note: Yahoo intraday data can sometimes have missing bars. "
-        "Caching reduces repeated API calls."
+        "A shared background service avoids repeated API calls."
     )
 
-
+performance_expander(TRACE)
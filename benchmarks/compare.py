@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.run import DEFAULT_HISTORY
+
+
+def load_history(path: str | Path) -> list[dict]:
+    p = Path(path)
+    if not p.exists():
+        return []
+    return [json.loads(line) for line in p.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def _key(r: dict) -> tuple:
+    return (r["bench"], r["scale"], r["size"], r.get("days"))
+
+
+def compare_runs(
+    base: dict,
+    new: dict,
+    time_threshold: float = 0.10,
+    memory_threshold: float = 0.10,
+    min_seconds: float = 0.001,
+) -> list[dict]:
+    """
+    Per-case ratios new/base for the cases present in both runs.
+    Times are compared on the best of the repeated runs (least sensitive to noise).
+    A case regresses when its time grows by more than `time_threshold`
+    (and by more than `min_seconds`, to ignore timer noise on tiny cases) or its
+    peak memory grows by more than `memory_threshold`.
+    """
+    base_by_key = {_key(r): r for r in base["results"]}
+    rows = []
+    for r in new["results"]:
+        b = base_by_key.get(_key(r))
+        if b is None:
+            continue
+        t_ratio = r["seconds_min"] / b["seconds_min"] if b["seconds_min"] > 0 else float("inf")
+        slower = t_ratio > 1.0 + time_threshold and r["seconds_min"] - b["seconds_min"] > min_seconds
+
+        m_ratio, bigger = None, False
+        if r.get("peak_mb") is not None and b.get("peak_mb"):
+            m_ratio = r["peak_mb"] / b["peak_mb"]
+            bigger = m_ratio > 1.0 + memory_threshold
+
+        rows.append(
+            {
+                "bench": r["bench"],
+                "scale": r["scale"],
+                "size": r["size"],
+                "base_ms": b["seconds_min"] * 1000,
+                "new_ms": r["seconds_min"] * 1000,
+                "time_ratio": t_ratio,
+                "memory_ratio": m_ratio,
+                "regression": slower or bigger,
+            }
+        )
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs and flag regressions.")
+    parser.add_argument("--history", default=str(DEFAULT_HISTORY))
+    parser.add_argument("--base", type=int, default=-2, help="Index of the baseline run in the history (default: previous run)")
+    parser.add_argument("--new", type=int, default=-1, help="Index of the run to check (default: latest run)")
+    parser.add_argument("--base-commit", default=None, help="Use the latest run of this commit as baseline")
+    parser.add_argument("--time-threshold", type=float, default=0.10, help="Allowed relative slowdown (default: 0.10)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="Allowed relative memory growth (default: 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(f"Need at least two runs in {args.history} (found {len(history)}).")
+        return 2
+
+    new = history[args.new]
+    if args.base_commit:
+        matches = [h for h in history if h.get("commit") == args.base_commit and h is not new]
+        if not matches:
+            print(f"No run recorded for commit {args.base_commit}.")
+            return 2
+        base = matches[-1]
+    else:
+        base = history[args.base]
+
+    if base["env"] != new["env"]:
+        print("Warning: runs come from different environments, ratios may not be comparable.")
+    print(f"base: {base['run_at']} ({base.get('commit')})   new: {new['run_at']} ({new.get('commit')})\n")
+
+    rows = compare_runs(base, new, args.time_threshold, args.memory_threshold)
+    for r in rows:
+        mem = f"mem x{r['memory_ratio']:.2f}" if r["memory_ratio"] is not None else ""
+        flag = "REGRESSION" if r["regression"] else ""
+        print(
+            f"{r['bench']:<34} {r['scale']}={r['size']:<9} {r['base_ms']:10.2f} -> {r['new_ms']:10.2f} ms"
+            f"  x{r['time_ratio']:.2f}  {mem:<10} {flag}"
+        )
+
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above threshold.")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
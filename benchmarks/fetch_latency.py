@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import numpy as np
+
+from src.data import providers
+from src.data.finnhub import get_quote
+from src.data.middleware import FetchPolicy, ResilientProvider
+from src.scheduler.daemon import load_script
+
+# Tail latency of provider calls against the local stub server
+# (scripts/replay_server.py): concurrent "sessions" fetch quotes for a few
+# symbols while the server adds latency, a slow tail and HTTP 503s. Each
+# policy runs the same seeded workload.
+
+POLICIES = {
+    "none": None,
+    "retries": FetchPolicy(retries=2, backoff_seconds=0.05, coalesce=False),
+    "retries+hedge": FetchPolicy(retries=2, backoff_seconds=0.05, hedge=True, coalesce=False),
+    "retries+hedge+coalesce": FetchPolicy(retries=2, backoff_seconds=0.05, hedge=True, coalesce=True),
+}
+
+
+def run_workload(provider, sessions: int, requests: int, symbols: list[str], seed: int) -> dict:
+    providers.set_provider(provider)
+    latencies, errors = [], []
+    lock = threading.Lock()
+    start = threading.Barrier(sessions)
+
+    def session(i: int):
+        rng = random.Random(seed + i)
+        start.wait()
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            try:
+                get_quote(rng.choice(symbols))
+                with lock:
+                    latencies.append(time.perf_counter() - t0)
+            except Exception as e:  # noqa: BLE001 - counted, the workload goes on
+                with lock:
+                    errors.append(type(e).__name__)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    ms = np.array(latencies) * 1000.0
+    q = (lambda p: round(float(np.percentile(ms, p)), 1)) if len(ms) else (lambda p: None)
+    return {
+        "calls": sessions * requests,
+        "errors": len(errors),
+        "p50_ms": q(50),
+        "p95_ms": q(95),
+        "p99_ms": q(99),
+        "max_ms": round(float(ms.max()), 1) if len(ms) else None,
+        "wall_s": round(wall, 2),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch middleware tail latency against the local stub server.")
+    parser.add_argument("--policy", nargs="*", default=None, choices=list(POLICIES), help="Policies to run (default: all)")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--requests", type=int, default=100, help="Calls per session")
+    parser.add_argument("--symbols", type=int, default=3, help="Distinct symbols (fewer = more identical requests)")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Share of responses in the slow tail")
+    parser.add_argument("--slow-ms", type=float, default=500.0)
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of HTTP 503 responses")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    replay_server = load_script(ROOT / "scripts" / "replay_server.py")
+    symbols = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "TSLA", "JPM"][: max(1, args.symbols)]
+    previous = providers.get_provider()
+    results = {}
+    try:
+        for name in args.policy or list(POLICIES):
+            # fresh server per policy: same seeded latency / error sequence
+            server = replay_server.make_server(
+                0, record_dir=tempfile.mkdtemp(), synthetic=True, seed=args.seed,
+                latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                slow_rate=args.slow_rate, slow_ms=args.slow_ms, error_rate=args.error_rate,
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            inner = providers.ReplayProvider(url=f"http://127.0.0.1:{server.server_address[1]}")
+            policy = POLICIES[name]
+            provider = inner if policy is None else ResilientProvider(inner, policy)
+            res = run_workload(provider, args.sessions, args.requests, symbols, args.seed)
+            res["upstream"] = server.stats["served"] + server.stats["errors"]
+            results[name] = res
+            server.shutdown()
+            server.server_close()
+    finally:
+        providers.set_provider(previous)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    cols = ["calls", "errors", "upstream", "p50_ms", "p95_ms", "p99_ms", "max_ms", "wall_s"]
+    print(f"{'policy':<24}" + "".join(f"{c:>10}" for c in cols))
+    for name, res in results.items():
+        print(f"{name:<24}" + "".join(f"{str(res[c]):>10}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
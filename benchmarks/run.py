@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import synthetic_daily, synthetic_ohlcv, synthetic_universe
+from src.data.bars import PriceBars
+from src.data.storage import iter_csv_chunks, upsert_csv
+from src.metrics.performance import compute_metrics
+from src.metrics.risk_analysis import compute_risk_metrics
+from src.models.linear_forecast import forecast_next_day_ols, forecast_next_day_ols_from_daily
+from src.models.panel_forecast import forecast_universe_ols
+from src.strategies.buy_hold import buy_and_hold
+from src.strategies.momentum import momentum_strategy
+from src.strategies.parallel import parallel_backtest
+from src.strategies.portfolio_allocation import compute_portfolio_equity
+from src.strategies.streaming import streaming_backtest
+
+DEFAULT_HISTORY = ROOT / "benchmarks" / "results" / "history.jsonl"
+
+
+@dataclass
+class Bench:
+    """
+    setup(size) builds the inputs (not timed) and returns the zero-argument call to time.
+    `scale` says what `size` means: rows of one series, or number of assets.
+    """
+    name: str
+    scale: str  # "rows" | "assets"
+    setup: Callable[..., Callable[[], object]]
+
+
+def _upsert_setup(rows: int, workdir: Path):
+    df = synthetic_ohlcv(rows)
+    base, new = df.iloc[: int(rows * 0.9)], df.iloc[int(rows * 0.8):]  # 10% overlap
+    path = workdir / f"upsert_{rows}.csv"
+    base.to_csv(path, index=False)
+    return lambda: upsert_csv(new, str(path))
+
+
+def _bh_setup(rows: int, workdir: Path):
+    df = synthetic_ohlcv(rows)
+    return lambda: buy_and_hold(df)
+
+
+def _mom_setup(rows: int, workdir: Path):
+    df = synthetic_ohlcv(rows)
+    return lambda: momentum_strategy(df, lookback=20)
+
+
+def _mom_parallel_setup(rows: int, workdir: Path):
+    df = synthetic_ohlcv(rows, freq="1min")
+    return lambda: parallel_backtest(df, strategy="momentum", lookback=20, freq="MS")
+
+
+def _mom_stream_setup(rows: int, workdir: Path, chunksize: int = 100_000):
+    # reads the stored CSV itself: compare with momentum_strategy + compute_metrics on a loaded frame
+    path = workdir / f"stream_{rows}.csv"
+    synthetic_ohlcv(rows).drop_duplicates(subset=["timestamp", "asset"]).to_csv(path, index=False)
+    return lambda: streaming_backtest(iter_csv_chunks(str(path), chunksize=chunksize), strategy="momentum")
+
+
+def _rerun_setup(rows: int, workdir: Path):
+    # single-asset dashboard rerun on candles held by the data service (validated once per fetch)
+    bars = PriceBars.from_frame(synthetic_ohlcv(rows))
+
+    def rerun():
+        out = momentum_strategy(bars, lookback=20)
+        return compute_metrics(out, equity_col="equity_mom", ret_col="strat_ret")
+
+    return rerun
+
+
+def _metrics_setup(rows: int, workdir: Path):
+    out = buy_and_hold(synthetic_ohlcv(rows))
+    return lambda: compute_metrics(out, equity_col="equity_bh", ret_col="ret")
+
+
+def _forecast_setup(rows: int, workdir: Path):
+    daily = synthetic_daily(rows)
+    return lambda: forecast_next_day_ols_from_daily(daily)
+
+
+def _intraday_forecast_setup(rows: int, workdir: Path, days: int = 500):
+    # intraday candles spread over `days` days, so even small sizes have enough daily rows to fit
+    freq = f"{int(days * 86_400 / rows)}s"
+    candles = synthetic_ohlcv(rows, freq=freq)
+    return lambda: forecast_next_day_ols(candles)
+
+
+def _weights(prices: pd.DataFrame) -> dict:
+    return {c: 1.0 / prices.shape[1] for c in prices.columns}
+
+
+def _portfolio_setup(assets: int, workdir: Path, days: int = 2520):
+    prices = synthetic_universe(assets, days, missing_frac=0.0)
+    weights = _weights(prices)
+    return lambda: compute_portfolio_equity(prices, weights)
+
+
+def _risk_setup(assets: int, workdir: Path, days: int = 2520):
+    prices = synthetic_universe(assets, days, missing_frac=0.0)
+    weights = _weights(prices)
+    return lambda: compute_risk_metrics(prices, weights)
+
+
+def _universe_setup(assets: int, workdir: Path, days: int = 2520):
+    closes = synthetic_universe(assets, days)
+    return lambda: forecast_universe_ols(closes)
+
+
+BENCHES = {
+    b.name: b
+    for b in [
+        Bench("upsert_csv", "rows", _upsert_setup),
+        Bench("buy_and_hold", "rows", _bh_setup),
+        Bench("momentum_strategy", "rows", _mom_setup),
+        Bench("momentum_parallel", "rows", _mom_parallel_setup),
+        Bench("momentum_streaming", "rows", _mom_stream_setup),
+        Bench("compute_metrics", "rows", _metrics_setup),
+        Bench("dashboard_rerun", "rows", _rerun_setup),
+        Bench("forecast_next_day_ols", "rows", _intraday_forecast_setup),
+        Bench("forecast_next_day_ols_from_daily", "rows", _forecast_setup),
+        Bench("compute_portfolio_equity", "assets", _portfolio_setup),
+        Bench("compute_risk_metrics", "assets", _risk_setup),
+        Bench("forecast_universe_ols", "assets", _universe_setup),
+    ]
+}
+
+
+def time_call(call: Callable[[], object], repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def peak_memory_mb(call: Callable[[], object]) -> float:
+    """
+    Peak Python + NumPy allocations of one call (tracemalloc), in MB.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def run_bench(bench: Bench, size: int, repeat: int, memory: bool, workdir: Path, days: int) -> dict:
+    if bench.scale == "assets":
+        call = bench.setup(size, workdir, days=days)
+    else:
+        call = bench.setup(size, workdir)
+    call()  # warm-up (lazy imports, caches)
+    times = time_call(call, repeat)
+    return {
+        "bench": bench.name,
+        "scale": bench.scale,
+        "size": size,
+        "days": days if bench.scale == "assets" else None,
+        "repeat": repeat,
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "peak_mb": peak_memory_mb(call) if memory else None,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "node": platform.node(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile the core functions on synthetic data.")
+    parser.add_argument("--bench", nargs="*", default=None, choices=sorted(BENCHES), help="Benchmarks to run (default: all)")
+    parser.add_argument("--rows", nargs="*", type=int, default=[1_000, 10_000, 100_000],
+                        help="Series lengths for row-scaled benchmarks (up to 10_000_000)")
+    parser.add_argument("--assets", nargs="*", type=int, default=[1, 10, 100],
+                        help="Universe sizes for asset-scaled benchmarks (up to 1000)")
+    parser.add_argument("--days", type=int, default=2520, help="Days per asset for asset-scaled benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (min and median are kept)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run (faster)")
+    parser.add_argument("--label", default=None, help="Free-text label stored with the run")
+    parser.add_argument("--output", default=str(DEFAULT_HISTORY), help="JSON-lines history file to append to")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    names = args.bench or list(BENCHES)
+
+    results = []
+    workdir = Path(tempfile.mkdtemp(prefix="bench_"))
+    try:
+        for name in names:
+            bench = BENCHES[name]
+            for size in (args.rows if bench.scale == "rows" else args.assets):
+                res = run_bench(bench, size, args.repeat, not args.no_memory, workdir, args.days)
+                results.append(res)
+                mem = f"{res['peak_mb']:9.1f} MB" if res["peak_mb"] is not None else ""
+                print(f"{name:<34} {bench.scale}={size:<9} {res['seconds_median'] * 1000:10.2f} ms  {mem}", flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    record = {
+        "run_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "label": args.label,
+        "env": environment(),
+        "results": results,
+    }
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(f"\nAppended {len(results)} results to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
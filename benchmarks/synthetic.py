@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def gbm_paths(
+    n_steps: int,
+    n_assets: int = 1,
+    mu: float = 0.08,
+    sigma: float = 0.25,
+    dt: float = 1.0 / 252,
+    s0: float = 100.0,
+    market_beta: float = 0.6,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Geometric Brownian motion prices, shape (n_steps, n_assets).
+    Assets share one market factor (correlation ~ market_beta^2) so covariance
+    and portfolio benchmarks work on realistic, non-diagonal data.
+    """
+    rng = np.random.default_rng(seed)
+    market = rng.standard_normal((n_steps, 1))
+    idio = rng.standard_normal((n_steps, n_assets))
+    z = market_beta * market + np.sqrt(1.0 - market_beta ** 2) * idio
+    log_ret = (mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z
+    log_ret[0] = 0.0
+    return s0 * np.exp(np.cumsum(log_ret, axis=0))
+
+
+def synthetic_ohlcv(
+    n_rows: int,
+    asset: str = "SYN",
+    freq: str = "5min",
+    start: str = "2000-01-03",
+    gap_frac: float = 0.02,
+    dup_frac: float = 0.001,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Candles shaped like get_candles_yahoo (timestamp, asset, open, high, low, close, volume).
+
+    - gap_frac: share of bars removed in contiguous blocks (halts, missing data)
+    - dup_frac: share of bars repeated with the same timestamp (provider re-sends)
+    Returns about `n_rows` rows, sorted by timestamp (duplicates adjacent).
+    """
+    rng = np.random.default_rng(seed)
+    n_total = int(n_rows / (1.0 - gap_frac)) + 1
+    steps_per_year = pd.Timedelta(days=365) / pd.Timedelta(freq)
+    close = gbm_paths(n_total, 1, dt=1.0 / steps_per_year, seed=seed)[:, 0]
+    ts = pd.date_range(start, periods=n_total, freq=freq, tz="UTC")
+
+    # gaps: drop blocks of 1..20 consecutive bars
+    keep = np.ones(n_total, dtype=bool)
+    n_drop = n_total - n_rows
+    while n_drop > 0:
+        length = min(n_drop, int(rng.integers(1, 21)))
+        at = int(rng.integers(1, max(2, n_total - length)))
+        n_drop -= int(keep[at:at + length].sum())
+        keep[at:at + length] = False
+    idx = np.flatnonzero(keep)[:n_rows]
+
+    c = close[idx]
+    o = np.concatenate([[c[0]], c[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.001, len(c)))
+    df = pd.DataFrame(
+        {
+            "timestamp": ts[idx],
+            "asset": asset,
+            "open": o,
+            "high": np.maximum(o, c) * (1.0 + spread),
+            "low": np.minimum(o, c) * (1.0 - spread),
+            "close": c,
+            "volume": rng.lognormal(10.0, 1.0, len(c)).round(),
+        }
+    )
+
+    n_dup = int(len(df) * dup_frac)
+    if n_dup:
+        dups = df.iloc[rng.choice(len(df), n_dup, replace=False)]
+        df = pd.concat([df, dups]).sort_values("timestamp", kind="stable").reset_index(drop=True)
+    return df
+
+
+def synthetic_daily(n_days: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Daily closes shaped like data/aapl_daily.csv (date, close).
+    """
+    close = gbm_paths(n_days, 1, seed=seed)[:, 0]
+    dates = pd.bdate_range("2000-01-03", periods=n_days)
+    return pd.DataFrame({"date": dates.strftime("%Y-%m-%d"), "close": close})
+
+
+def synthetic_universe(n_assets: int, n_days: int, missing_frac: float = 0.001, seed: int = 0) -> pd.DataFrame:
+    """
+    Wide daily close matrix (index: date, columns: tickers) like get_daily_closes_yahoo,
+    with a few scattered missing closes.
+    """
+    rng = np.random.default_rng(seed)
+    closes = gbm_paths(n_days, n_assets, seed=seed)
+    if missing_frac:
+        mask = rng.random(closes.shape) < missing_frac
+        mask[0] = False
+        closes[mask] = np.nan
+    return pd.DataFrame(
+        closes,
+        index=pd.bdate_range("2000-01-03", periods=n_days, name="date"),
+        columns=[f"SYN{i:04d}" for i in range(n_assets)],
+    )
@@ -0,0 +1,65 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.backfill import backfill_candles, checkpoint_path_for  # noqa: E402
+from src.data.ratelimit import TokenBucket  # noqa: E402
+
+# Long Finnhub histories (e.g. years of 1-minute bars) fetched in windows, in
+# parallel under a rate limit, merged into a candles CSV. Interrupted runs
+# resume from the checkpoint written next to the output.
+
+
+def _unix(value: str) -> int:
+    return int(pd.Timestamp(value, tz="UTC").timestamp())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill Finnhub candles into a CSV, window by window.")
+    parser.add_argument("symbol")
+    parser.add_argument("--resolution", default="1", help="Finnhub resolution: 1, 5, 15, 30, 60, D, W, M")
+    parser.add_argument("--start", required=True, help="First date/time (UTC), e.g. 2021-01-01")
+    parser.add_argument("--end", default=None, help="Last date/time (UTC, default: now)")
+    parser.add_argument("--output", default=None, help="Candles CSV (default: data/finnhub_<symbol>_<resolution>.csv)")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint JSON (default: <output>.backfill.json)")
+    parser.add_argument("--max-bars", type=int, default=5_000, help="Bars of wall-clock time per request window")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent requests")
+    parser.add_argument("--rate", type=float, default=1.0, help="Requests per second (free tier: 60/minute)")
+    parser.add_argument("--burst", type=int, default=1, help="Requests allowed back to back")
+    parser.add_argument("--retries", type=int, default=3, help="Extra attempts per window")
+    parser.add_argument("--flush-every", type=int, default=20, help="Windows merged into the CSV at a time")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    output = Path(args.output or ROOT / "data" / f"finnhub_{args.symbol.lower()}_{args.resolution}.csv")
+    end = _unix(args.end) if args.end else int(time.time())
+
+    summary = backfill_candles(
+        args.symbol,
+        args.resolution,
+        _unix(args.start),
+        end,
+        output,
+        checkpoint_path=args.checkpoint or checkpoint_path_for(output),
+        max_bars=args.max_bars,
+        workers=args.workers,
+        limiter=TokenBucket(args.rate, args.burst),
+        retries=args.retries,
+        flush_every=args.flush_every,
+    )
+    print(json.dumps({"output": str(output), **summary}, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.storage import iter_csv_chunks  # noqa: E402
+from src.strategies.streaming import streaming_backtest  # noqa: E402
+
+# Backtest a candles CSV (as written by upsert_csv) chunk by chunk: memory is
+# bounded by --chunksize, so years of 1-minute bars don't have to fit in RAM.
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core backtest of a stored candles CSV.")
+    parser.add_argument("path", help="Candles CSV (timestamp, asset, open, high, low, close, volume)")
+    parser.add_argument("--asset", default=None, help="Keep one asset of a multi-asset file")
+    parser.add_argument("--strategy", choices=["buy_and_hold", "momentum"], default="buy_and_hold")
+    parser.add_argument("--lookback", type=int, default=20, help="Momentum lookback (bars)")
+    parser.add_argument("--initial-value", type=float, default=100.0)
+    parser.add_argument("--chunksize", type=int, default=500_000, help="Rows per chunk")
+    parser.add_argument("--output", default=None, help="Also write the backtest rows to this CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    sink = None
+    if args.output:
+        out_path = Path(args.output)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.unlink(missing_ok=True)
+
+        def sink(chunk):
+            chunk.to_csv(out_path, mode="a", header=not out_path.exists(), index=False)
+
+    metrics = streaming_backtest(
+        iter_csv_chunks(args.path, chunksize=args.chunksize, asset=args.asset),
+        strategy=args.strategy,
+        lookback=args.lookback,
+        initial_value=args.initial_value,
+        sink=sink,
+    )
+    print(json.dumps(metrics, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
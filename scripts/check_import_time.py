@@ -0,0 +1,185 @@
+import argparse
+import ast
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Import-time budgets per entry point (milliseconds, -X importtime total, median
+# of --runs runs). pandas alone varies by 350-600 ms between runs on the same
+# machine, so each budget sits about 30% above the slowest median measured:
+# a failure means a new heavy import, not noise.
+#   - BUDGETS_MS: imports that run before first paint, i.e. the module-level
+#     imports up to the first `st.` call of a Streamlit page (all module-level
+#     imports for other entry points)
+#   - FULL_BUDGETS_MS: every import statement in the file, deferred ones
+#     included (chart libraries imported after first paint or in a function body)
+# Only the file's own import statements are measured; imports deferred inside
+# the modules it imports are not.
+BUDGETS_MS = {
+    "app/streamlit_app.py": 2000,
+    "app/pages/2_Forecast.py": 1600,
+    "app/pages/3_Portfolio.py": 1600,
+    "scripts/generate_daily_report.py": 1100,
+    "scripts/generate_portfolio_report.py": 1100,
+    "scripts/fetch_daily_yahoo.py": 1200,
+    "scripts/write_dashboard_snapshot.py": 1100,
+    "src/data/yahoo.py": 1000,
+    "src/models/linear_forecast.py": 800,
+}
+FULL_BUDGETS_MS = {
+    "app/streamlit_app.py": 2000,
+    "app/pages/2_Forecast.py": 2800,
+    "app/pages/3_Portfolio.py": 2600,
+}
+
+# Imports that are part of the path setup, not of the entry point's dependencies
+_SKIP = {"__future__", "sys", "pathlib"}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _calls_streamlit(node: ast.AST) -> bool:
+    return any(
+        isinstance(n, ast.Call)
+        and isinstance(n.func, ast.Attribute)
+        and isinstance(n.func.value, ast.Name)
+        and n.func.value.id == "st"
+        for n in ast.walk(node)
+    )
+
+
+def _import_nodes(node: ast.AST):
+    # import statements under `node`, function and class bodies included
+    for child in ast.walk(node):
+        if isinstance(child, (ast.Import, ast.ImportFrom)):
+            yield child
+
+
+def _source(node: ast.Import | ast.ImportFrom) -> Optional[str]:
+    names = [a.name for a in node.names] if isinstance(node, ast.Import) else [node.module or ""]
+    if all(n.split(".")[0] in _SKIP for n in names):
+        return None
+    return ast.unparse(node)
+
+
+def module_level_imports(path: Path) -> list[str]:
+    """
+    Source of the module-level import statements of `path` that run before the
+    first Streamlit call.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    stmts = []
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and _calls_streamlit(node):
+            break
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and (src := _source(node)) is not None:
+            stmts.append(src)
+    return stmts
+
+
+def all_imports(path: Path) -> list[str]:
+    """
+    Source of every import statement of `path`: module level, after the first
+    Streamlit call, nested in blocks and in function bodies.
+    """
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    return [src for node in _import_nodes(tree) if (src := _source(node)) is not None]
+
+
+def measure(path: Path, runs: int = 5, full: bool = False) -> dict:
+    """
+    Run the entry point's imports (`all_imports` if `full`, else
+    `module_level_imports`) in a fresh interpreter with -X importtime.
+    Returns the median total (ms) over `runs` and the slowest top-level imports of that run.
+    """
+    imports = all_imports(path) if full else module_level_imports(path)
+    code = "\n".join([f"import sys; sys.path.insert(0, {str(ROOT)!r})"] + imports)
+    samples = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Import of {path} failed:\n{proc.stderr[-2000:]}")
+
+        total_us = 0
+        top = []
+        for line in proc.stderr.splitlines():
+            m = _LINE.match(line)
+            if not m:
+                continue
+            self_us, cumulative_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+            total_us += self_us
+            if len(indent) <= 1:
+                top.append((cumulative_us, name))
+        top.sort(reverse=True)
+        samples.append((total_us, top))
+
+    samples.sort(key=lambda sample: sample[0])
+    total_us, top = samples[len(samples) // 2]
+    return {
+        "total_ms": total_us / 1000.0,
+        "top": [{"module": n, "ms": us / 1000.0} for us, n in top[:5]],
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time of entry points and enforce budgets.")
+    parser.add_argument("entries", nargs="*", help="Entry point files (default: all budgeted entries)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per entry, the median is kept (default: 5)")
+    parser.add_argument("--output", default=None, help="Append results as one JSON line to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    entries = args.entries or list(BUDGETS_MS)
+
+    results = {}
+    failed = []
+    for entry in entries:
+        res = measure(ROOT / entry, runs=args.runs)
+        full = measure(ROOT / entry, runs=args.runs, full=True)
+        res["budget_ms"] = BUDGETS_MS.get(entry)
+        res["full_ms"] = full["total_ms"]
+        res["full_budget_ms"] = FULL_BUDGETS_MS.get(entry)
+        res["full_top"] = full["top"]
+        results[entry] = res
+
+        over = [
+            label
+            for label, total, budget in (("first paint", res["total_ms"], res["budget_ms"]),
+                                         ("full", res["full_ms"], res["full_budget_ms"]))
+            if budget is not None and total > budget
+        ]
+        if over:
+            failed.append(f"{entry} ({', '.join(over)})")
+        slowest = ", ".join(f"{t['module']} {t['ms']:.0f}ms" for t in res["top"][:3])
+        print(
+            f"{entry:<40} {res['total_ms']:8.0f} ms  (budget {res['budget_ms'] or '-'})  "
+            f"full {res['full_ms']:6.0f} ms  (budget {res['full_budget_ms'] or '-'})  "
+            f"{'OVER BUDGET' if over else 'OK'}  [{slowest}]"
+        )
+
+    if args.output:
+        record = {"measured_at": datetime.now(timezone.utc).isoformat(), "python": sys.version.split()[0], "results": results}
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    if failed:
+        print(f"\nImport-time budget exceeded: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
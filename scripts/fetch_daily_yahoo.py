@@ -1,24 +1,22 @@
+import sys
 from pathlib import Path
-import yfinance as yf
 import pandas as pd
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from src.data.providers import get_provider  # noqa: E402
+
 
 def main():
-    root = Path(__file__).resolve().parents[1]
-    data_dir = root / "data"
+    data_dir = ROOT / "data"
     data_dir.mkdir(parents=True, exist_ok=True)
 
     symbol = "AAPL"
     out_path = data_dir / "aapl_daily.csv"
 
     # 2 years gives enough daily points for OLS intervals
-    df = yf.download(
-        symbol,
-        period="2y",
-        interval="1d",
-        auto_adjust=False,
-        progress=False,
-    )
+    df = get_provider().yahoo_download(symbol, interval="1d", period="2y", auto_adjust=False)
 
     if df is None or df.empty:
         raise RuntimeError("Yahoo download returned empty data.")
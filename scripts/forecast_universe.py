@@ -0,0 +1,69 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.universe import load_universe  # noqa: E402
+from src.data.yahoo import get_daily_closes_yahoo  # noqa: E402
+from src.models.panel_forecast import forecast_universe_ols  # noqa: E402
+from src import telemetry  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Nightly next-day OLS forecast for a ticker universe.")
+    parser.add_argument("--symbols", nargs="*", default=None, help="Tickers (e.g. AAPL MSFT KO)")
+    parser.add_argument("--symbols-file", default=None, help="Text file with one ticker per line")
+    parser.add_argument("--input", default=None, help="Use an existing wide daily close CSV instead of downloading")
+    parser.add_argument("--period", default="2y", help="Yahoo history period (default: 2y)")
+    parser.add_argument("--lags", type=int, default=5)
+    parser.add_argument("--vol-window", type=int, default=10)
+    parser.add_argument("--momentum-lookback", type=int, default=10)
+    parser.add_argument("--alpha", type=float, default=0.05, help="0.05 = 95%% prediction interval")
+    parser.add_argument("--output", default=str(ROOT / "data" / "universe_forecast.csv"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    t0 = time.perf_counter()
+
+    if args.input:
+        closes = pd.read_csv(args.input, index_col="date", parse_dates=["date"])
+    else:
+        symbols = load_universe(args.symbols, args.symbols_file)
+        closes = get_daily_closes_yahoo(symbols, period=args.period)
+        closes_path = ROOT / "data" / "universe_daily.csv"
+        closes_path.parent.mkdir(parents=True, exist_ok=True)
+        closes.to_csv(closes_path)
+        print(f"Wrote daily closes: {closes_path} (dates={len(closes)}, tickers={closes.shape[1]})")
+    t_data = time.perf_counter()
+
+    table = forecast_universe_ols(
+        closes,
+        lags=args.lags,
+        vol_window=args.vol_window,
+        momentum_lookback=args.momentum_lookback,
+        alpha=args.alpha,
+    )
+    t_fit = time.perf_counter()
+
+    out_path = Path(args.output)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(out_path)
+
+    skipped = sorted(set(closes.columns) - set(table.index))
+    print(f"Wrote forecast table: {out_path} (tickers={len(table)}, skipped={len(skipped)})")
+    if skipped:
+        print(f"Skipped (not enough history): {', '.join(map(str, skipped))}")
+    print(f"Timing: data {t_data - t0:.2f}s, fit {t_fit - t_data:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
+    telemetry.dump("forecast_universe")
@@ -1,51 +1,70 @@
+import argparse
 import sys
+import time
 from pathlib import Path
 from datetime import datetime, timezone
 
-sys.path.append(str(Path(__file__).resolve().parents[1]))
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
 
-from src.data.yahoo import get_candles_yahoo
-from src.strategies.buy_hold import buy_and_hold
-from src.metrics.performance import compute_metrics
+from src.data.universe import load_universe
+from src.reports.daily import generate_reports, write_index
+from src import telemetry
 
 
-def main():
-    asset = "AAPL"
-    interval = "5m"
-    period = "5d"
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Daily Buy & Hold report for one or many assets.")
+    parser.add_argument("--symbols", nargs="*", default=None, help="Tickers (default: AAPL)")
+    parser.add_argument("--symbols-file", default=None, help="Text file with one ticker per line")
+    parser.add_argument("--interval", default="5m")
+    parser.add_argument("--period", default="5d")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--fetch-concurrency", type=int, default=4, help="Max simultaneous downloads")
+    parser.add_argument("--out-dir", default=str(Path("report") / "daily"))
+    parser.add_argument(
+        "--cache-dir",
+        default=str(ROOT / ".cache" / "pipeline"),
+        help="Stage outputs of previous runs; unchanged stages are skipped",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage")
+    parser.add_argument("--format", nargs="+", choices=["md", "html"], default=["md"], help="Report formats (default: md)")
+    return parser.parse_args(argv)
 
-    prices = get_candles_yahoo(asset, interval=interval, period=period)
-    out = buy_and_hold(prices, initial_value=100.0)
 
-    metrics = compute_metrics(out, equity_col="equity_bh", ret_col="ret")
+def main(argv=None):
+    args = parse_args(argv)
+    assets = load_universe(args.symbols or (None if args.symbols_file else ["AAPL"]), args.symbols_file)
 
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    out_dir = Path("report") / "daily"
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{today}_{asset}.md"
-
-    last_close = float(out["close"].iloc[-1])
-    first_close = float(out["close"].iloc[0])
-
-    md = []
-    md.append(f"# Daily Report — {asset}")
-    md.append(f"- Date (UTC): **{today}**")
-    md.append("")
-    md.append("## Latest data")
-    md.append(f"- First close: **{first_close:.2f}**")
-    md.append(f"- Last close: **{last_close:.2f}**")
-    md.append("")
-    md.append("## Buy & Hold metrics (annualized where applicable)")
-    md.append(f"- Total return: **{metrics['total_return']*100:.2f}%**")
-    md.append(f"- Volatility: **{metrics['volatility']*100:.2f}%**")
-    md.append(f"- Sharpe: **{metrics['sharpe']:.2f}**")
-    md.append(f"- Max drawdown: **{metrics['max_drawdown']*100:.2f}%**")
-    md.append("")
-    md.append(f"_Data source: Yahoo intraday ({interval}, {period})._")
-
-    out_path.write_text("\n".join(md), encoding="utf-8")
-    print(f"Wrote report: {out_path.resolve()}")
+    t0 = time.perf_counter()
+
+    results = generate_reports(
+        assets,
+        interval=args.interval,
+        period=args.period,
+        out_dir=args.out_dir,
+        today=today,
+        workers=args.workers,
+        fetch_concurrency=args.fetch_concurrency,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        formats=tuple(args.format),
+    )
+
+    for r in results:
+        if r["status"] == "ok":
+            print(f"Wrote report: {Path(r['path']).resolve()}  [{r['stages']}]")
+        else:
+            print(f"[{r['asset']}] FAILED: {r['error']}")
+
+    if len(results) > 1:
+        for fmt in args.format:
+            index_path = write_index(results, args.out_dir, today, args.interval, args.period, fmt=fmt)
+            print(f"Wrote index: {index_path.resolve()}")
+
+    n_ok = sum(r["status"] == "ok" for r in results)
+    print(f"Done: {n_ok}/{len(results)} assets in {time.perf_counter() - t0:.1f}s")
 
 
 if __name__ == "__main__":
     main()
+    telemetry.dump("generate_daily_report")
@@ -1,9 +1,8 @@
+import argparse
 import sys
-import os
 from pathlib import Path
 from datetime import datetime
 import pandas as pd
-import numpy as np
 
 # --- SETUP PATH ---
 # Move up 1 level (scripts/ -> root) to find 'src' directory
@@ -15,8 +14,73 @@ if str(ROOT) not in sys.path:
 from src.data.yahoo import get_candles_yahoo
 from src.strategies.portfolio_allocation import compute_portfolio_equity
 from src.metrics.risk_analysis import compute_risk_metrics
+from src.pipeline.dag import Pipeline, Stage
+from src import telemetry
+from src.reports.render import render, sparkline_points
 
-def generate_daily_report():
+
+def _fetch_close(asset: str, period: str, interval: str) -> pd.Series:
+    try:
+        df = get_candles_yahoo(asset, period=period, interval=interval)
+    except Exception as e:
+        print(f"Error fetching {asset}: {e}")
+        return pd.Series(dtype=float)
+    return df.set_index("timestamp")["close"] if not df.empty else pd.Series(dtype=float)
+
+
+def _align(*closes: pd.Series, assets: list) -> pd.DataFrame:
+    prices = {a: s for a, s in zip(assets, closes) if not s.empty}
+    if not prices:
+        raise ValueError("No data retrieved.")
+    return pd.DataFrame(prices).dropna()
+
+
+def _portfolio(df_prices: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    return compute_portfolio_equity(df_prices, weights)
+
+
+def _risk(df_prices: pd.DataFrame, weights: dict) -> pd.DataFrame:
+    corr, vol_metrics = compute_risk_metrics(df_prices, weights)
+    return vol_metrics
+
+
+def _render(port_res: pd.DataFrame, vol_metrics: pd.DataFrame, weights: dict, today: str) -> str:
+    # Extract latest values for the report
+    return render(
+        "portfolio.txt.j2",
+        today=today,
+        current_val=port_res["equity_curve"].iloc[-1],
+        daily_return=port_res["port_ret"].iloc[-1],
+        portfolio_vol=vol_metrics.loc["PORTFOLIO", "Volatility"],
+        spark=sparkline_points(port_res["equity_curve"], n_points=40),
+        n_days=len(port_res),
+        weights=weights,
+    ) + "\n"
+
+
+def portfolio_pipeline(assets: list, weights: dict, today: str, cache_dir=None) -> Pipeline:
+    """
+    fetch (per asset) -> align -> portfolio / risk -> render.
+    Fetches always run; everything downstream is reused when the prices are unchanged.
+    """
+    # Fetch 3 months of data to ensure enough points for volatility calculation
+    fetches = [
+        Stage(f"fetch:{a}", _fetch_close, params={"asset": a, "period": "3mo", "interval": "1d"}, always_run=True)
+        for a in assets
+    ]
+    return Pipeline(
+        fetches
+        + [
+            Stage("prices", _align, deps=tuple(s.name for s in fetches), params={"assets": list(assets)}),
+            Stage("portfolio", _portfolio, deps=("prices",), params={"weights": weights}),
+            Stage("risk", _risk, deps=("prices",), params={"weights": weights}),
+            Stage("render", _render, deps=("portfolio", "risk"), params={"weights": weights, "today": today}),
+        ],
+        cache_dir=cache_dir,
+    )
+
+
+def generate_daily_report(cache_dir=None):
     """
     Generates a daily text report with portfolio metrics.
     Intended to be run via CRON or task scheduler.
@@ -26,49 +90,40 @@ def generate_daily_report():
     # Fixed Configuration for the report
     assets = ["AAPL", "MSFT", "KO"]
     weights = {"AAPL": 0.33, "MSFT": 0.33, "KO": 0.34}
-    
-    # Data Retrieval
-    print("Fetching data...")
-    prices = {}
-    for asset in assets:
-        try:
-            # Fetch 3 months of data to ensure enough points for volatility calculation
-            df = get_candles_yahoo(asset, period="3mo", interval="1d")
-            if not df.empty:
-                prices[asset] = df.set_index("timestamp")["close"]
-        except Exception as e:
-            print(f"Error fetching {asset}: {e}")
+    today = datetime.now().strftime("%Y-%m-%d")
 
-    if not prices:
-        print("No data retrieved. Aborting.")
+    print("Fetching data...")
+    pipe = portfolio_pipeline(assets, weights, today, cache_dir=cache_dir)
+    try:
+        report = pipe.run(targets=["render"])["render"]
+    except Exception as e:
+        print(f"{e} Aborting.")
         return
 
-    df_prices = pd.DataFrame(prices).dropna()
-    
-    # Calculations (Strategy & Risk)
-    port_res = compute_portfolio_equity(df_prices, weights)
-    corr, vol_metrics = compute_risk_metrics(df_prices, weights)
-    
-    # Extract latest values for the report
-    current_val = port_res["equity_curve"].iloc[-1]
-    daily_return = port_res["port_ret"].iloc[-1]
-    portfolio_vol = vol_metrics.loc["PORTFOLIO", "Volatility"]
-
-    # Write report to file
-    today = datetime.now().strftime("%Y-%m-%d")
     # Save report to project root for easy access
     report_filename = ROOT / f"portfolio_report_{today}.txt"
-    
-    with open(report_filename, "w") as f:
-        f.write(f"=== DAILY PORTFOLIO REPORT : {today} ===\n\n")
-        f.write(f"Total Portfolio Value (Base 100): {current_val:.2f}\n")
-        f.write(f"Daily Return: {daily_return:.2%}\n")
-        f.write(f"Annualized Volatility: {portfolio_vol:.2%}\n")
-        f.write("\n--- Asset Allocation ---\n")
-        for a, w in weights.items():
-            f.write(f" - {a}: {w*100}%\n")
-    
+    report_filename.write_text(report)
+
+    print(f"Stages: {pipe.summary()}")
     print(f"Report saved to: {report_filename}")
 
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Daily portfolio report (Quant B).")
+    parser.add_argument(
+        "--cache-dir",
+        default=str(ROOT / ".cache" / "pipeline" / "portfolio"),
+        help="Stage outputs of previous runs; unchanged stages are skipped",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Recompute every stage")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    generate_daily_report(cache_dir=None if args.no_cache else args.cache_dir)
+
+
 if __name__ == "__main__":
-    generate_daily_report()
\ No newline at end of file
+    main()
+    telemetry.dump("generate_portfolio_report")
@@ -0,0 +1,220 @@
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.providers import DEFAULT_RECORD_DIR, frame_to_bytes  # noqa: E402
+from src.data.ratelimit import TokenBucket  # noqa: E402
+
+# Local stand-in for Yahoo/Finnhub: serves the files written in record mode
+# (QUANT_PROVIDER_MODE=record) to clients in replay mode with QUANT_REPLAY_URL
+# pointing here, adding configurable latency, throttling (HTTP 429) and errors.
+
+_PERIOD_DAYS = {"d": 1, "wk": 7, "mo": 30, "y": 365}
+_INTERVAL_MINUTES = {"m": 1, "h": 60, "d": 24 * 60, "wk": 7 * 24 * 60, "mo": 30 * 24 * 60}
+
+
+def _split(value: str) -> tuple[int, str]:
+    digits = "".join(ch for ch in value if ch.isdigit())
+    return int(digits or 1), value[len(digits):]
+
+
+def synthetic_payload(key: str, params: dict) -> bytes:
+    """
+    Deterministic made-up payload for a recording key (seeded by the symbol),
+    shaped like the provider's response.
+    """
+    import pandas as pd
+
+    from benchmarks.synthetic import synthetic_ohlcv
+
+    provider, op = key.split("/")[:2]
+    symbols = params.get("symbols") or params.get("symbol") or "SYN"
+    seed = sum(map(ord, symbols))
+
+    if provider == "yahoo":
+        interval = params.get("interval", "1d")
+        n, unit = _split(params.get("period", "1mo"))
+        days = n * _PERIOD_DAYS.get(unit, 30)
+        step_n, step_unit = _split(interval)
+        minutes = step_n * _INTERVAL_MINUTES.get(step_unit, 24 * 60)
+        # ~6.5 trading hours a day intraday, ~252 days a year daily
+        n_rows = max(2, int(days * 390 / minutes) if minutes < 24 * 60 else int(days * 252 / 365 * 24 * 60 / minutes))
+        frames = {}
+        for i, sym in enumerate(symbols.split(",")):
+            bars = synthetic_ohlcv(n_rows, sym, freq=f"{minutes}min", gap_frac=0.0, dup_frac=0.0, seed=seed + i)
+            frames[sym] = bars.set_index("timestamp")[["open", "high", "low", "close", "volume"]].rename(columns=str.title)
+        df = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index(axis=1)
+        df.columns.names = ["Price", "Ticker"]
+        df.index.name = "Datetime" if minutes < 24 * 60 else "Date"
+        if minutes >= 24 * 60:
+            df.index = df.index.tz_localize(None)
+            df[[("Adj Close", s) for s in frames]] = df[[("Close", s) for s in frames]].values
+        return frame_to_bytes(df)
+
+    if op == "quote":
+        bars = synthetic_ohlcv(2, symbols, freq="1D", gap_frac=0.0, dup_frac=0.0, seed=seed)
+        prev, last = float(bars["close"].iloc[0]), float(bars["close"].iloc[1])
+        body = {"c": last, "d": last - prev, "dp": (last / prev - 1) * 100, "h": float(bars["high"].iloc[1]),
+                "l": float(bars["low"].iloc[1]), "o": float(bars["open"].iloc[1]), "pc": prev, "t": int(time.time())}
+        return json.dumps(body).encode()
+
+    resolution = params.get("resolution", "5")
+    minutes = {"D": 24 * 60, "W": 7 * 24 * 60, "M": 30 * 24 * 60}.get(resolution) or int(resolution)
+    if "from" in params and "to" in params:
+        # explicit window (backfill): bars on the resolution grid inside [from, to]
+        step = minutes * 60
+        first = -(-int(params["from"]) // step) * step
+        n_rows = (int(params["to"]) - first) // step + 1
+        if n_rows <= 0:
+            return json.dumps({"s": "no_data"}).encode()
+        bars = synthetic_ohlcv(n_rows, symbols, freq=f"{minutes}min", start=pd.Timestamp(first, unit="s", tz="UTC"),
+                               gap_frac=0.0, dup_frac=0.0, seed=seed + first // step)
+        bars = bars[bars["timestamp"] <= pd.Timestamp(int(params["to"]), unit="s", tz="UTC")]
+    else:
+        lookback = int(params.get("lookback_days", 5))
+        n_rows = max(2, int(lookback * 390 / minutes) if minutes < 24 * 60 else lookback)
+        bars = synthetic_ohlcv(n_rows, symbols, freq=f"{minutes}min", gap_frac=0.0, dup_frac=0.0, seed=seed)
+    body = {"s": "ok", "t": (bars["timestamp"].astype("int64") // 10**9).tolist()}
+    for col, field in (("close", "c"), ("open", "o"), ("high", "h"), ("low", "l"), ("volume", "v")):
+        body[field] = bars[col].round(4).tolist()
+    return json.dumps(body).encode()
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, record_dir, latency_ms=0.0, jitter_ms=0.0, rate=None, burst=10, error_rate=0.0, synthetic=False, seed=None,
+                 slow_rate=0.0, slow_ms=0.0):
+        super().__init__(addr, _Handler)
+        self.record_dir = Path(record_dir).resolve()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.synthetic = synthetic
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = {"served": 0, "throttled": 0, "errors": 0, "missing": 0}
+
+    def count(self, name: str) -> None:
+        with self.rng_lock:
+            self.stats[name] += 1
+
+    def draw(self) -> tuple[float, float]:
+        """
+        (error roll, delay in ms): latency + jitter, plus slow_ms for a slow_rate share (tail).
+        """
+        with self.rng_lock:
+            delay = self.latency_ms + self.rng.uniform(0.0, self.jitter_ms)
+            if self.rng.random() < self.slow_rate:
+                delay += self.slow_ms
+            return self.rng.random(), delay
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        key = unquote(url.path).lstrip("/")
+        params = dict(parse_qsl(url.query))
+
+        if server.bucket is not None and not server.bucket.try_acquire():
+            server.count("throttled")
+            return self._send(429, b'{"error": "API limit reached"}', {"Retry-After": "1"})
+
+        roll, delay_ms = server.draw()
+        time.sleep(delay_ms / 1000.0)
+        if roll < server.error_rate:
+            server.count("errors")
+            return self._send(503, b'{"error": "injected failure"}')
+
+        path = (server.record_dir / key).resolve()
+        if server.record_dir in path.parents and path.is_file():
+            body = path.read_bytes()
+        elif server.synthetic and key.count("/") >= 2:
+            body = synthetic_payload(key, params)
+        else:
+            server.count("missing")
+            return self._send(404, json.dumps({"error": f"no recording {key}"}).encode())
+
+        server.count("served")
+        self._send(200, body)
+
+    def _send(self, status: int, body: bytes, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+
+def make_server(port: int = 8765, addr: str = "127.0.0.1", record_dir=DEFAULT_RECORD_DIR, **options) -> ReplayServer:
+    """
+    Bound (not yet serving) stub server; port 0 picks a free port.
+    """
+    return ReplayServer((addr, port), record_dir, **options)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded provider payloads over HTTP for offline replay.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--addr", default="127.0.0.1")
+    parser.add_argument("--record-dir", default=str(DEFAULT_RECORD_DIR), help="Recordings written in record mode")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random delay per response")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second before HTTP 429 (token bucket)")
+    parser.add_argument("--burst", type=int, default=10, help="Token bucket size")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of responses delayed by --slow-ms (latency tail)")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Extra delay of the slow responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 503")
+    parser.add_argument("--synthetic", action="store_true", help="Serve synthetic data when a recording is missing")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for jitter and injected errors")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = make_server(
+        args.port,
+        args.addr,
+        args.record_dir,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate=args.rate,
+        burst=args.burst,
+        error_rate=args.error_rate,
+        slow_rate=args.slow_rate,
+        slow_ms=args.slow_ms,
+        synthetic=args.synthetic,
+        seed=args.seed,
+    )
+    host, port = server.server_address[:2]
+    print(f"Replaying {server.record_dir} on http://{host}:{port} (QUANT_PROVIDER_MODE=replay QUANT_REPLAY_URL=http://{host}:{port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import argparse
+import json
+import signal
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src import telemetry
+from src.scheduler.cron import CronSchedule
+from src.scheduler.daemon import Job, Scheduler, script_job
+
+# Same jobs as scripts/cron/crontab_example.txt, run inside one warm process.
+# script paths are relative to the project root; args are passed to main(argv).
+DEFAULT_JOBS = [
+    {
+        "name": "daily_report",
+        "schedule": "0 20 * * *",
+        "script": "scripts/generate_daily_report.py",
+        "args": [],
+        "jitter_seconds": 60,
+        "retries": 2,
+        "timeout_seconds": 1800,
+    },
+    {
+        "name": "portfolio_report",
+        "schedule": "5 20 * * *",
+        "script": "scripts/generate_portfolio_report.py",
+        "args": [],
+        "jitter_seconds": 60,
+        "retries": 2,
+        "timeout_seconds": 900,
+    },
+    {
+        "name": "forecast_universe",
+        "schedule": "30 20 * * 1-5",
+        "script": "scripts/forecast_universe.py",
+        "args": ["--symbols-file", "data/universe.txt"],
+        "jitter_seconds": 60,
+        "retries": 2,
+        "timeout_seconds": 1800,
+    },
+    {
+        "name": "dashboard_snapshot",
+        "schedule": "*/30 * * * 1-5",
+        "script": "scripts/write_dashboard_snapshot.py",
+        "args": [],
+        "jitter_seconds": 30,
+        "retries": 1,
+        "timeout_seconds": 600,
+    },
+]
+
+
+def build_jobs(specs: list[dict]) -> list[Job]:
+    jobs = []
+    for spec in specs:
+        jobs.append(
+            Job(
+                name=spec["name"],
+                schedule=CronSchedule(spec["schedule"]),
+                func=script_job(ROOT / spec["script"], spec.get("args")),
+                jitter_seconds=float(spec.get("jitter_seconds", 0)),
+                retries=int(spec.get("retries", 0)),
+                backoff_seconds=float(spec.get("backoff_seconds", 5)),
+                timeout_seconds=spec.get("timeout_seconds"),
+            )
+        )
+    return jobs
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the report/fetch jobs on cron schedules in one long-running process.")
+    parser.add_argument("--jobs-file", default=None, help="JSON list of job specs (default: built-in jobs)")
+    parser.add_argument("--max-concurrency", type=int, default=2, help="Jobs running at the same time")
+    parser.add_argument("--log", default=str(ROOT / "report" / "scheduler" / "runs.jsonl"), help="JSON-lines run log")
+    parser.add_argument("--run", default=None, metavar="JOB", help="Run one job now and exit")
+    parser.add_argument("--list", action="store_true", help="Print the jobs and their next run, then exit")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics of the jobs on this port")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    specs = DEFAULT_JOBS
+    if args.jobs_file:
+        specs = json.loads(Path(args.jobs_file).read_text(encoding="utf-8"))
+    scheduler = Scheduler(build_jobs(specs), max_concurrency=args.max_concurrency, log_path=args.log)
+
+    if args.list:
+        now = datetime.now()
+        for job in scheduler.jobs:
+            print(f"{job.name:<20} {job.schedule.expr:<16} next: {job.schedule.next_after(now):%Y-%m-%d %H:%M}")
+        return 0
+
+    if args.run:
+        job = next((j for j in scheduler.jobs if j.name == args.run), None)
+        if job is None:
+            print(f"Unknown job '{args.run}'. Known: {', '.join(j.name for j in scheduler.jobs)}")
+            return 2
+        return 0 if scheduler.run_job(job)["status"] == "ok" else 1
+
+    if args.metrics_port:
+        telemetry.start_http_server(args.metrics_port)
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
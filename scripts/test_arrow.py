@@ -0,0 +1,99 @@
+import io
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.synthetic import synthetic_ohlcv
+from src.data.arrow import STRING_DTYPE, iter_candle_tables, to_arrow, to_pandas
+from src.data.bars import PriceBars
+from src.data.export import write_export
+from src.data.storage import iter_csv_chunks, read_candles, upsert_csv
+
+
+def test_arrow():
+    print("--- TESTING ARROW INTERCHANGE ---")
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        a = synthetic_ohlcv(1_500, "AAA", freq="1min", seed=1)
+        b = synthetic_ohlcv(1_000, "BBB", freq="1min", seed=2)
+        path = tmp / "candles.csv"
+        upsert_csv(a, str(path))
+        stored = upsert_csv(pd.concat([b, a.iloc[-10:]]), str(path))
+
+        # Stored candles: Arrow-backed asset, UTC ns timestamps, NumPy floats
+        df = read_candles(str(path))
+        assert len(df) == 2_500 and len(stored) == 2_500
+        assert df["asset"].dtype == STRING_DTYPE
+        assert str(df["timestamp"].dtype) == "datetime64[ns, UTC]"
+        assert df["close"].dtype == np.float64
+        assert df["close"].tolist() == pd.read_csv(path, float_precision="round_trip")["close"].tolist()
+        print("   [OK] Candles read by Arrow with the expected dtypes and exact floats.")
+
+        # Clean stored candles are wrapped by PriceBars without a copy
+        bars = PriceBars.from_frame(df[df["asset"] == "AAA"].reset_index(drop=True))
+        assert np.shares_memory(bars.close, bars.frame["close"].to_numpy())
+        print("   [OK] Strategies get NumPy views of the stored columns.")
+
+        # Streamed tables have exactly `rows` rows after the asset filter
+        sizes = [t.num_rows for t in iter_candle_tables(str(path), rows=400, asset="BBB")]
+        assert sizes == [400, 400, 200], sizes
+        chunks = list(iter_csv_chunks(str(path), chunksize=400, asset="BBB"))
+        expected = df[df["asset"] == "BBB"].reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+        print("   [OK] Chunked reads are exact-size and match the full read.")
+
+        # Loaded frames are writable, including single-chunk tables (Parquet snapshots)
+        buf = io.BytesIO()
+        pq.write_table(to_arrow(df), buf)
+        for frame in (read_candles(str(path)), chunks[0], to_pandas(pq.read_table(io.BytesIO(buf.getvalue())))):
+            frame.loc[0, "close"] = -1.0
+            frame.loc[frame["close"] > 0, "volume"] = 0.0
+            assert frame.loc[0, "close"] == -1.0
+        print("   [OK] Frames converted from Arrow are writable.")
+
+        # Files with timestamps lacking an offset still load (through pandas)
+        legacy = tmp / "legacy.csv"
+        a.assign(timestamp=a["timestamp"].dt.tz_localize(None)).to_csv(legacy, index=False)
+        old = read_candles(str(legacy))
+        assert str(old["timestamp"].dtype) == "datetime64[ns, UTC]" and old["asset"].dtype == STRING_DTYPE
+        mixed = tmp / "legacy_mixed.csv"
+        df.assign(timestamp=df["timestamp"].dt.tz_localize(None)).to_csv(mixed, index=False)
+        chunks = list(iter_csv_chunks(str(mixed), chunksize=400, asset="BBB"))
+        assert [len(c) for c in chunks] == sizes, [len(c) for c in chunks]
+        legacy_bbb = read_candles(str(mixed))
+        legacy_bbb = legacy_bbb[legacy_bbb["asset"] == "BBB"].reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), legacy_bbb)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+        print("   [OK] Legacy files without UTC offsets fall back to pandas, whole or chunked.")
+
+        # Exports carry the same Arrow types, in `chunk_rows` slices
+        for fmt in ("Parquet", "Arrow IPC"):
+            buf = io.BytesIO()
+            write_export(df, fmt, buf, chunk_rows=1_000)
+            buf.seek(0)
+            if fmt == "Parquet":
+                table = pq.read_table(buf)
+                assert pq.ParquetFile(io.BytesIO(buf.getvalue())).metadata.num_row_groups == 3
+            else:
+                table = pa.ipc.open_file(buf).read_all()
+            assert pa.types.is_large_string(table.schema.field("asset").type)
+            assert table.equals(to_arrow(df))
+        print("   [OK] Parquet / Arrow IPC exports round-trip the frame.")
+    finally:
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_arrow()
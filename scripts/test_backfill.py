@@ -0,0 +1,123 @@
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data import providers
+from src.data.backfill import backfill_candles, checkpoint_path_for, plan_windows
+from src.data.finnhub import get_candles_range
+from src.data.middleware import FetchPolicy, ResilientProvider
+from src.data.ratelimit import TokenBucket
+from src.data.storage import read_candles
+from src.scheduler.daemon import load_script
+
+replay_server = load_script(ROOT / "scripts" / "replay_server.py")
+
+START = int(pd.Timestamp("2024-01-01", tz="UTC").timestamp())
+END = int(pd.Timestamp("2024-01-20 23:59", tz="UTC").timestamp())
+
+
+def test_backfill():
+    print("--- TESTING FINNHUB BACKFILL ---")
+    tmp = Path(tempfile.mkdtemp())
+    server = replay_server.make_server(0, record_dir=tmp / "recordings", synthetic=True, latency_ms=10, rate=40, burst=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous = providers.get_provider()
+    try:
+        # Windows tile [start, end] on a fixed grid
+        windows = plan_windows(START, END, "5", max_bars=1_000)
+        assert windows[0][0] == START and windows[-1][1] == END
+        assert all(b[0] == a[1] + 1 for a, b in zip(windows, windows[1:]))
+        assert plan_windows(START, END + 3600, "5", max_bars=1_000)[:-1] == windows[:-1]
+        print(f"   [OK] {len(windows)} contiguous windows, stable when the end moves.")
+
+        # Client-side limiter below the server's limit: no request throttled
+        bucket = TokenBucket(rate=50, burst=1)
+        t0 = time.perf_counter()
+        for _ in range(11):
+            bucket.acquire()
+        assert time.perf_counter() - t0 >= 0.19
+        slow = TokenBucket(rate=0.1, burst=1)
+        assert slow.acquire() and not slow.acquire(timeout=0.05)
+        print("   [OK] Token bucket paces blocking acquires.")
+
+        providers.set_provider(providers.ReplayProvider(url=f"http://127.0.0.1:{server.server_address[1]}"))
+        ref_path = tmp / "ref.csv"
+        summary = backfill_candles("AAPL", "5", START, END, ref_path, max_bars=1_000, workers=4,
+                                   limiter=TokenBucket(rate=30, burst=1), flush_every=2)
+        assert summary["fetched"] == len(windows) and not summary["failed"], summary
+        assert server.stats["throttled"] == 0, server.stats
+        ref = read_candles(str(ref_path))
+        assert len(ref) == summary["rows"] and ref["timestamp"].is_monotonic_increasing
+        assert not ref.duplicated(subset=["timestamp", "asset"]).any()
+        print(f"   [OK] Concurrent backfill stored {len(ref)} bars, none throttled by the server.")
+
+        # Interrupted run: later windows fail, the checkpoint only lists stored ones
+        path = tmp / "candles.csv"
+        cut = windows[len(windows) // 2][0]
+        calls = []
+
+        def flaky(symbol, resolution, start, end):
+            calls.append((start, end))
+            if start >= cut:
+                raise RuntimeError("connection reset")
+            return get_candles_range(symbol, resolution, start, end)
+
+        first = backfill_candles("AAPL", "5", START, END, path, max_bars=1_000, workers=3,
+                                 limiter=TokenBucket(rate=30, burst=1), retries=1, backoff_seconds=0.01,
+                                 flush_every=3, fetch=flaky)
+        n_failed = sum(1 for w in windows if w[0] >= cut)
+        assert len(first["failed"]) == n_failed and first["fetched"] == len(windows) - n_failed
+        assert len(calls) == len(windows) + n_failed  # one retry per failing window
+        print(f"   [OK] {n_failed} failing windows retried, reported and left out of the checkpoint.")
+
+        # Resume: only the missing windows are fetched, result equals the one-shot run
+        calls.clear()
+        second = backfill_candles("AAPL", "5", START, END, path, max_bars=1_000, workers=3,
+                                  limiter=TokenBucket(rate=30, burst=1), fetch=lambda *a: calls.append(a[2:]) or get_candles_range(*a))
+        assert second["skipped"] == len(windows) - n_failed and second["fetched"] == n_failed
+        assert sorted(calls) == [w for w in windows if w[0] >= cut]
+        pd.testing.assert_frame_equal(read_candles(str(path)), ref)
+        assert checkpoint_path_for(path).exists()
+        print("   [OK] Resumed run fetched only the missing windows; data equals the one-shot backfill.")
+
+        # Behind the retrying / hedging middleware every upstream request still takes a token
+        flaky_server = replay_server.make_server(0, record_dir=tmp / "recordings", synthetic=True, error_rate=0.3, seed=5)
+        threading.Thread(target=flaky_server.serve_forever, daemon=True).start()
+        try:
+            inner = providers.ReplayProvider(url=f"http://127.0.0.1:{flaky_server.server_address[1]}")
+            policy = FetchPolicy(retries=3, backoff_seconds=0.01, hedge=True, hedge_delay_seconds=0.0)
+            providers.set_provider(ResilientProvider(inner, policy))
+            tokens = []
+
+            class CountingBucket(TokenBucket):
+                def acquire(self, timeout=None):
+                    tokens.append(1)
+                    return super().acquire(timeout)
+
+            summary = backfill_candles("AAPL", "5", START, END, tmp / "mw.csv", max_bars=1_000, workers=4,
+                                       limiter=CountingBucket(rate=200, burst=4), retries=8, backoff_seconds=0.01)
+            upstream = flaky_server.stats["served"] + flaky_server.stats["errors"]
+            assert not summary["failed"] and flaky_server.stats["errors"] > 0, (summary, flaky_server.stats)
+            assert upstream == len(tokens), (upstream, len(tokens))
+            print(f"   [OK] Through the middleware: {upstream} upstream requests for {len(tokens)} tokens.")
+        finally:
+            flaky_server.shutdown()
+    finally:
+        providers.set_provider(previous)
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_backfill()
@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.synthetic import synthetic_daily, synthetic_ohlcv
+from src.data.bars import PriceBars, is_normalized
+from src.metrics.performance import compute_metrics
+from src.models.linear_forecast import forecast_next_day_ols, forecast_next_day_ols_from_daily
+from src.strategies.buy_hold import buy_and_hold
+from src.strategies.momentum import momentum_strategy
+
+
+def test_bars():
+    print("--- TESTING PRICE BARS ---")
+    # Raw provider-like frame: shuffled, duplicated bars, string timestamps, one missing close
+    raw = synthetic_ohlcv(5_000, "AAPL", dup_frac=0.01).sample(frac=1.0, random_state=0)
+    raw["timestamp"] = raw["timestamp"].astype(str)
+    raw.iloc[10, raw.columns.get_loc("close")] = np.nan
+    assert not is_normalized(raw)
+
+    bars = PriceBars.from_frame(raw)
+    clean = bars.frame
+    assert is_normalized(clean) and clean["timestamp"].is_unique and str(clean["timestamp"].dt.tz) == "UTC"
+    print(f"   [OK] Normalized {len(raw)} raw rows into {len(bars)} bars.")
+
+    # Already clean frames are wrapped, not copied
+    assert PriceBars.from_frame(clean).frame is clean
+    print("   [OK] Clean frame wrapped without copy.")
+
+    # Same results as the DataFrame path, shared frame left untouched
+    before = clean.copy()
+    for fn, equity_col, ret_col in [
+        (buy_and_hold, "equity_bh", "ret"),
+        (lambda p: momentum_strategy(p, lookback=20), "equity_mom", "strat_ret"),
+    ]:
+        out_bars, out_df = fn(bars), fn(clean)
+        pd.testing.assert_frame_equal(out_bars, out_df)
+        assert compute_metrics(out_bars, equity_col, ret_col) == compute_metrics(out_df, equity_col, ret_col)
+        assert np.shares_memory(out_bars["close"].to_numpy(), clean["close"].to_numpy())
+    pd.testing.assert_frame_equal(clean, before)
+    print("   [OK] Strategies and metrics: same results, no copy, input untouched.")
+
+    # Forecasters
+    hourly = PriceBars.from_frame(synthetic_ohlcv(5_000, "AAPL", freq="1h", dup_frac=0.0))
+    assert forecast_next_day_ols(hourly) == forecast_next_day_ols(hourly.frame)
+    daily = synthetic_daily(400)
+    daily["date"] = pd.to_datetime(daily["date"])
+    assert forecast_next_day_ols_from_daily(daily) == forecast_next_day_ols_from_daily(daily.assign(date=daily["date"].astype(str)))
+    print("   [OK] Forecasts unchanged.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_bars()
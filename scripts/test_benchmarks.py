@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.synthetic import synthetic_ohlcv, synthetic_universe
+from benchmarks.compare import compare_runs
+
+
+def test_benchmarks():
+    print("--- TESTING BENCHMARK HELPERS ---")
+
+    df = synthetic_ohlcv(5_000, dup_frac=0.01, seed=1)
+    assert list(df.columns) == ["timestamp", "asset", "open", "high", "low", "close", "volume"]
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["timestamp"].duplicated().sum() == 50
+    assert (df["high"] >= df["close"]).all() and (df["low"] <= df["close"]).all()
+    print("   [OK] Synthetic candles have gaps, duplicates and valid OHLC.")
+
+    closes = synthetic_universe(20, 300)
+    assert closes.shape == (300, 20)
+    print("   [OK] Synthetic universe shape.")
+
+    case = {"bench": "buy_and_hold", "scale": "rows", "size": 1000, "days": None, "peak_mb": 1.0}
+    base = {"results": [dict(case, seconds_min=0.010, seconds_median=0.011)]}
+    slow = {"results": [dict(case, seconds_min=0.020, seconds_median=0.021)]}
+    same = {"results": [dict(case, seconds_min=0.0102, seconds_median=0.011)]}
+    assert compare_runs(base, slow)[0]["regression"]
+    assert not compare_runs(base, same)[0]["regression"]
+    print("   [OK] Regressions flagged above threshold only.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_benchmarks()
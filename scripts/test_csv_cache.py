@@ -0,0 +1,73 @@
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src import telemetry
+from src.data.storage import load_csv_cached
+
+OPTIONS = {"parse_dates": ["date"], "numeric": ["close"], "sort_by": "date"}
+
+
+def _misses() -> float:
+    return telemetry.CACHE_REQUESTS.value(cache="csv", result="miss")
+
+
+def test_csv_cache():
+    print("--- TESTING CSV CACHE ---")
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        path = tmp / "daily.csv"
+        dates = pd.bdate_range("2024-01-01", periods=50)
+        pd.DataFrame({"date": dates[::-1], "close": np.linspace(100, 149, 50)[::-1]}).to_csv(path, index=False)
+
+        # Parsed, cleaned and sorted once; later calls share the parsed data
+        misses = _misses()
+        first = load_csv_cached(str(path), **OPTIONS)
+        second = load_csv_cached(str(path), **OPTIONS)
+        assert _misses() - misses == 1
+        assert first["date"].is_monotonic_increasing and first["close"].iloc[0] == 100.0
+        assert np.shares_memory(first["close"].to_numpy(), second["close"].to_numpy())
+        print("   [OK] Second call is a cache hit sharing the parsed frame.")
+
+        # Shared values can't be modified; columns added by a caller stay private
+        try:
+            first.loc[0, "close"] = -1.0
+            raise AssertionError("cached values should be read-only")
+        except ValueError:
+            pass
+        first["sma"] = first["close"].rolling(5).mean()
+        assert "sma" not in second.columns and "sma" not in load_csv_cached(str(path), **OPTIONS).columns
+        mine = first.copy()
+        mine.loc[0, "close"] = -1.0
+        assert load_csv_cached(str(path), **OPTIONS)["close"].iloc[0] == 100.0
+        print("   [OK] Cached values are read-only, columns and copies are per caller.")
+
+        # Rewriting the file (new size, or same size with a new mtime) invalidates the entry
+        misses = _misses()
+        pd.DataFrame({"date": dates, "close": np.linspace(200, 249, 50)}).to_csv(path, index=False)
+        assert load_csv_cached(str(path), **OPTIONS)["close"].iloc[0] == 200.0
+        pd.DataFrame({"date": dates, "close": np.linspace(300, 349, 50)}).to_csv(path, index=False)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert load_csv_cached(str(path), **OPTIONS)["close"].iloc[0] == 300.0
+        # other load options are another entry
+        assert len(load_csv_cached(str(path))) == 50
+        assert _misses() - misses == 3
+        print("   [OK] Rewritten files and new options are re-read.")
+    finally:
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_csv_cache()
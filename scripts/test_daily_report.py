@@ -0,0 +1,72 @@
+import multiprocessing as mp
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.synthetic import synthetic_ohlcv
+from src.reports import daily
+from src.reports.daily import generate_reports, write_index
+
+TODAY = "2026-01-02"
+
+
+def fake_candles(asset, interval="5m", period="5d"):
+    # mocked provider: "BAD" has no data, "DIE" kills the worker process
+    if asset == "BAD":
+        raise RuntimeError("no data")
+    if asset == "DIE":
+        os._exit(1)
+    return synthetic_ohlcv(300, asset, seed=len(asset))
+
+
+def test_daily_report():
+    print("--- TESTING DAILY REPORTS ---")
+    tmp = Path(tempfile.mkdtemp())
+    real = daily.get_candles_yahoo
+    daily.get_candles_yahoo = fake_candles
+    try:
+        # In-process batch: one report per asset and format, failures reported
+        out_dir = tmp / "report"
+        results = generate_reports(["AAPL", "BAD", "MSFT"], "5m", "5d", str(out_dir), TODAY,
+                                   workers=1, cache_dir=str(tmp / "cache"), formats=("md", "html"))
+        assert [r["asset"] for r in results] == ["AAPL", "BAD", "MSFT"]
+        assert [r["status"] for r in results] == ["ok", "error", "ok"]
+        assert results[1]["error"] == "RuntimeError: no data"
+        for asset in ("AAPL", "MSFT"):
+            assert (out_dir / f"{TODAY}_{asset}.md").exists() and (out_dir / f"{TODAY}_{asset}.html").exists()
+        assert not (out_dir / f"{TODAY}_BAD.md").exists()
+        print("   [OK] Reports written for every asset with data, failures returned.")
+
+        # Index links the reports and lists the failures
+        index = write_index(results, str(out_dir), TODAY, "5m", "5d").read_text(encoding="utf-8")
+        assert f"{TODAY}_AAPL.md" in index and f"{TODAY}_MSFT.md" in index and "BAD: RuntimeError: no data" in index
+        print("   [OK] Index links the reports and lists failures.")
+
+        # Second run with unchanged data: downstream stages served from the pipeline cache
+        again = generate_reports(["AAPL"], "5m", "5d", str(out_dir), TODAY, workers=1, cache_dir=str(tmp / "cache"))
+        assert "strategy:AAPL=skip" in again[0]["stages"], again[0]["stages"]
+        print("   [OK] Unchanged candles skip the strategy, metrics and render stages.")
+
+        # A dead worker process fails its assets instead of aborting the batch
+        if mp.get_start_method() == "fork":  # the mocked fetch is inherited by the workers
+            results = generate_reports(["AAPL", "DIE", "MSFT", "KO"], "5m", "5d", str(tmp / "pool"), TODAY, workers=2)
+            assert [r["asset"] for r in results] == ["AAPL", "DIE", "MSFT", "KO"]
+            died = results[1]
+            assert died["status"] == "error" and died["error"].startswith("BrokenProcessPool"), died
+            assert all(r["status"] in ("ok", "error") for r in results)
+            print("   [OK] BrokenProcessPool recorded as failed assets.")
+    finally:
+        daily.get_candles_yahoo = real
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_daily_report()
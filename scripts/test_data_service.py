@@ -0,0 +1,97 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from benchmarks.synthetic import synthetic_ohlcv
+from src.data.service import DataService
+
+
+class Fetchers:
+    def __init__(self):
+        self.candle_calls = []
+        self.quote_calls = []
+
+    def candles(self, symbol, interval="5m", period="5d"):
+        self.candle_calls.append(symbol)
+        return synthetic_ohlcv(50, symbol, seed=len(self.candle_calls))
+
+    def quote(self, symbol):
+        self.quote_calls.append(symbol)
+        return {"c": 100.0 + len(self.quote_calls)}
+
+
+def test_data_service():
+    print("--- TESTING DATA SERVICE ---")
+
+    # Fresh keys are served from the snapshot
+    f = Fetchers()
+    svc = DataService(refresh_seconds=60, idle_seconds=0.2, candle_fetcher=f.candles, quote_fetcher=f.quote)
+    svc.get_bars("AAA")
+    svc.get_bars("AAA")
+    svc.get_quote("AAA")
+    svc.get_quote("AAA")
+    assert f.candle_calls == ["AAA"] and f.quote_calls == ["AAA"]
+    print("   [OK] Fresh keys served without refetching.")
+
+    # Idle keys leave the snapshot and are not refreshed any more
+    time.sleep(0.25)
+    svc.get_bars("BBB")
+    svc.refresh_once()
+    snap = svc.snapshot()
+    assert ("AAA", "5m", "5d") not in snap.candles and "AAA" not in snap.quotes
+    assert ("AAA", "5m", "5d") not in snap.fetched_at and ("BBB", "5m", "5d") in snap.candles
+    assert f.candle_calls == ["AAA", "BBB", "BBB"] and f.quote_calls == ["AAA"]
+    svc.get_bars("AAA")  # read again: fetched again
+    assert f.candle_calls[-1] == "AAA"
+    print("   [OK] Idle keys evicted from the snapshot, refetched on the next read.")
+
+    # Stale keys (refresher fell behind) are refetched by the reader
+    f = Fetchers()
+    svc = DataService(refresh_seconds=60, stale_seconds=0.1, candle_fetcher=f.candles, quote_fetcher=f.quote)
+    first = svc.get_bars("AAA")
+    q1 = svc.get_quote("AAA")
+    time.sleep(0.15)
+    assert svc.get_bars("AAA") is not first and svc.get_quote("AAA") != q1
+    assert f.candle_calls == ["AAA", "AAA"] and f.quote_calls == ["AAA", "AAA"]
+    print("   [OK] Data older than stale_seconds is refetched.")
+
+    # Seeded keys are served without a fetch (the refresher revalidates them)
+    f = Fetchers()
+    svc = DataService(refresh_seconds=60, stale_seconds=0.0, candle_fetcher=f.candles, quote_fetcher=f.quote)
+    svc.seed({("AAA", "5m", "5d"): synthetic_ohlcv(50, "AAA")}, {"AAA": {"c": 1.0}})
+    svc.get_bars("AAA")
+    assert svc.get_quote("AAA") == {"c": 1.0} and not f.candle_calls and not f.quote_calls
+    print("   [OK] Seeded keys served immediately.")
+
+    # Readers and the refresher touch access times concurrently
+    f = Fetchers()
+    svc = DataService(refresh_seconds=60, idle_seconds=1.0, candle_fetcher=f.candles, quote_fetcher=f.quote)
+    errors = []
+
+    def reader(i):
+        try:
+            for n in range(50):
+                svc.get_quote(f"S{(i * 50 + n) % 40}")
+        except Exception as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for _ in range(20):
+        svc.refresh_once()
+    for t in threads:
+        t.join()
+    assert not errors, errors
+    print("   [OK] Concurrent reads and refreshes.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_data_service()
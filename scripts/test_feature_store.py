@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.models.feature_store import FeatureStore, compute_daily_features
+
+
+def test_feature_store():
+    print("--- TESTING FEATURE STORE ---")
+
+    # Mock daily closes (random walk, no internet needed)
+    dates = pd.date_range(start="2023-01-01", periods=300, freq="B")
+    close = pd.Series(100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 300))), index=dates)
+
+    store = FeatureStore()
+    X1 = store.features(close.iloc[:250], lags=5, vol_window=10, momentum_lookback=20)
+    X1_again = store.features(close.iloc[:250], lags=5, vol_window=10, momentum_lookback=20)
+    assert X1_again is X1 and store.hits == 1
+    print("   [OK] Cache hit on identical series.")
+
+    # New rows arrive: only the tail is computed
+    X2 = store.features(close, lags=5, vol_window=10, momentum_lookback=20)
+    full = compute_daily_features(close, lags=5, vol_window=10, momentum_lookback=20)
+    assert store.extends == 1
+    assert X2.index.equals(full.index)
+    assert np.allclose(X2.to_numpy(), full.to_numpy(), equal_nan=True)
+    print("   [OK] Tail extension matches full rebuild.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_feature_store()
@@ -1,13 +1,62 @@
 from pathlib import Path
 import sys
 
+import numpy as np
 import pandas as pd
 
 # Allow "from src..." imports when running as a script
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
-from src.models.linear_forecast import forecast_next_day_ols_from_daily  # noqa: E402
+from src.models.linear_forecast import (  # noqa: E402
+    build_daily_features_and_target,
+    daily_df_to_close_series,
+    forecast_multi_horizon_ols_from_daily,
+    forecast_next_day_ols_from_daily,
+)
+
+
+def test_multi_horizon_forecast():
+    import statsmodels.api as sm
+
+    print("--- TESTING MULTI-HORIZON FORECAST ---")
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2022-01-03", periods=400)
+    df = pd.DataFrame({"date": dates, "close": 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, 400)))})
+    horizons = (20, 1, 5, 10, 5)
+    settings = {"lags": 5, "vol_window": 10, "momentum_lookback": 10}
+
+    multi = forecast_multi_horizon_ols_from_daily(df, horizons=horizons, alpha=0.1, **settings)
+    assert list(multi) == [1, 5, 10, 20]
+
+    # Reference: one statsmodels OLS per horizon, on the rows where every horizon is observed
+    close = daily_df_to_close_series(df)
+    X_all, _ = build_daily_features_and_target(close, **settings)
+    targets = {h: build_daily_features_and_target(close, horizon_days=h, **settings)[1] for h in multi}
+    train = X_all.notna().all(axis=1) & pd.concat(targets, axis=1).notna().all(axis=1)
+    X_train = sm.add_constant(X_all.loc[train], has_constant="add")
+    X_last = sm.add_constant(X_all.dropna().iloc[-1:], has_constant="add")
+    for h, res in multi.items():
+        model = sm.OLS(targets[h].loc[train], X_train).fit()
+        frame = model.get_prediction(X_last).summary_frame(alpha=0.1)
+        np.testing.assert_allclose(
+            [res.pred_return, res.lower_return, res.upper_return, res.model_r2],
+            [frame["mean"].iloc[0], frame["obs_ci_lower"].iloc[0], frame["obs_ci_upper"].iloc[0], model.rsquared],
+            rtol=1e-8, atol=1e-12,
+        )
+        assert res.n_train == int(model.nobs) and res.horizon_days == h
+        assert res.as_of_date == X_last.index[-1].date().isoformat()
+    print("   [OK] Every horizon matches its own statsmodels OLS (mean, interval, R^2).")
+
+    try:
+        forecast_multi_horizon_ols_from_daily(df, horizons=(0, 5))
+        raise AssertionError("horizon 0 should be rejected")
+    except ValueError:
+        pass
+    print("   [OK] Non-positive horizons rejected.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
 
 def main():
     csv_path = ROOT / "data" / "aapl_daily.csv"
@@ -42,6 +91,12 @@ def main():
     if res.model_r2 is not None:
         print(f"R^2 (train)  : {res.model_r2:.4f}")
 
+    multi = forecast_multi_horizon_ols_from_daily(df_daily=df, horizons=(1, 5, 10, 20))
+    print("\n=== OLS Multi-horizon Forecast ===")
+    for h, r in multi.items():
+        print(f"h={h:>2}d : pred {r.pred_close:.4f}  PI 95% [{r.lower_close:.4f}, {r.upper_close:.4f}]")
+
 
 if __name__ == "__main__":
+    test_multi_horizon_forecast()
     main()
@@ -0,0 +1,73 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.models import grid_search
+from src.models.feature_store import compute_daily_features
+from src.models.grid_search import grid_search_ols
+
+LAGS, VOLS, MOMS = (2, 5, 8), (5, 20), (10, 40)
+
+
+def serial_scores(close: pd.Series, test_size: int, min_train_rows: int) -> pd.DataFrame:
+    # the ranking written as a plain loop over combos, features from compute_daily_features
+    y = np.log(close.shift(-1) / close).to_numpy()
+    test_idx = np.flatnonzero(np.isfinite(y))[-test_size:]
+    rows = []
+    for lags in LAGS:
+        for vol_window in VOLS:
+            for momentum_lookback in MOMS:
+                X = compute_daily_features(close, lags, vol_window, momentum_lookback).to_numpy()
+                X = np.column_stack([np.ones(len(X)), X])
+                complete = np.isfinite(X).all(axis=1) & np.isfinite(y)
+                train = complete.copy()
+                train[test_idx[0]:] = False
+                test = [i for i in test_idx if complete[i]]
+                if train.sum() < max(min_train_rows, X.shape[1] + 1):
+                    continue
+                beta = np.linalg.lstsq(X[train], y[train], rcond=None)[0]
+                err = y[test] - X[test] @ beta
+                rows.append({"lags": lags, "vol_window": vol_window, "momentum_lookback": momentum_lookback,
+                             "rmse": np.sqrt(np.mean(err ** 2)), "mae": np.mean(np.abs(err)),
+                             "n_train": int(train.sum()), "n_test": len(test)})
+    return pd.DataFrame(rows).sort_values(["rmse", "lags", "vol_window", "momentum_lookback"]).reset_index(drop=True)
+
+
+def test_grid_search():
+    print("--- TESTING OLS GRID SEARCH ---")
+    rng = np.random.default_rng(8)
+    dates = pd.bdate_range("2022-01-03", periods=600)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0002, 0.011, 600))), index=dates)
+    expected = serial_scores(close, test_size=60, min_train_rows=60)
+
+    # Default: in-process
+    grid_search._RESULTS.clear()
+    ranked = grid_search_ols(close, LAGS, VOLS, MOMS, test_size=60, min_train_rows=60)
+    pd.testing.assert_frame_equal(ranked, expected, check_exact=False, rtol=1e-9)
+    print(f"   [OK] In-process ranking of {len(ranked)} combos matches a serial loop.")
+
+    # Thread and process pools rank the same way
+    for kwargs in ({"n_jobs": 3}, {"n_jobs": 2, "processes": True}):
+        grid_search._RESULTS.clear()
+        pooled = grid_search_ols(close, LAGS, VOLS, MOMS, test_size=60, min_train_rows=60, **kwargs)
+        pd.testing.assert_frame_equal(pooled, ranked)
+    print("   [OK] Thread and process pools give the same ranking.")
+
+    # Unchanged data: served from the ranking cache
+    t0 = time.perf_counter()
+    again = grid_search_ols(close, LAGS, VOLS, MOMS, test_size=60, min_train_rows=60)
+    assert again is pooled and time.perf_counter() - t0 < 0.05
+    print("   [OK] Repeated call served from the cache.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_grid_search()
@@ -0,0 +1,171 @@
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src import telemetry
+from src.data import providers
+from src.data.finnhub import get_quote
+from src.data.middleware import DeadlineExceeded, FetchPolicy, ResilientProvider, fetch_deadline
+from src.scheduler.daemon import load_script
+
+replay_server = load_script(ROOT / "scripts" / "replay_server.py")
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"HTTP {status}", response=response)
+
+
+class FakeProvider:
+    """
+    finnhub_get answers from `script`: a list of (delay seconds, exception or None) per call.
+    """
+    mode = "live"
+
+    def __init__(self, script=(), default=(0.0, None)):
+        self.script = list(script)
+        self.default = default
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def finnhub_get(self, endpoint, params, timeout=20, key_params=None):
+        with self._lock:
+            n = self.calls
+            self.calls += 1
+        delay, error = self.script[n] if n < len(self.script) else self.default
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return {"symbol": params["symbol"], "call": n}, 10
+
+
+def _events(event: str) -> float:
+    return telemetry.FETCH_EVENTS.value(provider="finnhub", event=event)
+
+
+def test_middleware():
+    print("--- TESTING FETCH MIDDLEWARE ---")
+
+    # Retries: 503 and 429 are retried, a plain error is not
+    inner = FakeProvider([(0, _http_error(503)), (0, _http_error(429))])
+    mw = ResilientProvider(inner, FetchPolicy(retries=2, backoff_seconds=0.01))
+    retries = _events("retry")
+    data, _ = mw.finnhub_get("/quote", {"symbol": "AAPL"})
+    assert data["call"] == 2 and inner.calls == 3 and _events("retry") - retries == 2
+    inner = FakeProvider([(0, RuntimeError("No recording"))])
+    try:
+        ResilientProvider(inner, FetchPolicy(retries=2, backoff_seconds=0.01)).finnhub_get("/quote", {"symbol": "AAPL"})
+        raise AssertionError("non-retryable errors should be raised")
+    except RuntimeError:
+        assert inner.calls == 1
+    print("   [OK] Retryable failures retried with backoff, others raised at once.")
+
+    # Deadlines: per policy and per block, even while the request is in flight
+    slow = FakeProvider(default=(1.0, None))
+    for mw, ctx in ((ResilientProvider(slow, FetchPolicy(deadline_seconds=0.1)), None),
+                    (ResilientProvider(slow, FetchPolicy(deadline_seconds=None)), 0.1)):
+        t0 = time.perf_counter()
+        try:
+            if ctx is None:
+                mw.finnhub_get("/quote", {"symbol": "AAPL"})
+            else:
+                with fetch_deadline(ctx):
+                    mw.finnhub_get("/quote", {"symbol": "AAPL"})
+            raise AssertionError("deadline should be exceeded")
+        except DeadlineExceeded:
+            assert time.perf_counter() - t0 < 0.5
+    print("   [OK] Deadlines cut slow calls short.")
+
+    # Hedging: a slow first attempt is raced by a duplicate
+    inner = FakeProvider([(1.0, None)], default=(0.01, None))
+    mw = ResilientProvider(inner, FetchPolicy(hedge=True, hedge_delay_seconds=0.05))
+    won = _events("hedge_won")
+    t0 = time.perf_counter()
+    data, _ = mw.finnhub_get("/quote", {"symbol": "AAPL"})
+    assert data["call"] == 1 and time.perf_counter() - t0 < 0.5 and _events("hedge_won") - won == 1
+    # without a fixed delay, hedging waits for enough latency samples
+    mw = ResilientProvider(FakeProvider(default=(0.0, None)), FetchPolicy(hedge=True, hedge_min_samples=5))
+    assert mw._hedge_delay("finnhub/quote") is None
+    for _ in range(5):
+        mw.finnhub_get("/quote", {"symbol": "AAPL"})
+    assert mw._hedge_delay("finnhub/quote") is not None
+    print("   [OK] Hedged request answers when the first one is stuck in the tail.")
+
+    # Single flight: identical concurrent calls share one request
+    inner = FakeProvider(default=(0.2, None))
+    mw = ResilientProvider(inner, FetchPolicy())
+    results = []
+    barrier = threading.Barrier(8)
+
+    def call(symbol):
+        barrier.wait()
+        results.append(mw.finnhub_get("/quote", {"symbol": symbol})[0])
+
+    threads = [threading.Thread(target=call, args=("AAPL" if i < 6 else "MSFT",)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert inner.calls == 2 and len(results) == 8
+    results[0]["symbol"] = "changed"
+    assert sum(r["symbol"] == "changed" for r in results) == 1  # callers get their own dict
+    print("   [OK] 8 concurrent calls for 2 symbols made 2 requests.")
+
+    # A leader's fetch_deadline does not cut the shared request short for followers
+    inner = FakeProvider(default=(0.6, None))
+    mw = ResilientProvider(inner, FetchPolicy(deadline_seconds=30))
+    outcome = {}
+
+    def leader():
+        t0 = time.perf_counter()
+        try:
+            with fetch_deadline(0.3):
+                mw.finnhub_get("/quote", {"symbol": "AAPL"})
+        except DeadlineExceeded:
+            outcome["leader"] = time.perf_counter() - t0
+
+    def follower():
+        time.sleep(0.05)
+        outcome["follower"] = mw.finnhub_get("/quote", {"symbol": "AAPL"})[0]
+
+    threads = [threading.Thread(target=leader), threading.Thread(target=follower)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert outcome["leader"] < 0.5, outcome
+    assert outcome["follower"]["symbol"] == "AAPL" and inner.calls == 1
+    print("   [OK] Leader gave up at its own deadline, the follower got the shared result.")
+
+    # Against the stub server: 30% HTTP 503, every call still succeeds
+    tmp = Path(tempfile.mkdtemp())
+    server = replay_server.make_server(0, record_dir=tmp, synthetic=True, error_rate=0.3, seed=3)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    previous = providers.get_provider()
+    try:
+        inner = providers.ReplayProvider(url=f"http://127.0.0.1:{server.server_address[1]}")
+        providers.set_provider(ResilientProvider(inner, FetchPolicy(retries=5, backoff_seconds=0.01)))
+        for _ in range(20):
+            assert "c" in get_quote("AAPL")
+        assert server.stats["errors"] > 0 and server.stats["served"] == 20
+        print(f"   [OK] Stub server: 20 quotes served despite {server.stats['errors']} injected 503s.")
+    finally:
+        providers.set_provider(previous)
+        server.shutdown()
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_middleware()
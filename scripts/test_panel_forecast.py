@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.models.linear_forecast import forecast_next_day_ols_from_daily
+from src.models.panel_forecast import forecast_universe_ols
+
+
+def test_panel_forecast():
+    print("--- TESTING PANEL FORECAST ---")
+
+    # Mock wide daily closes for 20 tickers (no internet needed)
+    dates = pd.date_range(start="2022-01-03", periods=300, freq="B")
+    rets = np.random.normal(0, 0.01, (300, 20))
+    closes = pd.DataFrame(100 * np.exp(np.cumsum(rets, axis=0)), index=dates, columns=[f"T{i}" for i in range(20)])
+    closes.iloc[:80, 5] = np.nan  # late listing
+
+    table = forecast_universe_ols(closes)
+    assert len(table) == 20
+    print(f"   [OK] Forecast table: {len(table)} tickers.")
+
+    # Batched solve must match the single-series model
+    for ticker in ["T0", "T5"]:
+        single = forecast_next_day_ols_from_daily(pd.DataFrame({"date": dates, "close": closes[ticker].values}))
+        row = table.loc[ticker]
+        assert np.isclose(row["pred_close"], single.pred_close)
+        assert np.isclose(row["lower_close"], single.lower_close)
+        assert np.isclose(row["upper_close"], single.upper_close)
+        assert row["n_train"] == single.n_train
+    print("   [OK] Matches single-ticker OLS.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_panel_forecast()
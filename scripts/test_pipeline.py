@@ -0,0 +1,108 @@
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.pipeline import dag
+from src.pipeline.dag import Pipeline, Stage
+
+STAGE_MODULE = """
+from pipeline_helpers import scale
+
+def stage():
+    return scale(10)
+"""
+
+
+def test_pipeline():
+    print("--- TESTING INCREMENTAL PIPELINE ---")
+
+    # Mock "provider": the close series can be swapped between runs
+    dates = pd.date_range(start="2023-01-01", periods=100, freq="B")
+    data = {"close": pd.Series(100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 100))), index=dates)}
+    calls = []
+
+    def fetch():
+        calls.append("fetch")
+        return data["close"].copy()
+
+    def returns(close):
+        calls.append("returns")
+        return close.pct_change().dropna()
+
+    def total(ret, scale):
+        calls.append("total")
+        return float((1 + ret).prod() - 1) * scale
+
+    def build(cache_dir, scale=1.0):
+        return Pipeline(
+            [
+                Stage("fetch", fetch, always_run=True),
+                Stage("returns", returns, deps=("fetch",)),
+                Stage("total", total, deps=("returns",), params={"scale": scale}),
+            ],
+            cache_dir=cache_dir,
+        )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = build(cache_dir).run()["total"]
+        assert calls == ["fetch", "returns", "total"]
+        print("   [OK] First run executes every stage.")
+
+        calls.clear()
+        again = build(cache_dir).run()["total"]
+        assert calls == ["fetch"] and again == first
+        print("   [OK] Unchanged data: downstream stages served from cache.")
+
+        calls.clear()
+        build(cache_dir, scale=100.0).run()
+        assert calls == ["fetch", "total"]
+        print("   [OK] Changed parameter re-runs only the affected stage.")
+
+        calls.clear()
+        data["close"] = data["close"] * 1.01
+        build(cache_dir).run()
+        assert calls == ["fetch", "returns", "total"]
+        print("   [OK] New data invalidates the downstream stages.")
+
+    # Editing a helper module the stage imports invalidates the stage
+    with tempfile.TemporaryDirectory() as code_dir, tempfile.TemporaryDirectory() as cache_dir:
+        (Path(code_dir) / "pipeline_stage.py").write_text(STAGE_MODULE)
+        sys.path.insert(0, code_dir)
+
+        def run_with_helper(body: str, version: str = ""):
+            # a fresh interpreter: modules imported again, digests recomputed
+            (Path(code_dir) / "pipeline_helpers.py").write_text(f"def scale(x):\n    return {body}\n")
+            for name in ("pipeline_stage", "pipeline_helpers"):
+                sys.modules.pop(name, None)
+            importlib.invalidate_caches()
+            dag._module_digest.cache_clear()
+            stage = importlib.import_module("pipeline_stage").stage
+            pipe = Pipeline([Stage("scaled", stage, version=version)], cache_dir=cache_dir)
+            return pipe.run()["scaled"], pipe.runs["scaled"].executed
+
+        sys.dont_write_bytecode, saved = True, sys.dont_write_bytecode
+        try:
+            assert run_with_helper("x * 2") == (20, True)
+            assert run_with_helper("x * 2") == (20, False)
+            assert run_with_helper("x * 3") == (30, True)
+            assert run_with_helper("x * 3", version="2") == (30, True)
+            assert run_with_helper("x * 3", version="2") == (30, False)
+        finally:
+            sys.dont_write_bytecode = saved
+            sys.path.remove(code_dir)
+            for name in ("pipeline_stage", "pipeline_helpers"):
+                sys.modules.pop(name, None)
+        print("   [OK] Changed helper code or stage version re-runs the stage.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_pipeline()
@@ -8,8 +8,8 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
-from src.strategies.portfolio_allocation import compute_portfolio_equity
-from src.metrics.risk_analysis import compute_risk_metrics
+from src.strategies.portfolio_allocation import compute_portfolio_equity, compute_portfolio_equity_from_returns
+from src.metrics.risk_analysis import compute_return_stats, compute_risk_metrics, volatility_metrics
 
 def test_quant_b_logic():
     print("--- TESTING QUANT B MODULE ---")
@@ -45,5 +45,42 @@ def test_quant_b_logic():
         
     print("\n--- TEST SUCCESSFUL ---")
 
+def test_cached_risk_model():
+    print("--- TESTING CACHED RISK MODEL ---")
+    rng = np.random.default_rng(4)
+    dates = pd.date_range(start="2023-01-01", periods=250, freq="B")
+    df = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (250, 4)), axis=0)),
+                      index=dates, columns=["AAPL", "MSFT", "KO", "JPM"])
+    # slider values: any order, not summing to 1
+    weights = {"KO": 0.2, "AAPL": 0.9, "JPM": 0.4, "MSFT": 0.3}
+
+    # What the page computes: returns / covariance once, then per weight change
+    returns, cov, corr = compute_return_stats(df)
+    vols = volatility_metrics(cov, weights)
+    equity = compute_portfolio_equity_from_returns(returns, weights)
+
+    # The one-shot functions agree
+    corr_ref, vols_ref = compute_risk_metrics(df, weights)
+    pd.testing.assert_frame_equal(corr, corr_ref)
+    pd.testing.assert_frame_equal(vols, vols_ref)
+    pd.testing.assert_frame_equal(equity, compute_portfolio_equity(df, weights))
+
+    # ...and so do the formulas written out directly
+    ret = df.pct_change().dropna()
+    w = np.array([weights[a] for a in df.columns])
+    w = w / w.sum()
+    expected_vols = list(ret.std() * np.sqrt(252)) + [np.sqrt(w @ (ret.cov() * 252).to_numpy() @ w)]
+    np.testing.assert_allclose(vols["Volatility"].to_numpy(), expected_vols, rtol=1e-12)
+    assert list(vols.index) == list(df.columns) + ["PORTFOLIO"]
+    port_ret = ret.dot(w)
+    np.testing.assert_allclose(equity["port_ret"].to_numpy(), port_ret.to_numpy(), rtol=1e-12)
+    np.testing.assert_allclose(equity["equity_curve"].to_numpy(), ((1 + port_ret).cumprod() * 100).to_numpy(), rtol=1e-12)
+    pd.testing.assert_frame_equal(corr, ret.corr())
+    print("   [OK] Cached returns / covariance give the same volatility, correlation and equity.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
 if __name__ == "__main__":
-    test_quant_b_logic()
\ No newline at end of file
+    test_quant_b_logic()
+    test_cached_risk_model()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.reports.render import render_asset, render_index, sparkline_points, sparkline_svg
+
+
+def test_report_render():
+    print("--- TESTING REPORT TEMPLATES ---")
+
+    # Mock equity curve and metrics (no internet needed)
+    equity = 100 * np.exp(np.cumsum(np.random.normal(0, 0.01, 500)))
+    spark = sparkline_points(equity, n_points=60)
+    assert len(spark) == 60 and spark[0] == equity[0] and spark[-1] == equity[-1]
+    assert sparkline_svg(spark).startswith("<svg")
+    print("   [OK] Sparkline downsampled to 60 points.")
+
+    metrics = {"total_return": 0.1234, "volatility": 0.2, "sharpe": 1.5, "max_drawdown": -0.08}
+    ctx = dict(asset="AAPL", today="2026-01-02", interval="5m", period="5d",
+               first_close=100.0, last_close=112.34, metrics=metrics, spark=spark)
+    md = render_asset("md", **ctx)
+    html = render_asset("html", **ctx)
+    assert "# Daily Report — AAPL" in md and "**12.34%**" in md
+    assert "<svg" in html and "12.34%" in html
+    print("   [OK] Markdown and HTML asset reports rendered.")
+
+    results = [
+        {"asset": "AAPL", "status": "ok", "last_close": 112.34, "metrics": metrics, "spark": spark},
+        {"asset": "<BAD>", "status": "error", "error": "no data"},
+    ]
+    index = render_index(results, "2026-01-02", "5m", "5d", fmt="html")
+    assert "2026-01-02_AAPL.html" in index and "&lt;BAD&gt;" in index
+    print("   [OK] Index links reports and escapes HTML.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_report_render()
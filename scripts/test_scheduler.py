@@ -0,0 +1,66 @@
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.scheduler.cron import CronSchedule
+from src.scheduler.daemon import Job, Scheduler
+
+
+def test_scheduler():
+    print("--- TESTING SCHEDULER ---")
+
+    # Cron parsing (2026-10-17 is a Saturday)
+    assert CronSchedule("0 20 * * *").next_after(datetime(2026, 10, 19, 20, 0)) == datetime(2026, 10, 20, 20, 0)
+    assert CronSchedule("*/30 * * * 1-5").next_after(datetime(2026, 10, 17, 12, 0)) == datetime(2026, 10, 19, 0, 0)
+    assert CronSchedule("30 20 * * 1-5").next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 19, 20, 30)
+    print("   [OK] Cron expressions resolve to the expected next run.")
+
+    # Retries: fails twice, succeeds on the third attempt
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            raise RuntimeError("provider down")
+
+    sched = Scheduler([Job("flaky", CronSchedule("* * * * *"), flaky, retries=3, backoff_seconds=0.01)])
+    record = sched.run_job(sched.jobs[0])
+    assert record["status"] == "ok" and record["attempts"] == 3
+    print("   [OK] Failed attempts are retried with backoff.")
+
+    # A backoff longer than the remaining budget ends the run with the real error
+    def down():
+        raise RuntimeError("provider down")
+
+    job = Job("down", CronSchedule("* * * * *"), down, retries=3, backoff_seconds=1.0, timeout_seconds=0.3)
+    sched = Scheduler([job])
+    record = sched.run_job(sched.jobs[0])
+    assert record["status"] == "error" and "provider down" in record["error"], record
+    assert record["attempts"] == 1 and record["duration_s"] < 0.3
+    print("   [OK] No backoff sleep past the budget (error reported, not a timeout).")
+
+    # A timed-out run keeps its concurrency slot until its thread ends
+    release, second_started = threading.Event(), threading.Event()
+    stuck = Job("stuck", CronSchedule("* * * * *"), lambda: release.wait(5), timeout_seconds=0.1)
+    quick = Job("quick", CronSchedule("* * * * *"), second_started.set)
+    sched = Scheduler([stuck, quick], max_concurrency=1)
+    sched._dispatch(stuck, datetime.now())
+    sched._dispatch(quick, datetime.now())
+    time.sleep(0.4)
+    assert not second_started.is_set()  # "stuck" timed out at 0.1s but is still running
+    release.set()
+    assert second_started.wait(2)
+    sched._pool.shutdown(wait=True)
+    print("   [OK] Timed-out runs hold their slot until they end.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_scheduler()
@@ -0,0 +1,119 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+import write_dashboard_snapshot
+from benchmarks.synthetic import synthetic_ohlcv
+from src.data.bars import PriceBars
+from src.data.snapshot import POINTER, load_snapshot, write_snapshot
+from src.metrics.performance import compute_metrics
+from src.strategies.momentum import momentum_strategy
+
+SETTINGS = {"lags": 5, "vol_window": 10, "momentum_lookback": 10, "alpha": 0.05}
+
+
+def _tables(symbol: str, seed: int) -> dict[str, pd.DataFrame]:
+    candles = synthetic_ohlcv(200, symbol, seed=seed)
+    return {
+        "prices": candles.assign(symbol=symbol, interval="5m", period="5d"),
+        "quotes": pd.DataFrame([{"symbol": symbol, "c": 100.0 + seed, "pc": 99.0}]),
+        "forecasts": pd.DataFrame([{"symbol": symbol, **SETTINGS, "pred_next_ret": 0.001 * seed}]),
+    }
+
+
+def test_snapshot():
+    print("--- TESTING DASHBOARD SNAPSHOT ---")
+    tmp = Path(tempfile.mkdtemp())
+    try:
+        assert load_snapshot(tmp / "missing") is None
+
+        # Written tables load back with the dashboard's keys
+        first = _tables("AAA", seed=1)
+        write_snapshot(tmp, first)
+        snap = load_snapshot(tmp)
+        bars = snap.candles()[("AAA", "5m", "5d")]
+        expected = first["prices"].drop(columns=["symbol", "interval", "period"])
+        pd.testing.assert_frame_equal(bars, expected, check_dtype=False)
+        assert snap.quotes() == {"AAA": {"c": 101.0, "pc": 99.0}}
+        assert snap.forecast("AAA", **SETTINGS)["pred_next_ret"] == 0.001
+        assert snap.created_at is not None
+        bars.loc[0, "close"] = -1.0  # loaded frames are writable
+        print("   [OK] Snapshot tables round-trip through Parquet.")
+
+        # A newer snapshot without quotes / forecasts replaces the whole set
+        write_snapshot(tmp, {"prices": _tables("BBB", seed=2)["prices"]})
+        snap = load_snapshot(tmp)
+        assert list(snap.candles()) == [("BBB", "5m", "5d")]
+        assert snap.quotes() == {} and snap.forecast("AAA", **SETTINGS) is None
+        print("   [OK] Tables missing from the new snapshot don't linger.")
+
+        # Only the current and the previous version are kept
+        for seed in range(3, 6):
+            current = write_snapshot(tmp, _tables("CCC", seed=seed))
+        versions = sorted(p.name for p in tmp.iterdir() if p.is_dir())
+        assert len(versions) == 2 and versions[-1] == current.name
+        assert (tmp / POINTER).read_text() == current.name
+        print("   [OK] Older versions pruned, CURRENT names the latest.")
+
+        # A failed write leaves the published snapshot untouched
+        bad = {"prices": _tables("DDD", seed=6)["prices"], "quotes": pd.DataFrame({"symbol": ["DDD"], "c": [object()]})}
+        try:
+            write_snapshot(tmp, bad)
+            raise AssertionError("unwritable table should fail")
+        except (TypeError, ValueError):  # pyarrow's ArrowTypeError / ArrowInvalid
+            pass
+        try:
+            write_snapshot(tmp, {"trades": pd.DataFrame()})
+            raise AssertionError("unknown table should fail")
+        except ValueError:
+            pass
+        assert list(load_snapshot(tmp).candles()) == [("CCC", "5m", "5d")]
+        assert sorted(p.name for p in tmp.iterdir() if p.is_dir()) == versions
+        print("   [OK] Failed writes publish nothing and leave no partial version.")
+
+        # Snapshots written before versioning (tables directly in the directory) still load
+        legacy = tmp / "legacy"
+        legacy.mkdir()
+        first["prices"].to_parquet(legacy / "prices.parquet", index=False)
+        assert list(load_snapshot(legacy).candles()) == [("AAA", "5m", "5d")]
+        write_snapshot(legacy, {"prices": _tables("EEE", seed=7)["prices"]})
+        assert not (legacy / "prices.parquet").exists()
+        assert list(load_snapshot(legacy).candles()) == [("EEE", "5m", "5d")]
+        print("   [OK] Flat-layout snapshots load and are migrated on the next write.")
+
+        # The cron job stores the default backtests and their metrics, as the app computes them
+        candles = synthetic_ohlcv(500, "AAA", seed=8)
+        real = write_dashboard_snapshot.get_candles_yahoo, write_dashboard_snapshot.get_quote
+        write_dashboard_snapshot.get_candles_yahoo = lambda symbol, interval, period: candles
+        write_dashboard_snapshot.get_quote = lambda symbol: {"c": 101.0}
+        try:
+            write_dashboard_snapshot.main(["--symbols", "AAA", "--output", str(tmp / "cron")])
+        finally:
+            write_dashboard_snapshot.get_candles_yahoo, write_dashboard_snapshot.get_quote = real
+        snap = load_snapshot(tmp / "cron")
+        out = momentum_strategy(PriceBars.from_frame(candles), lookback=20)
+        stored = snap.backtest("AAA", "5m", "5d", "Momentum", 20)
+        assert len(stored) == len(out) and stored["equity"].to_numpy().tolist() == out["equity_mom"].tolist()
+        assert stored["signal_lag"].tolist() == out["signal_lag"].tolist()
+        expected = compute_metrics(out, equity_col="equity_mom", ret_col="strat_ret")
+        assert snap.metrics("AAA", "5m", "5d", "Momentum", 20) == expected
+        bh = snap.backtest("AAA", "5m", "5d", "Buy & Hold", 0)
+        assert len(bh) == len(out) and "signal_lag" not in bh.columns  # momentum-only columns dropped
+        assert snap.backtest("AAA", "5m", "5d", "Momentum", 30) is None
+        assert snap.metrics("BBB", "5m", "5d", "Momentum", 20) is None
+        print("   [OK] Default backtests and metrics stored and looked up per run.")
+    finally:
+        shutil.rmtree(tmp)
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_snapshot()
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src import telemetry
+
+
+def test_telemetry():
+    print("--- TESTING TELEMETRY ---")
+    telemetry.drain()
+
+    # Successful and failing fetches (no provider involved)
+    with telemetry.observe_fetch("mock", "candles", "AAPL") as obs:
+        obs.rows, obs.bytes = 10, 800
+    try:
+        with telemetry.observe_fetch("mock", "candles", "BAD"):
+            raise RuntimeError("provider down")
+    except RuntimeError:
+        pass
+    assert telemetry.FETCH_REQUESTS.value(provider="mock", op="candles", symbol="AAPL", status="ok") == 1
+    assert telemetry.FETCH_REQUESTS.value(provider="mock", op="candles", symbol="BAD", status="error") == 1
+    assert telemetry.FETCH_LATENCY.count(provider="mock", op="candles") == 2
+    print("   [OK] Requests, errors and latency recorded per symbol.")
+
+    # Memoized call: a miss is flagged from inside the cached body
+    for _ in range(3):
+        with telemetry.cache_lookup("mock_cache"):
+            pass
+    with telemetry.cache_lookup("mock_cache"):
+        telemetry.cache_miss()
+    assert telemetry.CACHE_REQUESTS.value(cache="mock_cache", result="hit") == 3
+    assert telemetry.CACHE_REQUESTS.value(cache="mock_cache", result="miss") == 1
+    print("   [OK] Cache hits/misses.")
+
+    text = telemetry.render_prometheus()
+    assert 'quant_fetch_latency_seconds_bucket{provider="mock",op="candles",le="+Inf"} 2' in text
+    print("   [OK] Prometheus text format.")
+
+    # Worker -> parent hand-off
+    values = telemetry.drain()
+    assert telemetry.FETCH_ROWS.value(provider="mock", op="candles") == 0
+    telemetry.merge(values)
+    assert telemetry.FETCH_ROWS.value(provider="mock", op="candles") == 10
+    print("   [OK] Drain/merge round trip.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_telemetry()
@@ -0,0 +1,48 @@
+import json
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src import tracing
+from src.strategies.buy_hold import buy_and_hold
+from src.metrics.performance import compute_metrics
+
+
+def test_tracing():
+    print("--- TESTING TRACING ---")
+
+    # Mock intraday prices (no internet needed)
+    dates = pd.date_range(start="2023-01-01", periods=500, freq="5min")
+    prices = pd.DataFrame({"timestamp": dates, "close": 100 * np.exp(np.cumsum(np.random.normal(0, 0.001, 500)))})
+
+    # Disabled: nothing recorded, same results
+    assert tracing.active() is None
+    out_plain = buy_and_hold(prices)
+
+    with tracing.collect("test") as trace:
+        with tracing.span("stage.backtest"):
+            out = buy_and_hold(prices)
+        compute_metrics(out, equity_col="equity_bh", ret_col="ret")
+    assert tracing.active() is None
+    pd.testing.assert_frame_equal(out, out_plain)
+
+    summary = trace.summary()
+    for name in ["stage.backtest", "buy_hold.buy_and_hold", "buy_and_hold.copy_sort", "performance.compute_metrics"]:
+        assert name in summary.index, name
+    assert (summary["self_ms"] <= summary["total_ms"] + 1e-9).all()
+    print("   [OK] Spans recorded with nesting (self <= total).")
+
+    chrome = json.loads(json.dumps(trace.to_chrome()))
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in chrome["traceEvents"])
+    print("   [OK] Chrome trace export.")
+
+    print("\n--- TEST SUCCESSFUL ---")
+
+
+if __name__ == "__main__":
+    test_tracing()
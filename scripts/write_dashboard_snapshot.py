@@ -0,0 +1,125 @@
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from src.data.bars import PriceBars  # noqa: E402
+from src.data.finnhub import get_quote  # noqa: E402
+from src.data.snapshot import write_snapshot  # noqa: E402
+from src.data.universe import load_universe  # noqa: E402
+from src.data.yahoo import get_candles_yahoo  # noqa: E402
+from src.metrics.performance import compute_metrics  # noqa: E402
+from src.models.linear_forecast import forecast_next_day_ols_from_daily  # noqa: E402
+from src.strategies.buy_hold import buy_and_hold  # noqa: E402
+from src.strategies.momentum import momentum_strategy  # noqa: E402
+from src import telemetry  # noqa: E402
+
+
+# Dashboard defaults (app/streamlit_app.py and app/pages/2_Forecast.py)
+DEFAULT_INTERVAL = "5m"
+DEFAULT_PERIOD = "5d"
+DEFAULT_LOOKBACK = 20
+DEFAULT_INITIAL_VALUE = 100.0
+FORECAST_SETTINGS = {"lags": 5, "vol_window": 10, "momentum_lookback": 10, "alpha": 0.05}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Write the dashboard cold-start snapshot (Parquet).")
+    parser.add_argument("--symbols", nargs="*", default=["AAPL"])
+    parser.add_argument("--symbols-file", default=None)
+    parser.add_argument("--interval", default=DEFAULT_INTERVAL)
+    parser.add_argument("--period", default=DEFAULT_PERIOD)
+    parser.add_argument("--output", default=str(ROOT / "data" / "snapshot"))
+    return parser.parse_args(argv)
+
+
+def _backtest_rows(out: pd.DataFrame, equity_col: str, ret_col: str) -> pd.DataFrame:
+    rows = pd.DataFrame(
+        {
+            "timestamp": out["timestamp"],
+            "close": out["close"],
+            "ret": out["ret"],
+            "strat_ret": out[ret_col],
+            "equity": out[equity_col],
+        }
+    )
+    # momentum signal columns, so the app can show the stored run like a computed one
+    for col in ("mom", "signal", "signal_lag"):
+        if col in out.columns:
+            rows[col] = out[col]
+    return rows
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    symbols = load_universe(args.symbols, args.symbols_file)
+    t0 = time.perf_counter()
+
+    prices, backtests, metrics, forecasts, quotes = [], [], [], [], []
+    for symbol in symbols:
+        key = {"symbol": symbol, "interval": args.interval, "period": args.period}
+        try:
+            candles = get_candles_yahoo(symbol, interval=args.interval, period=args.period)
+        except Exception as e:
+            print(f"[{symbol}] candles unavailable: {e}")
+            continue
+        prices.append(candles.assign(**key))
+
+        # on the bars the app will see once the snapshot is loaded
+        bars = PriceBars.from_frame(candles)
+        runs = [
+            ("Buy & Hold", 0, buy_and_hold(bars, initial_value=DEFAULT_INITIAL_VALUE), "equity_bh", "ret"),
+            (
+                "Momentum",
+                DEFAULT_LOOKBACK,
+                momentum_strategy(bars, lookback=DEFAULT_LOOKBACK, initial_value=DEFAULT_INITIAL_VALUE),
+                "equity_mom",
+                "strat_ret",
+            ),
+        ]
+        for strategy, lookback, out, equity_col, ret_col in runs:
+            run_key = {**key, "strategy": strategy, "lookback": lookback}
+            backtests.append(_backtest_rows(out, equity_col, ret_col).assign(**run_key))
+            metrics.append({**run_key, **compute_metrics(out, equity_col=equity_col, ret_col=ret_col)})
+
+        try:
+            quotes.append({"symbol": symbol, **get_quote(symbol)})
+        except Exception as e:
+            print(f"[{symbol}] quote unavailable: {e}")
+
+        daily_path = ROOT / "data" / f"{symbol.lower()}_daily.csv"
+        if daily_path.exists():
+            try:
+                res = forecast_next_day_ols_from_daily(pd.read_csv(daily_path), **FORECAST_SETTINGS)
+                forecasts.append({"symbol": symbol, **FORECAST_SETTINGS, **asdict(res)})
+            except Exception as e:
+                print(f"[{symbol}] forecast unavailable: {e}")
+
+    if not prices:
+        print("No data retrieved. Snapshot not written.")
+        return
+
+    tables = {
+        "prices": pd.concat(prices, ignore_index=True),
+        "backtests": pd.concat(backtests, ignore_index=True),
+        "metrics": pd.DataFrame(metrics),
+    }
+    if forecasts:
+        tables["forecasts"] = pd.DataFrame(forecasts)
+    if quotes:
+        tables["quotes"] = pd.DataFrame(quotes)
+
+    out_dir = write_snapshot(args.output, tables)
+    print(f"Wrote snapshot: {out_dir} ({', '.join(f'{k}={len(v)}' for k, v in tables.items())}) in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
+    telemetry.dump("write_dashboard_snapshot")
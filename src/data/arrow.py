@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Text columns stay in Arrow memory (no Python str objects); numbers and
+# timestamps are plain NumPy so strategies get views via .to_numpy()
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+# Column types of a candles CSV as written by upsert_csv
+CANDLE_TYPES = {
+    "timestamp": pa.timestamp("ns", tz="UTC"),
+    "asset": pa.string(),
+    "open": pa.float64(),
+    "high": pa.float64(),
+    "low": pa.float64(),
+    "close": pa.float64(),
+    "volume": pa.float64(),
+}
+
+
+def _types_mapper(t: pa.DataType):
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        return STRING_DTYPE
+    return None
+
+
+def to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Frame from an Arrow table the caller no longer needs: Arrow buffers are
+    released as columns are converted, strings kept Arrow-backed. Numbers are
+    copied into pandas-owned, writable NumPy blocks (zero-copy conversion
+    would hand out read-only arrays that break `df.loc[...] = ...`).
+    """
+    return table.to_pandas(types_mapper=_types_mapper, self_destruct=True)
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Arrow table sharing the frame's NumPy and Arrow-backed column buffers.
+    """
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def with_arrow_strings(df: pd.DataFrame, columns=("asset",)) -> pd.DataFrame:
+    """
+    `df` with the given text columns converted to STRING_DTYPE (in place).
+    """
+    for col in columns:
+        if col in df.columns and df[col].dtype != STRING_DTYPE:
+            df[col] = df[col].astype(STRING_DTYPE)
+    return df
+
+
+def _convert_options() -> pacsv.ConvertOptions:
+    return pacsv.ConvertOptions(column_types=CANDLE_TYPES)
+
+
+def read_candles_csv(path: str) -> pa.Table:
+    """
+    Candles CSV parsed by Arrow. Timestamps must carry a UTC offset, as
+    upsert_csv writes them (pa.ArrowInvalid otherwise).
+    """
+    return pacsv.read_csv(path, convert_options=_convert_options())
+
+
+def iter_candle_tables(path: str, rows: int, asset: Optional[str] = None) -> Iterator[pa.Table]:
+    """
+    Candles CSV streamed as Arrow tables of exactly `rows` rows (the last one
+    shorter), keeping only `asset` when given. Memory is bounded by `rows`
+    plus one parse block.
+    """
+    if rows < 1:
+        raise ValueError("rows must be >= 1")
+
+    pending: list[pa.RecordBatch] = []
+    n_pending = 0
+    with pacsv.open_csv(path, convert_options=_convert_options()) as reader:
+        for batch in reader:
+            if asset is not None:
+                batch = batch.filter(pc.equal(batch.column("asset"), asset))
+            pending.append(batch)
+            n_pending += batch.num_rows
+            while n_pending >= rows:
+                table = pa.Table.from_batches(pending)
+                yield table.slice(0, rows)
+                rest = table.slice(rows)
+                pending, n_pending = rest.to_batches(), rest.num_rows
+    if n_pending:
+        yield pa.Table.from_batches(pending)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from tenacity import Retrying, stop_after_attempt, wait_exponential_jitter
+
+from src.data.finnhub import get_candles_range
+from src.data.middleware import FetchPolicy, fetch_policy
+from src.data.ratelimit import TokenBucket
+from src.data.storage import upsert_csv
+from src.tracing import span, traced
+
+# Seconds per bar of a Finnhub candle resolution
+RESOLUTION_SECONDS = {
+    "1": 60, "5": 5 * 60, "15": 15 * 60, "30": 30 * 60, "60": 60 * 60,
+    "D": 24 * 3600, "W": 7 * 24 * 3600, "M": 30 * 24 * 3600,
+}
+
+# Backfill retries and rate-limits windows itself: one upstream request per
+# limiter token, so no middleware retries, hedges or shared requests
+SINGLE_ATTEMPT = FetchPolicy(retries=0, hedge=False, coalesce=False, deadline_seconds=None)
+
+
+def plan_windows(start: int, end: int, resolution: str, max_bars: int = 5_000) -> list[tuple[int, int]]:
+    """
+    [start, end] (unix seconds, both included) split into windows of at most
+    `max_bars` bars of wall-clock time. Window edges sit on a fixed grid
+    (multiples of the window length), so runs with a later `end` reuse the
+    windows already done and only refetch the last, partial one.
+    """
+    if resolution not in RESOLUTION_SECONDS:
+        raise ValueError(f"Unknown resolution '{resolution}'. Expected one of {list(RESOLUTION_SECONDS)}")
+    if end < start:
+        raise ValueError("end must be >= start")
+    if max_bars < 1:
+        raise ValueError("max_bars must be >= 1")
+
+    length = RESOLUTION_SECONDS[resolution] * max_bars
+    windows = []
+    edge = start - start % length
+    while edge <= end:
+        windows.append((max(edge, start), min(edge + length - 1, end)))
+        edge += length
+    return windows
+
+
+@dataclass
+class BackfillCheckpoint:
+    """
+    Windows already merged into storage, persisted as JSON (replaced atomically).
+    """
+    path: Path
+    symbol: str
+    resolution: str
+    done: set[tuple[int, int]] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: str | Path, symbol: str, resolution: str) -> "BackfillCheckpoint":
+        p = Path(path)
+        if not p.exists():
+            return cls(p, symbol, resolution)
+        state = json.loads(p.read_text())
+        if (state.get("symbol"), state.get("resolution")) != (symbol, resolution):
+            raise ValueError(
+                f"Checkpoint {p} is for {state.get('symbol')} resolution={state.get('resolution')}, "
+                f"not {symbol} resolution={resolution}"
+            )
+        return cls(p, symbol, resolution, {tuple(w) for w in state.get("done", [])})
+
+    def covers(self, window: tuple[int, int]) -> bool:
+        return any(lo <= window[0] and window[1] <= hi for lo, hi in self.done)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        state = {"symbol": self.symbol, "resolution": self.resolution, "done": sorted(self.done)}
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, self.path)
+
+
+def checkpoint_path_for(path: str | Path) -> Path:
+    p = Path(path)
+    return p.with_name(p.name + ".backfill.json")
+
+
+@traced("backfill.finnhub_candles")
+def backfill_candles(
+    symbol: str,
+    resolution: str,
+    start: int,
+    end: int,
+    path: str | Path,
+    checkpoint_path: Optional[str | Path] = None,
+    max_bars: int = 5_000,
+    workers: int = 4,
+    limiter: Optional[TokenBucket] = None,
+    retries: int = 3,
+    backoff_seconds: float = 1.0,
+    flush_every: int = 20,
+    fetch: Callable[[str, str, int, int], pd.DataFrame] = get_candles_range,
+) -> dict:
+    """
+    Fetch Finnhub candles for [start, end] window by window and upsert them into `path`.
+
+    - windows (plan_windows) are fetched by `workers` threads; every request
+      first takes a token from `limiter` (default: 1 request/s, the free tier's
+      60 calls/minute), and a failed window is retried `retries` times with
+      jittered exponential backoff from `backoff_seconds`; the provider
+      middleware makes a single attempt per token (SINGLE_ATTEMPT)
+    - completed windows are merged every `flush_every` windows (and on exit,
+      interrupted or not), then recorded in the checkpoint: a rerun skips them
+    - windows that still fail are reported in "failed"; rerun to retry them
+
+    Returns {"windows", "skipped", "fetched", "rows", "failed"}.
+    """
+    windows = plan_windows(start, end, resolution, max_bars=max_bars)
+    checkpoint = BackfillCheckpoint.load(checkpoint_path or checkpoint_path_for(path), symbol, resolution)
+    todo = [w for w in windows if not checkpoint.covers(w)]
+    limiter = limiter or TokenBucket(rate=1.0, burst=1)
+
+    def fetch_window(window: tuple[int, int]) -> pd.DataFrame:
+        for attempt in Retrying(
+            stop=stop_after_attempt(retries + 1),
+            wait=wait_exponential_jitter(initial=backoff_seconds, max=backoff_seconds * 30, jitter=backoff_seconds),
+            reraise=True,
+        ):
+            with attempt, fetch_policy(SINGLE_ATTEMPT):
+                limiter.acquire()
+                return fetch(symbol, resolution, *window)
+
+    summary = {"windows": len(windows), "skipped": len(windows) - len(todo), "fetched": 0, "rows": 0, "failed": []}
+    pending_frames: list[pd.DataFrame] = []
+    pending_windows: list[tuple[int, int]] = []
+
+    def flush() -> None:
+        if not pending_windows:
+            return
+        with span("backfill.flush", windows=len(pending_windows)):
+            frames = [f for f in pending_frames if not f.empty]
+            if frames:
+                upsert_csv(pd.concat(frames, ignore_index=True), str(path))
+            # data first, then the checkpoint: it never lists windows that aren't stored
+            checkpoint.done.update(pending_windows)
+            checkpoint.save()
+        pending_frames.clear()
+        pending_windows.clear()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {executor.submit(fetch_window, w): w for w in todo}
+        for future in as_completed(futures):
+            window = futures.pop(future)
+            try:
+                df = future.result()
+            except Exception as e:  # noqa: BLE001 - reported, the window is retried on the next run
+                summary["failed"].append({"window": list(window), "error": f"{type(e).__name__}: {e}"})
+                continue
+            summary["fetched"] += 1
+            summary["rows"] += len(df)
+            pending_frames.append(df)
+            pending_windows.append(window)
+            if len(pending_windows) >= flush_every:
+                flush()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        flush()
+    return summary
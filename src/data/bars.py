@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class PriceBars:
+    """
+    Candles that are known to be clean, so consumers can skip defensive work.
+
+    Invariants of `frame` (checked by from_frame):
+      - `timestamp` column: datetime64, tz=UTC, no NaT, sorted ascending
+      - no duplicate (timestamp, asset) rows
+      - `close` column: float64, no NaN
+      - RangeIndex 0..n-1
+
+    Strategies, metrics and forecasters given PriceBars don't copy, sort or
+    parse timestamps. The frame is shared: treat it as read-only.
+    """
+    frame: pd.DataFrame
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "PriceBars":
+        """
+        Wrap `df` as is when it already satisfies the invariants (O(n) checks,
+        no copy); otherwise normalize it with one copy: parse timestamps to UTC,
+        drop rows without timestamp or close, sort, keep the last duplicate.
+        """
+        if is_normalized(df):
+            return cls(df)
+        out = df.copy()
+        out["timestamp"] = pd.to_datetime(out["timestamp"], utc=True, errors="coerce")
+        out["close"] = pd.to_numeric(out["close"], errors="coerce").astype("float64")
+        out = out.dropna(subset=["timestamp", "close"])
+        subset = ["timestamp", "asset"] if "asset" in out.columns else ["timestamp"]
+        out = out.sort_values("timestamp", kind="stable").drop_duplicates(subset=subset, keep="last")
+        return cls(out.reset_index(drop=True))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def timestamps(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.frame["timestamp"])
+
+    @property
+    def close(self) -> np.ndarray:
+        # view of the column, no copy
+        return self.frame["close"].to_numpy()
+
+    def close_series(self) -> pd.Series:
+        """
+        Close prices indexed by timestamp, sharing the frame's memory.
+        """
+        return pd.Series(self.close, index=self.timestamps, name="close", copy=False)
+
+
+def timestamp_ns(ts: pd.Series) -> np.ndarray:
+    """
+    int64 nanoseconds of a datetime64 column (a view unless the unit isn't ns).
+    """
+    arr = ts.array
+    return (arr if arr.unit == "ns" else arr.as_unit("ns")).asi8
+
+
+def is_normalized(df: pd.DataFrame) -> bool:
+    """
+    True if `df` already satisfies the PriceBars invariants.
+    """
+    if "timestamp" not in df.columns or "close" not in df.columns:
+        return False
+    idx = df.index
+    if not (isinstance(idx, pd.RangeIndex) and idx.start == 0 and idx.step == 1):
+        return False
+    ts = df["timestamp"]
+    if not isinstance(ts.dtype, pd.DatetimeTZDtype) or str(ts.dtype.tz) != "UTC":
+        return False
+    if df["close"].dtype != np.float64 or df["close"].hasnans or ts.hasnans:
+        return False
+    if not ts.is_monotonic_increasing:
+        return False
+    ns = timestamp_ns(ts)
+    if (ns[1:] != ns[:-1]).all():
+        return True
+    # equal timestamps are fine for different assets only
+    return "asset" in df.columns and not df.duplicated(subset=["timestamp", "asset"]).any()
+
+
+def working_frame(prices: pd.DataFrame | PriceBars) -> pd.DataFrame:
+    """
+    Frame a strategy can add columns to without touching the caller's data:
+    a shallow copy of validated bars (no data copied), otherwise a sorted copy.
+    """
+    if isinstance(prices, PriceBars):
+        return prices.frame.copy(deep=False)
+    return prices.copy().sort_values("timestamp").reset_index(drop=True)
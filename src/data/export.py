@@ -0,0 +1,60 @@
+import io
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+
+
+# label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": (".arrow", "application/vnd.apache.arrow.file"),
+}
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_export(df: pd.DataFrame, fmt: str, sink: BinaryIO, chunk_rows: int = 50_000) -> None:
+    """
+    Stream `df` into a binary file-like object `chunk_rows` rows at a time,
+    so no full-size intermediate string is ever built.
+    - CSV: one text chunk per slice (header on the first one)
+    - Parquet: one row group per slice
+    - Arrow IPC: one record batch per slice (file format)
+    """
+    if fmt == "CSV":
+        for i, chunk in enumerate(_chunks(df, chunk_rows)):
+            sink.write(chunk.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+        return
+
+    from src.data.arrow import to_arrow
+
+    # one zero-copy conversion for NumPy and Arrow-backed columns, then sliced
+    table = to_arrow(df)
+
+    if fmt == "Parquet":
+        import pyarrow.parquet as pq
+
+        with pq.ParquetWriter(sink, table.schema, compression="zstd") as writer:
+            writer.write_table(table, row_group_size=chunk_rows)
+    elif fmt == "Arrow IPC":
+        import pyarrow as pa
+
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=chunk_rows)
+    else:
+        raise ValueError(f"Unknown export format '{fmt}'. Expected one of {list(EXPORT_FORMATS)}")
+
+
+def export_file(df: pd.DataFrame, fmt: str, chunk_rows: int = 50_000) -> io.BytesIO:
+    """
+    Export `df` into an in-memory buffer and return it rewound: a type
+    st.download_button accepts from its deferred `data` callable.
+    """
+    buf = io.BytesIO()
+    write_export(df, fmt, buf, chunk_rows=chunk_rows)
+    buf.seek(0)
+    return buf
@@ -1,11 +1,14 @@
 
 import os
 import time
-import requests
-import pandas as pd
+from typing import Optional
 
+import pandas as pd
 
-BASE_URL = "https://finnhub.io/api/v1"
+from src.data.arrow import with_arrow_strings
+from src.data.providers import get_provider
+from src.telemetry import observe_fetch
+from src.tracing import traced
 
 
 def _api_key() -> str:
@@ -18,36 +21,57 @@ def _api_key() -> str:
     return key
 
 
+@traced("fetch.finnhub.quote")
 def get_quote(symbol: str = "AAPL") -> dict:
-    r = requests.get(
-        f"{BASE_URL}/quote",
-        params={"symbol": symbol, "token": _api_key()},
-        timeout=20,
-    )
-    r.raise_for_status()
-    return r.json()
+    with observe_fetch("finnhub", "quote", symbol) as obs:
+        # the provider adds the token (live) or serves a recording (replay)
+        data, nbytes = get_provider().finnhub_get("/quote", {"symbol": symbol}, timeout=20)
+        obs.rows, obs.bytes = 1, nbytes
+        return data
 
 
+@traced("fetch.finnhub.candles")
 def get_candles(symbol: str = "AAPL", resolution: str = "5", lookback_days: int = 5) -> pd.DataFrame:
     now = int(time.time())
     frm = now - lookback_days * 24 * 60 * 60
 
-    r = requests.get(
-        f"{BASE_URL}/stock/candle",
-        params={
-            "symbol": symbol,
-            "resolution": resolution,
-            "from": frm,
-            "to": now,
-            "token": _api_key(),
-        },
-        timeout=30,
+    df = get_candles_range(
+        symbol,
+        resolution,
+        frm,
+        now,
+        key_params={"symbol": symbol, "resolution": resolution, "lookback_days": lookback_days},
     )
-    r.raise_for_status()
-    data = r.json()
+    if df.empty:
+        raise RuntimeError(f"Finnhub candle API returned no data for {symbol} over the last {lookback_days} days")
+    return df
 
-    if data.get("s") != "ok":
-        raise RuntimeError(f"Finnhub candle API returned s={data.get('s')} payload={data}")
+
+@traced("fetch.finnhub.candles_range")
+def get_candles_range(
+    symbol: str,
+    resolution: str,
+    start: int,
+    end: int,
+    key_params: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    Candles between two unix timestamps (seconds, both included).
+    Empty frame when Finnhub has no bars in the range (s=no_data).
+    """
+    with observe_fetch("finnhub", "candles", symbol) as obs:
+        data, nbytes = get_provider().finnhub_get(
+            "/stock/candle",
+            {"symbol": symbol, "resolution": resolution, "from": int(start), "to": int(end)},
+            timeout=30,
+            key_params=key_params,
+        )
+
+        if data.get("s") == "no_data":
+            data = {"t": [], "c": [], "o": [], "h": [], "l": [], "v": []}
+        elif data.get("s") != "ok":
+            raise RuntimeError(f"Finnhub candle API returned s={data.get('s')} payload={data}")
+        obs.rows, obs.bytes = len(data.get("t", [])), nbytes
 
     df = pd.DataFrame(
         {"timestamp": pd.to_datetime(data["t"], unit="s", utc=True),
@@ -56,11 +80,10 @@ def get_candles(symbol: str = "AAPL", resolution: str = "5", lookback_days: int
             "high": data["h"],
             "low": data["l"],
             "volume": data["v"],
-        })
-    
+        }).astype({c: float for c in ("close", "open", "high", "low", "volume")})
+
     df["asset"] = symbol
 
     df = df[["timestamp", "asset", "close", "open", "high", "low", "volume"]]
     df = df.drop_duplicates(subset=["timestamp", "asset"]).sort_values("timestamp").reset_index(drop=True)
-    return df
-    
+    return with_arrow_strings(df)
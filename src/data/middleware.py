@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import requests
+
+from src.data.providers import _finnhub_key, _yahoo_params, recording_key
+from src.telemetry import fetch_event
+
+# Fetch policy from the environment (see policy_from_env):
+#   QUANT_FETCH_RETRIES     = extra attempts after a retryable failure (default 2)
+#   QUANT_FETCH_DEADLINE_S  = wall-clock budget of one call, retries included (default 30)
+#   QUANT_FETCH_HEDGE       = 1 to send a duplicate request after the p95 latency (default 0)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@dataclass
+class FetchPolicy:
+    """
+    How ResilientProvider runs a provider call.
+      - retries: extra attempts after a retryable failure (connection error,
+        timeout, HTTP 429 / 5xx), waiting backoff_seconds * 2^n plus up to the
+        same again of random jitter, capped at max_backoff_seconds (a 429's
+        Retry-After is honoured)
+      - deadline_seconds: budget of the whole call, hedges and retries included
+      - hedge: once an attempt is slower than the `hedge_quantile` of recent
+        successful latencies (or hedge_delay_seconds when set), send one
+        duplicate and take whichever answers first
+      - coalesce: identical concurrent calls share one request (single flight)
+    """
+    retries: int = 2
+    backoff_seconds: float = 0.2
+    max_backoff_seconds: float = 5.0
+    deadline_seconds: Optional[float] = 30.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95
+    hedge_delay_seconds: Optional[float] = None
+    hedge_min_samples: int = 20
+    latency_window: int = 200
+    coalesce: bool = True
+
+
+def policy_from_env() -> FetchPolicy:
+    deadline = float(os.getenv("QUANT_FETCH_DEADLINE_S", "30"))
+    return FetchPolicy(
+        retries=int(os.getenv("QUANT_FETCH_RETRIES", "2")),
+        deadline_seconds=deadline if deadline > 0 else None,
+        hedge=os.getenv("QUANT_FETCH_HEDGE", "0").lower() in ("1", "true", "yes", "on"),
+    )
+
+
+_DEADLINES = threading.local()
+_POLICIES = threading.local()
+
+
+@contextmanager
+def fetch_deadline(seconds: float):
+    """
+    Cap every provider call made by this thread inside the block, e.g. a
+    dashboard rerun: `with fetch_deadline(5): ...`. Nested blocks keep the
+    earliest deadline.
+    """
+    stack = _DEADLINES.__dict__.setdefault("stack", [])
+    at = time.monotonic() + seconds
+    stack.append(min([at, *stack]))
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+@contextmanager
+def fetch_policy(policy: FetchPolicy):
+    """
+    Run the provider calls made by this thread inside the block under
+    `policy` instead of the provider's own, e.g. single attempts for a caller
+    that rate-limits and retries by itself.
+    """
+    stack = _POLICIES.__dict__.setdefault("stack", [])
+    stack.append(policy)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _deadline(policy: FetchPolicy, now: float) -> Optional[float]:
+    limits = list(getattr(_DEADLINES, "stack", [])[-1:])
+    if policy.deadline_seconds is not None:
+        limits.append(now + policy.deadline_seconds)
+    return min(limits) if limits else None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return False
+
+
+def _retry_after(exc: BaseException) -> float:
+    response = getattr(exc, "response", None)
+    try:
+        return float(response.headers.get("Retry-After", 0)) if response is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+class LatencyTracker:
+    """
+    Recent successful call latencies per operation (bounded window).
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def add(self, op: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(op, deque(maxlen=self.window)).append(seconds)
+
+    def quantile(self, op: str, q: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            samples = list(self._samples.get(op, ()))
+        if len(samples) < max(1, min_samples):
+            return None
+        return float(np.quantile(samples, q))
+
+
+class SingleFlight:
+    """
+    Concurrent calls with the same key share one call of `fn`, run on
+    `executor`. Every caller (the first one included) waits with its own
+    timeout; a caller that gives up leaves the shared call running for the
+    others.
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self._executor = executor
+        self._calls: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: tuple, fn: Callable[[], object], timeout: Optional[float] = None) -> tuple[object, bool]:
+        """
+        (result, shared): shared is True when another caller's request was reused.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            shared = future is not None
+            if not shared:
+                future = self._calls[key] = self._executor.submit(fn)
+        if not shared:
+            # outside the lock: the callback runs inline if fn already finished
+            future.add_done_callback(lambda f: self._forget(key, f))
+        try:
+            return future.result(timeout=timeout), shared
+        except FutureTimeout:
+            raise DeadlineExceeded(f"deadline exceeded waiting for {key[0]}") from None
+
+    def _forget(self, key: tuple, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+
+class ResilientProvider:
+    """
+    Wraps a provider (live, record or replay) with retries, deadlines, hedged
+    requests and single-flight coalescing; same interface, so the parsing in
+    src.data.yahoo / src.data.finnhub is unchanged.
+
+    Attempts run on a small thread pool: a call gives up at its deadline even
+    if the request is still in flight (the late response is dropped).
+    Coalesced callers get shallow copies (frame / dict) of the shared payload.
+    """
+
+    def __init__(self, inner, policy: Optional[FetchPolicy] = None, max_workers: int = 32):
+        self.inner = inner
+        self.policy = policy or FetchPolicy()
+        self.latency = LatencyTracker(self.policy.latency_window)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        # shared calls wait on attempts in self._pool, so they get their own pool
+        self._flight = SingleFlight(ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch-flight"))
+
+    @property
+    def mode(self) -> str:
+        return self.inner.mode
+
+    def __getattr__(self, name):
+        # record_dir, url, ... of the wrapped provider
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def yahoo_download(self, symbols, interval: str, period: str, **kwargs) -> pd.DataFrame:
+        key = recording_key("yahoo", "download", _yahoo_params(symbols, interval, period, kwargs))
+        df = self._run("yahoo", key, lambda: self.inner.yahoo_download(symbols, interval=interval, period=period, **kwargs))
+        return df.copy(deep=False) if df is not None else df
+
+    def finnhub_get(self, endpoint: str, params: dict, timeout: float = 20, key_params: Optional[dict] = None) -> tuple[dict, int]:
+        key = _finnhub_key(endpoint, params, key_params)
+        data, nbytes = self._run(
+            "finnhub", key, lambda: self.inner.finnhub_get(endpoint, params, timeout=timeout, key_params=key_params)
+        )
+        return dict(data), nbytes
+
+    # --- internals ----------------------------------------------------------
+
+    def _run(self, provider: str, key: str, fn: Callable[[], object]):
+        policy = (getattr(_POLICIES, "stack", None) or [self.policy])[-1]
+        now = time.monotonic()
+        deadline = _deadline(policy, now)
+        if not policy.coalesce:
+            return self._call(provider, key, fn, deadline, policy)
+        # the shared call serves every waiter, so it runs under the policy
+        # deadline only; each caller's fetch_deadline just bounds its own wait
+        shared_deadline = None if policy.deadline_seconds is None else now + policy.deadline_seconds
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        result, shared = self._flight.do(
+            (provider, key), lambda: self._call(provider, key, fn, shared_deadline, policy), timeout=timeout
+        )
+        if shared:
+            fetch_event(provider, "coalesced")
+        return result
+
+    def _op(self, provider: str, key: str) -> str:
+        # latency is tracked per endpoint (yahoo/download, finnhub/quote, ...)
+        return "/".join(key.split("/")[:2]) or provider
+
+    def _call(self, provider: str, key: str, fn: Callable[[], object], deadline: Optional[float], policy: FetchPolicy):
+        attempt = 0
+        while True:
+            try:
+                return self._hedged(provider, self._op(provider, key), fn, deadline, policy)
+            except DeadlineExceeded:
+                fetch_event(provider, "deadline")
+                raise
+            except Exception as e:
+                if attempt >= policy.retries or not is_retryable(e):
+                    raise
+                base = min(policy.max_backoff_seconds, policy.backoff_seconds * 2 ** attempt)
+                delay = max(base + random.uniform(0.0, base), _retry_after(e))
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    fetch_event(provider, "deadline")
+                    raise DeadlineExceeded(f"deadline exceeded after {attempt + 1} attempt(s) of {key}") from e
+                fetch_event(provider, "retry")
+                time.sleep(delay)
+                attempt += 1
+
+    def _timed(self, op: str, fn: Callable[[], object]):
+        t0 = time.monotonic()
+        result = fn()
+        self.latency.add(op, time.monotonic() - t0)
+        return result
+
+    def _hedge_delay(self, op: str, policy: Optional[FetchPolicy] = None) -> Optional[float]:
+        policy = policy or self.policy
+        if not policy.hedge:
+            return None
+        if policy.hedge_delay_seconds is not None:
+            return policy.hedge_delay_seconds
+        return self.latency.quantile(op, policy.hedge_quantile, min_samples=policy.hedge_min_samples)
+
+    def _hedged(self, provider: str, op: str, fn: Callable[[], object], deadline: Optional[float], policy: FetchPolicy):
+        started = time.monotonic()
+        primary = self._pool.submit(self._timed, op, fn)
+        running = {primary}
+        hedge_at = self._hedge_delay(op, policy)
+        hedge = None
+        error = None
+        while running:
+            now = time.monotonic()
+            timeout = None if deadline is None else deadline - now
+            if timeout is not None and timeout <= 0:
+                raise DeadlineExceeded(f"deadline exceeded waiting for {op}")
+            if hedge is None and hedge_at is not None:
+                until_hedge = max(0.0, started + hedge_at - now)
+                timeout = until_hedge if timeout is None else min(timeout, until_hedge)
+
+            done, running = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        fetch_event(provider, "hedge_won")
+                    return future.result()
+                error = future.exception()
+
+            if hedge is None and hedge_at is not None and time.monotonic() >= started + hedge_at and running:
+                # the primary is slower than usual: race a duplicate against it
+                fetch_event(provider, "hedge")
+                hedge = self._pool.submit(self._timed, op, fn)
+                running = running | {hedge}
+        raise error
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import requests
+
+
+ROOT = Path(__file__).resolve().parents[2]
+
+FINNHUB_URL = "https://finnhub.io/api/v1"
+DEFAULT_RECORD_DIR = ROOT / "data" / "recordings"
+
+# Provider mode, read once on first use:
+#   QUANT_PROVIDER_MODE = live (default) | record | replay
+#   QUANT_RECORD_DIR    = where recordings are written / read (default data/recordings)
+#   QUANT_REPLAY_URL    = replay from a stub server (scripts/replay_server.py) instead of files
+MODES = ("live", "record", "replay")
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", text).strip("_") or "_"
+
+
+def recording_key(provider: str, op: str, params: dict) -> str:
+    """
+    Stable relative path of a recording, e.g. yahoo/download/AAPL_5m_5d.parquet.
+    Secrets (token) are never part of the key.
+    """
+    params = {k: v for k, v in sorted(params.items()) if k != "token" and v is not None}
+    readable = _slug("_".join(str(v) for v in params.values()))[:80]
+    digest = hashlib.blake2b(json.dumps(params, sort_keys=True, default=str).encode(), digest_size=4).hexdigest()
+    ext = "parquet" if provider == "yahoo" else "json"
+    return f"{provider}/{op}/{readable}-{digest}.{ext}"
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    buf = io.BytesIO()
+    df.to_parquet(buf)
+    return buf.getvalue()
+
+
+def frame_from_bytes(data: bytes) -> pd.DataFrame:
+    return pd.read_parquet(io.BytesIO(data))
+
+
+class LiveProvider:
+    """
+    Raw provider payloads: the yfinance download frame, the Finnhub JSON body.
+    Parsing stays in src.data.yahoo / src.data.finnhub, so every mode runs it.
+    """
+    mode = "live"
+
+    def __init__(self, finnhub_url: str = FINNHUB_URL):
+        self.finnhub_url = finnhub_url
+        # Reused connection pool (keep-alive) across calls of a long-running process
+        self._session = requests.Session()
+
+    def yahoo_download(self, symbols, interval: str, period: str, **kwargs) -> pd.DataFrame:
+        import yfinance as yf  # heavy import, loaded on first fetch
+
+        return yf.download(symbols, interval=interval, period=period, progress=False, **kwargs)
+
+    def finnhub_get(self, endpoint: str, params: dict, timeout: float = 20, key_params: Optional[dict] = None) -> tuple[dict, int]:
+        from src.data.finnhub import _api_key
+
+        r = self._session.get(f"{self.finnhub_url}{endpoint}", params={**params, "token": _api_key()}, timeout=timeout)
+        r.raise_for_status()
+        return r.json(), len(r.content)
+
+
+def _yahoo_params(symbols, interval: str, period: str, kwargs: dict) -> dict:
+    sym = symbols if isinstance(symbols, str) else ",".join(symbols)
+    return {"symbols": sym, "interval": interval, "period": period, **kwargs}
+
+
+def _finnhub_key(endpoint: str, params: dict, key_params: Optional[dict]) -> str:
+    # key_params replaces wall-clock request params (from/to) so a replay matches its recording
+    return recording_key("finnhub", endpoint.strip("/").replace("/", "_"), params if key_params is None else key_params)
+
+
+class RecordingProvider(LiveProvider):
+    """
+    Live calls, every payload also written under `record_dir` (replaced atomically).
+    """
+    mode = "record"
+
+    def __init__(self, record_dir: str | Path = DEFAULT_RECORD_DIR, finnhub_url: str = FINNHUB_URL):
+        super().__init__(finnhub_url)
+        self.record_dir = Path(record_dir)
+
+    def _save(self, key: str, data: bytes) -> None:
+        path = self.record_dir / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def yahoo_download(self, symbols, interval: str, period: str, **kwargs) -> pd.DataFrame:
+        df = super().yahoo_download(symbols, interval, period, **kwargs)
+        if df is not None and not df.empty:
+            self._save(recording_key("yahoo", "download", _yahoo_params(symbols, interval, period, kwargs)), frame_to_bytes(df))
+        return df
+
+    def finnhub_get(self, endpoint: str, params: dict, timeout: float = 20, key_params: Optional[dict] = None) -> tuple[dict, int]:
+        data, nbytes = super().finnhub_get(endpoint, params, timeout)
+        self._save(_finnhub_key(endpoint, params, key_params), json.dumps(data).encode())
+        return data, nbytes
+
+
+class ReplayProvider:
+    """
+    Serves recorded payloads: from `record_dir`, or from a stub server at `url`
+    (which adds its own latency/throttling). No network access, no API key needed.
+    """
+    mode = "replay"
+
+    def __init__(self, record_dir: str | Path = DEFAULT_RECORD_DIR, url: Optional[str] = None, timeout: float = 30):
+        self.record_dir = Path(record_dir)
+        self.url = url.rstrip("/") if url else None
+        self.timeout = timeout
+        self._session = requests.Session() if url else None
+
+    def _load(self, key: str, params: dict) -> bytes:
+        if self.url:
+            # params let the server synthesize a payload when it has no recording (--synthetic)
+            r = self._session.get(f"{self.url}/{key}", params=params, timeout=self.timeout)
+            if r.status_code == 404:
+                raise RuntimeError(f"No recording for {key} on {self.url}")
+            r.raise_for_status()
+            return r.content
+        path = self.record_dir / key
+        if not path.exists():
+            raise RuntimeError(f"No recording for {key} in {self.record_dir} (record it with QUANT_PROVIDER_MODE=record)")
+        return path.read_bytes()
+
+    def yahoo_download(self, symbols, interval: str, period: str, **kwargs) -> pd.DataFrame:
+        params = _yahoo_params(symbols, interval, period, kwargs)
+        return frame_from_bytes(self._load(recording_key("yahoo", "download", params), params))
+
+    def finnhub_get(self, endpoint: str, params: dict, timeout: float = 20, key_params: Optional[dict] = None) -> tuple[dict, int]:
+        data = self._load(_finnhub_key(endpoint, params, key_params), params if key_params is None else key_params)
+        return json.loads(data), len(data)
+
+
+_PROVIDER = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def provider_from_env():
+    """
+    Provider for QUANT_PROVIDER_MODE, wrapped in the fetch middleware
+    (retries, deadlines, hedging, coalescing; see src.data.middleware).
+    """
+    from src.data.middleware import ResilientProvider, policy_from_env
+
+    mode = os.getenv("QUANT_PROVIDER_MODE", "live").lower()
+    if mode not in MODES:
+        raise ValueError(f"QUANT_PROVIDER_MODE must be one of {MODES}, got '{mode}'")
+    record_dir = os.getenv("QUANT_RECORD_DIR", str(DEFAULT_RECORD_DIR))
+    if mode == "record":
+        inner = RecordingProvider(record_dir)
+    elif mode == "replay":
+        inner = ReplayProvider(record_dir, url=os.getenv("QUANT_REPLAY_URL"))
+    else:
+        inner = LiveProvider()
+    return ResilientProvider(inner, policy_from_env())
+
+
+def get_provider():
+    """
+    Process-wide provider, chosen from the environment on first use.
+    """
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        if _PROVIDER is None:
+            _PROVIDER = provider_from_env()
+        return _PROVIDER
+
+
+def set_provider(provider) -> None:
+    """
+    Override the provider (tests, load tests); None re-reads the environment on next use.
+    """
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        _PROVIDER = provider
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
+
+import pandas as pd
+
+from src.data.bars import PriceBars
+from src.data.finnhub import get_quote
+from src.data.snapshot import load_snapshot
+from src.data.yahoo import get_candles_yahoo
+from src import telemetry
+from src.tracing import traced
+
+
+CandleKey = tuple[str, str, str]  # (symbol, interval, period)
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """
+    Immutable view of the latest fetched data.
+    A new snapshot is published after every refresh; readers never see partial updates.
+    Candles are validated once when published (PriceBars) and shared between all
+    readers: do not mutate them.
+    """
+    version: int = 0
+    published_at: Optional[datetime] = None
+    candles: Mapping[CandleKey, PriceBars] = field(default_factory=lambda: MappingProxyType({}))
+    quotes: Mapping[str, dict] = field(default_factory=lambda: MappingProxyType({}))
+    fetched_at: Mapping[object, datetime] = field(default_factory=lambda: MappingProxyType({}))
+    errors: Mapping[object, str] = field(default_factory=lambda: MappingProxyType({}))
+
+
+class DataService:
+    """
+    Background refresher shared by all dashboard sessions of one process.
+
+    Sessions read the current snapshot; a single thread refreshes every registered
+    (symbol, interval, period) candle request and quote every `refresh_seconds`.
+    The first request for a new key fetches synchronously and registers it.
+    Keys nobody read for `idle_seconds` are dropped from the snapshot. A key
+    whose last fetch is older than `stale_seconds` (default: two refresh
+    periods, i.e. the refresher fell behind) is refetched by the reader.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 300.0,
+        idle_seconds: float = 3600.0,
+        stale_seconds: Optional[float] = None,
+        candle_fetcher: Callable[..., pd.DataFrame] = get_candles_yahoo,
+        quote_fetcher: Callable[[str], dict] = get_quote,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.idle_seconds = idle_seconds
+        self.stale_seconds = stale_seconds if stale_seconds is not None else 2 * refresh_seconds
+        self._candle_fetcher = candle_fetcher
+        self._quote_fetcher = quote_fetcher
+
+        self._snapshot = MarketSnapshot()
+        self._last_access: dict[object, float] = {}
+        self._access_lock = threading.Lock()
+        self._publish_lock = threading.Lock()
+        self._fetch_locks: dict[object, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._refresh_on_start = False
+
+    # --- reading -----------------------------------------------------------
+
+    def snapshot(self) -> MarketSnapshot:
+        return self._snapshot
+
+    def get_candles(self, symbol: str, interval: str = "5m", period: str = "5d") -> pd.DataFrame:
+        return self.get_bars(symbol, interval=interval, period=period).frame
+
+    @traced("data.service.get_candles")
+    def get_bars(self, symbol: str, interval: str = "5m", period: str = "5d") -> PriceBars:
+        """
+        Validated candles: strategies, metrics and forecasters use them without copying.
+        """
+        key = (symbol, interval, period)
+        self._touch(key)
+        snap = self._snapshot
+        hit = self._is_fresh(snap, key)
+        telemetry.cache_result("data_service.candles", hit=hit)
+        if not hit:
+            self._refresh_key(key)
+            snap = self._snapshot
+        if key not in snap.candles:
+            raise RuntimeError(f"No candles for {key}: {snap.errors.get(key, 'unknown error')}")
+        return snap.candles[key]
+
+    @traced("data.service.get_quote")
+    def get_quote(self, symbol: str) -> dict:
+        key = ("quote", symbol)
+        self._touch(key)
+        snap = self._snapshot
+        hit = self._is_fresh(snap, key)
+        telemetry.cache_result("data_service.quote", hit=hit)
+        if not hit:
+            self._refresh_key(key)
+            snap = self._snapshot
+        if symbol not in snap.quotes:
+            raise RuntimeError(f"No quote for {symbol}: {snap.errors.get(key, 'unknown error')}")
+        return snap.quotes[symbol]
+
+    def _touch(self, key) -> None:
+        with self._access_lock:
+            self._last_access[key] = time.monotonic()
+
+    def _is_fresh(self, snap: MarketSnapshot, key) -> bool:
+        """
+        Present, and not older than stale_seconds (seeded keys have no fetch
+        time: the background refresh revalidates them).
+        """
+        present = key[1] in snap.quotes if len(key) == 2 else key in snap.candles
+        if not present:
+            return False
+        fetched = snap.fetched_at.get(key)
+        return fetched is None or (datetime.now(timezone.utc) - fetched).total_seconds() <= self.stale_seconds
+
+    # --- refreshing --------------------------------------------------------
+
+    def _fetch_lock(self, key) -> threading.Lock:
+        with self._publish_lock:
+            return self._fetch_locks.setdefault(key, threading.Lock())
+
+    def _refresh_key(self, key, force: bool = False) -> None:
+        with self._fetch_lock(key):
+            if self._is_fresh(self._snapshot, key) and not force:
+                # another session fetched it while we waited
+                return
+            try:
+                if len(key) == 2:
+                    value = self._quote_fetcher(key[1])
+                else:
+                    symbol, interval, period = key
+                    value = self._candle_fetcher(symbol, interval=interval, period=period)
+                self._publish(key, value=value)
+            except Exception as e:
+                # keep the last good value, record the error
+                self._publish(key, error=str(e))
+
+    def _publish(self, key, value=None, error: Optional[str] = None) -> None:
+        with self._publish_lock:
+            old = self._snapshot
+            candles, quotes = dict(old.candles), dict(old.quotes)
+            fetched_at, errors = dict(old.fetched_at), dict(old.errors)
+            if error is None:
+                if len(key) == 2:
+                    quotes[key[1]] = value
+                else:
+                    candles[key] = PriceBars.from_frame(value)
+                fetched_at[key] = datetime.now(timezone.utc)
+                errors.pop(key, None)
+            else:
+                errors[key] = error
+            self._snapshot = MarketSnapshot(
+                version=old.version + 1,
+                published_at=datetime.now(timezone.utc),
+                candles=MappingProxyType(candles),
+                quotes=MappingProxyType(quotes),
+                fetched_at=MappingProxyType(fetched_at),
+                errors=MappingProxyType(errors),
+            )
+
+    def seed(self, candles: Mapping[CandleKey, pd.DataFrame], quotes: Mapping[str, dict]) -> None:
+        """
+        Publish previously stored data (e.g. the cron snapshot) without fetching.
+        Seeded keys are served immediately and refreshed by the background thread
+        as soon as it starts.
+        """
+        with self._publish_lock:
+            old = self._snapshot
+            now = time.monotonic()
+            with self._access_lock:
+                for key in candles:
+                    self._last_access.setdefault(key, now)
+                for symbol in quotes:
+                    self._last_access.setdefault(("quote", symbol), now)
+            self._snapshot = MarketSnapshot(
+                version=old.version + 1,
+                published_at=datetime.now(timezone.utc),
+                candles=MappingProxyType({**old.candles, **{k: PriceBars.from_frame(v) for k, v in candles.items()}}),
+                quotes=MappingProxyType({**old.quotes, **quotes}),
+                fetched_at=old.fetched_at,
+                errors=old.errors,
+            )
+            self._refresh_on_start = True
+
+    def _drop_idle(self) -> list:
+        """
+        Forget keys nobody read for idle_seconds and publish a snapshot without them.
+        """
+        now = time.monotonic()
+        with self._access_lock:
+            idle = [k for k, t in self._last_access.items() if now - t > self.idle_seconds]
+            for k in idle:
+                del self._last_access[k]
+        if not idle:
+            return idle
+        with self._publish_lock:
+            old = self._snapshot
+            candles, quotes = dict(old.candles), dict(old.quotes)
+            fetched_at, errors = dict(old.fetched_at), dict(old.errors)
+            for key in idle:
+                if len(key) == 2:
+                    quotes.pop(key[1], None)
+                else:
+                    candles.pop(key, None)
+                fetched_at.pop(key, None)
+                errors.pop(key, None)
+                self._fetch_locks.pop(key, None)
+            self._snapshot = MarketSnapshot(
+                version=old.version + 1,
+                published_at=datetime.now(timezone.utc),
+                candles=MappingProxyType(candles),
+                quotes=MappingProxyType(quotes),
+                fetched_at=MappingProxyType(fetched_at),
+                errors=MappingProxyType(errors),
+            )
+        return idle
+
+    def refresh_once(self) -> None:
+        """
+        Refresh every key read within `idle_seconds`.
+        """
+        self._drop_idle()
+        with self._access_lock:
+            keys = list(self._last_access)
+        for key in keys:
+            if self._stop.is_set():
+                return
+            self._refresh_key(key, force=True)
+
+    def _run(self) -> None:
+        if self._refresh_on_start:
+            # seeded data may be stale: revalidate right away, in the background
+            self.refresh_once()
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh_once()
+
+    def start(self) -> "DataService":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="data-service", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+_SERVICE: Optional[DataService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_data_service(refresh_seconds: float = 300.0, snapshot_dir: Optional[str] = None) -> DataService:
+    """
+    Process-wide service, started on first use. All Streamlit pages and sessions
+    share it, so N viewers cost the same provider traffic as one.
+    If `snapshot_dir` holds a dashboard snapshot, the service is seeded from it
+    (instant first paint) and refreshed in the background.
+    Set QUANT_METRICS_PORT to serve Prometheus metrics from this process.
+    """
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            telemetry.start_http_server_from_env()
+            service = DataService(refresh_seconds=refresh_seconds)
+            if snapshot_dir is not None:
+                snap = load_snapshot(snapshot_dir)
+                if snap is not None:
+                    service.seed(snap.candles(), snap.quotes())
+            _SERVICE = service.start()
+        return _SERVICE
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.data.arrow import to_pandas
+
+
+# One Parquet file per table inside a version directory of the snapshot
+# directory; CURRENT names the version readers load. A new snapshot is
+# written to a fresh version and published by replacing CURRENT, so readers
+# see all of its tables or none, and tables it lacks don't linger.
+TABLES = ("prices", "backtests", "metrics", "forecasts", "quotes")
+POINTER = "CURRENT"
+
+
+@dataclass
+class DashboardSnapshot:
+    """
+    Latest precomputed dashboard data, written by the cron job and read on app start.
+      - prices:    symbol, interval, period + candle columns
+      - backtests: symbol, interval, period, strategy, lookback, timestamp, close, ret, strat_ret, equity
+                   (+ mom, signal, signal_lag for momentum)
+      - metrics:   symbol, interval, period, strategy, lookback + compute_metrics keys
+      - forecasts: symbol, lags, vol_window, momentum_lookback, alpha + ForecastResult fields
+      - quotes:    symbol + Finnhub quote fields
+    """
+    created_at: Optional[datetime] = None
+    tables: dict[str, pd.DataFrame] = field(default_factory=dict)
+
+    def table(self, name: str) -> pd.DataFrame:
+        return self.tables.get(name, pd.DataFrame())
+
+    def candles(self) -> dict[tuple[str, str, str], pd.DataFrame]:
+        """
+        Prices split back into get_candles_yahoo-shaped frames keyed by (symbol, interval, period).
+        """
+        prices = self.table("prices")
+        if prices.empty:
+            return {}
+        out = {}
+        for (symbol, interval, period), g in prices.groupby(["symbol", "interval", "period"], sort=False):
+            out[(symbol, interval, period)] = g.drop(columns=["symbol", "interval", "period"]).reset_index(drop=True)
+        return out
+
+    def quotes(self) -> dict[str, dict]:
+        quotes = self.table("quotes")
+        if quotes.empty:
+            return {}
+        return {row.pop("symbol"): row for row in quotes.to_dict(orient="records")}
+
+    def backtest(self, symbol: str, interval: str, period: str, strategy: str, lookback: int) -> Optional[pd.DataFrame]:
+        """
+        Stored backtest rows for this run (key columns and columns the strategy
+        doesn't produce dropped), or None.
+        """
+        bt = self.table("backtests")
+        if bt.empty:
+            return None
+        match = bt[
+            (bt["symbol"] == symbol)
+            & (bt["interval"] == interval)
+            & (bt["period"] == period)
+            & (bt["strategy"] == strategy)
+            & (bt["lookback"] == lookback)
+        ]
+        if match.empty:
+            return None
+        match = match.drop(columns=["symbol", "interval", "period", "strategy", "lookback"])
+        return match.dropna(axis=1, how="all").reset_index(drop=True)
+
+    def metrics(self, symbol: str, interval: str, period: str, strategy: str, lookback: int) -> Optional[dict]:
+        """
+        Stored compute_metrics result for this run, or None.
+        """
+        m = self.table("metrics")
+        if m.empty:
+            return None
+        match = m[
+            (m["symbol"] == symbol)
+            & (m["interval"] == interval)
+            & (m["period"] == period)
+            & (m["strategy"] == strategy)
+            & (m["lookback"] == lookback)
+        ]
+        if match.empty:
+            return None
+        row = match.iloc[-1].drop(["symbol", "interval", "period", "strategy", "lookback"])
+        return row.to_dict()
+
+    def forecast(self, symbol: str, lags: int, vol_window: int, momentum_lookback: int, alpha: float) -> Optional[dict]:
+        """
+        Stored forecast row for these settings, or None.
+        """
+        fc = self.table("forecasts")
+        if fc.empty:
+            return None
+        match = fc[
+            (fc["symbol"] == symbol)
+            & (fc["lags"] == lags)
+            & (fc["vol_window"] == vol_window)
+            & (fc["momentum_lookback"] == momentum_lookback)
+            & ((fc["alpha"] - alpha).abs() < 1e-12)
+        ]
+        if match.empty:
+            return None
+        return match.iloc[-1].to_dict()
+
+
+def _write_pointer(d: Path, version: str) -> None:
+    # write then rename: readers never see a half-written pointer
+    tmp = d / f"{POINTER}.{os.getpid()}.tmp"
+    tmp.write_text(version)
+    os.replace(tmp, d / POINTER)
+
+
+def _current_version(d: Path) -> Optional[str]:
+    p = d / POINTER
+    return p.read_text().strip() if p.exists() else None
+
+
+def write_snapshot(snapshot_dir: str | Path, tables: dict[str, pd.DataFrame]) -> Path:
+    """
+    Persist snapshot tables as compressed Parquet files (one per table) in a
+    new version directory of `snapshot_dir`, then publish it atomically.
+    The previous version is kept for readers still loading it; older ones
+    are removed. Returns the new version directory.
+    """
+    for name in tables:
+        if name not in TABLES:
+            raise ValueError(f"Unknown snapshot table '{name}'. Expected one of {TABLES}")
+    d = Path(snapshot_dir)
+    d.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+
+    # versions sort by creation time; the random suffix keeps concurrent writers apart
+    version = Path(tempfile.mkdtemp(prefix=f"v{created_at:%Y%m%dT%H%M%S%f}-", dir=d))
+    try:
+        for name, df in tables.items():
+            df = df.copy()
+            df["snapshot_at"] = created_at
+            df.to_parquet(version / f"{name}.parquet", index=False, compression="zstd")
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+
+    previous = _current_version(d)
+    _write_pointer(d, version.name)
+    for old in d.glob("v*"):
+        if old.is_dir() and previous is not None and old.name < previous:
+            shutil.rmtree(old, ignore_errors=True)
+    # tables of the flat layout (before versions) would only confuse
+    for name in TABLES:
+        (d / f"{name}.parquet").unlink(missing_ok=True)
+    return version
+
+
+def load_snapshot(snapshot_dir: str | Path) -> Optional[DashboardSnapshot]:
+    """
+    Load the current snapshot written by write_snapshot, or None if there is none.
+    """
+    d = Path(snapshot_dir)
+    if not d.exists():
+        return None
+    version = _current_version(d)
+    # without a pointer: snapshot written before versioning, tables directly in `d`
+    src = d / version if version else d
+
+    tables = {}
+    created = []
+    for name in TABLES:
+        p = src / f"{name}.parquet"
+        if not p.exists():
+            continue
+        df = to_pandas(pq.read_table(p))
+        if "snapshot_at" in df.columns and len(df):
+            created.append(pd.Timestamp(df["snapshot_at"].iloc[0]).to_pydatetime())
+        tables[name] = df.drop(columns=["snapshot_at"], errors="ignore")
+
+    if not tables:
+        return None
+    return DashboardSnapshot(created_at=min(created) if created else None, tables=tables)
@@ -1,21 +1,155 @@
+import threading
 from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
 import pandas as pd
+import pyarrow as pa
+
+from src import telemetry
+from src.data.arrow import iter_candle_tables, read_candles_csv, to_pandas, with_arrow_strings
+
+
+def read_candles(path: str) -> pd.DataFrame:
+    """
+    Candles CSV as a frame: Arrow-parsed (asset Arrow-backed, timestamps UTC ns).
+    Files whose timestamps lack a UTC offset go through pandas instead.
+    """
+    try:
+        return to_pandas(read_candles_csv(path))
+    except pa.ArrowInvalid:
+        return _legacy_candles(pd.read_csv(path))
+
+
+def _legacy_candles(df: pd.DataFrame) -> pd.DataFrame:
+    # pandas-parsed candles (timestamps without a UTC offset) with the Arrow reader's dtypes
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601")
+    return with_arrow_strings(df)
 
 
 def upsert_csv(df: pd.DataFrame, path: str) -> pd.DataFrame:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
 
-    if p.exists():
-        old = pd.read_csv(p, parse_dates=["timestamp"])
-        combined = pd.concat([old, df], ignore_index=True)
-    else:
-        combined = df.copy()
-
-    combined = (
-        combined.drop_duplicates(subset=["timestamp", "asset"])
-        .sort_values("timestamp")
-        .reset_index(drop=True)
-    )
-    combined.to_csv(p, index=False)
+    with telemetry.observe_storage("upsert_csv") as obs:
+        if p.exists():
+            old = read_candles(str(p))
+            combined = pd.concat([old, df], ignore_index=True)
+        else:
+            combined = df.copy()
+        with_arrow_strings(combined)
+
+        combined = (
+            combined.drop_duplicates(subset=["timestamp", "asset"])
+            .sort_values("timestamp")
+            .reset_index(drop=True)
+        )
+        combined.to_csv(p, index=False)
+        obs.rows, obs.bytes = len(combined), p.stat().st_size
     return combined
+
+
+def iter_csv_chunks(path: str, chunksize: int = 500_000, asset: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Candles CSV written by upsert_csv (sorted by timestamp), read `chunksize`
+    rows at a time, oldest first. With `asset`, other assets are dropped
+    chunk by chunk (before conversion to pandas), so a multi-asset file never
+    has to fit in memory. Like read_candles, files whose timestamps lack a
+    UTC offset go through pandas instead.
+    """
+    chunks = (to_pandas(t) for t in iter_candle_tables(path, rows=chunksize, asset=asset))
+    first = True
+    while True:
+        # timed per chunk read, not while the caller processes it
+        with telemetry.observe_storage("read_csv_chunk") as obs:
+            try:
+                chunk = next(chunks, None)
+            except pa.ArrowInvalid:
+                if not first:
+                    raise
+                chunks = _iter_legacy_chunks(path, chunksize, asset)
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            obs.rows = len(chunk)
+        first = False
+        yield chunk
+
+
+def _iter_legacy_chunks(path: str, chunksize: int, asset: Optional[str]) -> Iterator[pd.DataFrame]:
+    # pandas version of iter_candle_tables: exactly `chunksize` rows after the asset filter
+    pending: list[pd.DataFrame] = []
+    n_pending = 0
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        if asset is not None:
+            chunk = chunk[chunk["asset"] == asset]
+        pending.append(chunk)
+        n_pending += len(chunk)
+        while n_pending >= chunksize:
+            df = pd.concat(pending, ignore_index=True)
+            yield _legacy_candles(df.iloc[:chunksize].copy())
+            pending, n_pending = [df.iloc[chunksize:]], len(df) - chunksize
+    if n_pending:
+        yield _legacy_candles(pd.concat(pending, ignore_index=True))
+
+
+# path -> (file signature, load options, parsed frame)
+_CSV_CACHE: dict[str, tuple[tuple, tuple, pd.DataFrame]] = {}
+_CSV_LOCK = threading.Lock()
+
+
+def load_csv_cached(
+    path: str,
+    parse_dates: Sequence[str] = (),
+    numeric: Sequence[str] = (),
+    sort_by: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Parsed local CSV, cached per process and keyed by (path, mtime, size).
+    The file is re-read only when it is rewritten (e.g. by the fetch script).
+
+    - parse_dates: columns converted with pd.to_datetime (invalid -> NaT)
+    - numeric: columns converted with pd.to_numeric (invalid -> NaN)
+    Rows with NaT/NaN in those columns are dropped, then sorted by `sort_by`.
+
+    The data is shared by every caller (all sessions), so its arrays are
+    read-only: writing values raises ValueError, use `.copy()` first. Each call
+    returns its own shallow copy, so adding or replacing columns stays private.
+    """
+    p = Path(path).resolve()
+    st = p.stat()
+    signature = (st.st_mtime_ns, st.st_size)
+    options = (tuple(parse_dates), tuple(numeric), sort_by)
+    key = str(p)
+
+    with _CSV_LOCK:
+        cached = _CSV_CACHE.get(key)
+    hit = cached is not None and cached[0] == signature and cached[1] == options
+    telemetry.cache_result("csv", hit=hit)
+    if hit:
+        return cached[2].copy(deep=False)
+
+    with telemetry.observe_storage("read_csv") as obs:
+        df = pd.read_csv(p)
+        for col in parse_dates:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        for col in numeric:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+        df = df.dropna(subset=list(parse_dates) + list(numeric))
+        if sort_by is not None:
+            df = df.sort_values(sort_by)
+        df = _read_only(df.reset_index(drop=True))
+        obs.rows, obs.bytes = len(df), st.st_size
+
+    with _CSV_LOCK:
+        _CSV_CACHE[key] = (signature, options, df)
+    return df.copy(deep=False)
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[col] = values
+    # copy=False keeps the read-only arrays (no consolidation into a writable block)
+    return pd.DataFrame(columns, copy=False)
@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import Iterable, Optional
+
+
+DEFAULT_UNIVERSE = ["AAPL", "MSFT", "KO", "JPM"]
+
+
+def load_universe(symbols: Optional[Iterable[str]] = None, path: Optional[str] = None) -> list[str]:
+    """
+    Ticker universe from an explicit list and/or a text file
+    (one ticker per line or comma separated, '#' starts a comment).
+    Falls back to DEFAULT_UNIVERSE. Tickers are upper-cased and de-duplicated in order.
+    """
+    tickers = list(symbols or [])
+
+    if path:
+        p = Path(path)
+        if not p.exists():
+            raise FileNotFoundError(f"Universe file not found: {p}")
+        for line in p.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0]
+            tickers.extend(t for t in line.replace(",", " ").split())
+
+    if not tickers:
+        tickers = list(DEFAULT_UNIVERSE)
+
+    return list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
@@ -1,9 +1,23 @@
 import pandas as pd
-import yfinance as yf
 
+from src.data.arrow import with_arrow_strings
+from src.data.providers import get_provider
+from src.telemetry import observe_fetch
+from src.tracing import span, traced
 
+
+@traced("fetch.yahoo.candles")
 def get_candles_yahoo(symbol: str = "AAPL", interval: str = "5m", period: str = "5d") -> pd.DataFrame:
-    df = yf.download(symbol, interval=interval, period=period, progress=False)
+    with observe_fetch("yahoo", "candles", symbol) as obs:
+        out = _get_candles_yahoo(symbol, interval, period)
+        obs.rows, obs.bytes = len(out), int(out.memory_usage(index=False).sum())
+    return out
+
+
+def _get_candles_yahoo(symbol: str, interval: str, period: str) -> pd.DataFrame:
+    # live yfinance download, or a recorded one (see src.data.providers)
+    with span("fetch.yahoo.download", symbol=symbol, interval=interval, period=period):
+        df = get_provider().yahoo_download(symbol, interval=interval, period=period)
 
     if df is None or df.empty:
         raise RuntimeError("Yahoo Finance returned empty dataframe.")
@@ -33,4 +47,36 @@ def get_candles_yahoo(symbol: str = "AAPL", interval: str = "5m", period: str =
     )
 
     out = out.drop_duplicates(subset=["timestamp", "asset"]).sort_values("timestamp").reset_index(drop=True)
-    return out
+    return with_arrow_strings(out)
+
+
+@traced("fetch.yahoo.daily_closes")
+def get_daily_closes_yahoo(symbols: list[str], period: str = "2y") -> pd.DataFrame:
+    """
+    Wide daily close matrix for many tickers in one download.
+    Index: date (tz-naive), columns: tickers. Missing days stay NaN.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    with observe_fetch("yahoo", "daily_closes", "universe") as obs:
+        closes = _get_daily_closes_yahoo(symbols, period)
+        obs.rows, obs.bytes = int(closes.notna().sum().sum()), int(closes.memory_usage(index=False).sum())
+    return closes
+
+
+def _get_daily_closes_yahoo(symbols: list[str], period: str) -> pd.DataFrame:
+    df = get_provider().yahoo_download(symbols, interval="1d", period=period, auto_adjust=False)
+
+    if df is None or df.empty:
+        raise RuntimeError("Yahoo Finance returned empty dataframe.")
+
+    if isinstance(df.columns, pd.MultiIndex):
+        closes = df["Close"]
+    else:
+        # single ticker: flat columns
+        closes = df[["Close"]].rename(columns={"Close": symbols[0]})
+
+    closes = closes.reindex(columns=symbols).astype(float)
+    closes.index = pd.to_datetime(closes.index).tz_localize(None)
+    closes.index.name = "date"
+    closes = closes[~closes.index.duplicated(keep="last")].sort_index()
+    return closes.dropna(how="all")
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+
+class OnlineMetrics:
+    """
+    compute_metrics over a backtest streamed in chunks, in bounded memory.
+
+    - returns: count / mean / M2 merged per chunk (Chan-Welford), std with ddof=0
+    - equity: first and last value, running peak, worst drawdown
+    - periods_per_year: exact median step, from a count of distinct step sizes
+      (a few values for regular bars, however long the history)
+    Chunks must be fed in timestamp order.
+    """
+
+    def __init__(self, equity_col: str, ret_col: str):
+        self.equity_col = equity_col
+        self.ret_col = ret_col
+        self.n_rows = 0
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first_equity = None
+        self.last_equity = None
+        self.peak = -np.inf
+        self.max_dd = np.inf
+        self.first_ts = None
+        self.last_ts = None
+        self.steps: Counter = Counter()
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        if chunk.empty:
+            return
+        self.n_rows += len(chunk)
+
+        r = chunk[self.ret_col].to_numpy(dtype=float)
+        r = r[~np.isnan(r)]
+        if len(r):
+            n_b, mean_b = len(r), float(r.mean())
+            m2_b = float(((r - mean_b) ** 2).sum())
+            n = self.n + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * n_b / n
+            self.m2 += m2_b + delta * delta * self.n * n_b / n
+            self.n = n
+
+        eq = chunk[self.equity_col].to_numpy(dtype=float)
+        if self.first_equity is None:
+            self.first_equity = float(eq[0])
+        self.last_equity = float(eq[-1])
+        running_max = np.maximum.accumulate(np.concatenate([[self.peak], eq]))[1:]
+        self.peak = float(running_max[-1])
+        self.max_dd = min(self.max_dd, float((eq / running_max - 1.0).min()))
+
+        if "timestamp" in chunk.columns:
+            ts = pd.to_datetime(chunk["timestamp"], utc=True)
+            ns = ts.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+            if self.last_ts is not None:
+                ns = np.concatenate([[self.last_ts], ns])
+            else:
+                self.first_ts = int(ns[0])
+            self.steps.update((np.diff(ns) / 1e9).tolist())
+            self.last_ts = int(ns[-1])
+
+    def periods_per_year(self) -> float:
+        # same rules as infer_periods_per_year
+        if self.first_ts is None or self.n_rows < 3 or self.last_ts - self.first_ts <= 0:
+            return 252.0
+        total = sum(self.steps.values())
+        if not total:
+            return 252.0
+        lo, hi = (total - 1) // 2, total // 2
+        median, seen, lo_value = None, 0, None
+        for value in sorted(self.steps):
+            seen += self.steps[value]
+            if lo_value is None and seen > lo:
+                lo_value = value
+            if seen > hi:
+                median = (lo_value + value) / 2.0
+                break
+        if median <= 0:
+            return 252.0
+        return float(252.0 * (390 * 60) / median)
+
+    def result(self, risk_free_rate: float = 0.0) -> dict:
+        ppy = self.periods_per_year()
+        vol = 0.0
+        sharpe = 0.0
+        if self.n >= 2:
+            std = float(np.sqrt(self.m2 / self.n))
+            vol = float(std * np.sqrt(ppy))
+            rf_per_period = (1.0 + risk_free_rate) ** (1.0 / ppy) - 1.0
+            if std != 0:
+                sharpe = float((self.mean - rf_per_period) / std * np.sqrt(ppy))
+
+        has_curve = self.n_rows >= 2
+        return {
+            "total_return": float(self.last_equity / self.first_equity - 1.0) if has_curve else 0.0,
+            "volatility": vol,
+            "sharpe": sharpe,
+            "max_drawdown": float(self.max_dd) if has_curve else 0.0,
+            "periods_per_year": ppy,
+        }
@@ -1,24 +1,43 @@
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
 
+from src.data.bars import PriceBars, timestamp_ns
+from src.tracing import traced
+
+
+def _step_seconds(ts: pd.Series) -> tuple[float, np.ndarray]:
+    """
+    (last - first, steps between consecutive timestamps), in seconds, sorted order.
+    Parsed and sorted timestamps (PriceBars, strategy outputs) are read in place.
+    """
+    if not (pd.api.types.is_datetime64_any_dtype(ts) and not ts.hasnans and ts.is_monotonic_increasing):
+        ts = pd.to_datetime(ts, utc=True).sort_values().dropna()
+    if len(ts) == 0:
+        return 0.0, np.empty(0)
+    ns = timestamp_ns(ts)
+    return (ns[-1] - ns[0]) / 1e9, np.diff(ns) / 1e9
+
 
-def infer_periods_per_year(df: pd.DataFrame) -> float:
+@traced()
+def infer_periods_per_year(df: pd.DataFrame | PriceBars) -> float:
     """
     Infer periods/year from timestamp frequency.
     Works for intraday 5m and also for daily data.
     """
+    if isinstance(df, PriceBars):
+        df = df.frame
     if "timestamp" not in df.columns or len(df) < 3:
         # fallback: daily
         return 252.0
 
-    ts = pd.to_datetime(df["timestamp"], utc=True).sort_values()
-    delta = (ts.iloc[-1] - ts.iloc[0]).total_seconds()
+    delta, steps = _step_seconds(df["timestamp"])
     if delta <= 0:
         return 252.0
 
     # average step in seconds
-    steps = ts.diff().dropna().dt.total_seconds()
-    step = float(steps.median()) if len(steps) else 24 * 3600.0
+    step = float(np.median(steps)) if len(steps) else 24 * 3600.0
 
     if step <= 0:
         return 252.0
@@ -72,7 +91,10 @@ def max_drawdown(equity: pd.Series) -> float:
     return float(dd.min())
 
 
-def compute_metrics(df: pd.DataFrame, equity_col: str, ret_col: str) -> dict:
+@traced()
+def compute_metrics(df: pd.DataFrame | PriceBars, equity_col: str, ret_col: str) -> dict:
+    if isinstance(df, PriceBars):
+        df = df.frame
     ppy = infer_periods_per_year(df)
     eq = df[equity_col]
     r = df[ret_col]
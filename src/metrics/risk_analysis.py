@@ -2,36 +2,62 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Tuple
 
-def compute_risk_metrics(prices_df: pd.DataFrame, weights: Dict[str, float]) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    
+from src.tracing import traced
+
+@traced()
+def compute_return_stats(prices_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Weight-independent part of the risk model: daily returns, annualized covariance
+    and correlation. Cache this and reuse it while only the weights change.
+    """
     #calculate daily returns for all assets
     returns = prices_df.pct_change().dropna()
 
+    #calculate the annualized covariance matrix
+    cov_matrix = returns.cov() * 252
+
     #compute the correlation matrix (Required by Quant B specs)
     corr_matrix = returns.corr()
 
-    #align weights vector with the DataFrame columns
-    w_vector = np.array([weights[asset] for asset in prices_df.columns])
-    
+    return returns, cov_matrix, corr_matrix
+
+
+def weights_vector(weights: Dict[str, float], assets) -> np.ndarray:
+    #align weights vector with the asset order
+    w_vector = np.array([weights[asset] for asset in assets], dtype=float)
+
     #normalize weights to ensure sum is 1
     if np.sum(w_vector) != 0:
         w_vector = w_vector / np.sum(w_vector)
+    return w_vector
 
-    #calculate annualized volatility for each individual asset (Standard Deviation * sqrt(252))
-    asset_vols = returns.std() * np.sqrt(252)
 
-    #calculate the annualized covariance matrix
-    cov_matrix = returns.cov() * 252
+def volatility_metrics(cov_matrix: pd.DataFrame, weights: Dict[str, float]) -> pd.DataFrame:
+    """
+    Per-asset and portfolio annualized volatility from a cached covariance matrix.
+    Only costs w.T * Cov * w.
+    """
+    w_vector = weights_vector(weights, cov_matrix.columns)
+
+    #annualized volatility for each individual asset (sqrt of the covariance diagonal)
+    asset_vols = np.sqrt(np.diag(cov_matrix.to_numpy()))
 
     #calculate portfolio volatility using matrix algebra: sqrt(w.T * Cov * w)
-    port_vol = np.sqrt(np.dot(w_vector.T, np.dot(cov_matrix, w_vector)))
+    port_vol = float(np.sqrt(w_vector @ cov_matrix.to_numpy() @ w_vector))
 
     #create a summary DataFrame comparing assets and portfolio
     vol_data = {
-        "Asset": list(prices_df.columns) + ["PORTFOLIO"],
+        "Asset": list(cov_matrix.columns) + ["PORTFOLIO"],
         "Volatility": list(asset_vols) + [port_vol]
     }
-    
-    vol_metrics = pd.DataFrame(vol_data).set_index("Asset")
 
-    return corr_matrix, vol_metrics
\ No newline at end of file
+    return pd.DataFrame(vol_data).set_index("Asset")
+
+
+@traced()
+def compute_risk_metrics(prices_df: pd.DataFrame, weights: Dict[str, float]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+
+    _, cov_matrix, corr_matrix = compute_return_stats(prices_df)
+    vol_metrics = volatility_metrics(cov_matrix, weights)
+
+    return corr_matrix, vol_metrics
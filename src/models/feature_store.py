@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def series_fingerprint(s: pd.Series) -> str:
+    """
+    Content hash of a series (index + values).
+    Two series with the same fingerprint hold the same data.
+    """
+    h = pd.util.hash_pandas_object(s, index=True).to_numpy()
+    return hashlib.blake2b(h.tobytes(), digest_size=16).hexdigest()
+
+
+def _warmup_rows(lags: int, vol_window: int, momentum_lookback: int) -> int:
+    """
+    Number of past rows a feature row depends on.
+    lag k needs r_{t-k} (close_{t-k-1}), vol needs r_{t-vol_window}..r_{t-1},
+    momentum needs close_{t-momentum_lookback}.
+    """
+    return max(lags + 1, vol_window + 1, momentum_lookback) + 1
+
+
+def compute_daily_features(
+    close: pd.Series,
+    lags: int = 5,
+    vol_window: int = 10,
+    momentum_lookback: int = 10,
+) -> pd.DataFrame:
+    """
+    Feature matrix at time t (no look-ahead):
+      - r_lag_1..r_lag_{lags}: lagged daily log returns
+      - vol: rolling std of log returns, shifted by 1
+      - mom: close_t / close_{t-momentum_lookback} - 1
+    """
+    r = np.log(close / close.shift(1))
+
+    X = pd.DataFrame(index=close.index)
+    # Lagged returns (use only past info)
+    for k in range(1, lags + 1):
+        X[f"r_lag_{k}"] = r.shift(k)
+
+    # Rolling vol (use only past info: shift by 1)
+    X["vol"] = r.rolling(vol_window).std().shift(1)
+
+    # Momentum (based on past close)
+    X["mom"] = (close / close.shift(momentum_lookback) - 1.0)
+    return X
+
+
+class FeatureStore:
+    """
+    Memoized, append-only cache of daily feature matrices.
+
+    Entries are keyed by (close fingerprint, lags, vol_window, momentum_lookback).
+    When a close series extends a cached one (same prefix, new rows at the end),
+    only the tail rows are computed and appended to the cached matrix.
+
+    Returned frames are shared between callers: do not mutate them.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[pd.Series, pd.DataFrame]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.extends = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _find_prefix(self, close: pd.Series, params: tuple) -> Optional[tuple[pd.Series, pd.DataFrame]]:
+        """
+        Return the longest cached (close, X) with the same params whose close
+        series is a strict prefix of `close`.
+        """
+        best = None
+        for key, (old_close, old_X) in self._entries.items():
+            if key[1:] != params or len(old_close) >= len(close):
+                continue
+            if best is not None and len(old_close) <= len(best[0]):
+                continue
+            if close.iloc[: len(old_close)].equals(old_close):
+                best = (old_close, old_X)
+        return best
+
+    def features(
+        self,
+        close: pd.Series,
+        lags: int = 5,
+        vol_window: int = 10,
+        momentum_lookback: int = 10,
+    ) -> pd.DataFrame:
+        """
+        Feature matrix for `close` (see compute_daily_features), served from cache
+        when possible.
+        """
+        params = (lags, vol_window, momentum_lookback)
+        key = (series_fingerprint(close),) + params
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            prefix = self._find_prefix(close, params)
+
+        if prefix is not None:
+            old_close, old_X = prefix
+            n_old = len(old_close)
+            start = max(0, n_old - _warmup_rows(*params))
+            tail = compute_daily_features(close.iloc[start:], *params).iloc[n_old - start:]
+            X = pd.concat([old_X, tail])
+        else:
+            X = compute_daily_features(close, *params)
+
+        with self._lock:
+            if prefix is not None:
+                self.extends += 1
+            else:
+                self.misses += 1
+            self._entries[key] = (close, X)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return X
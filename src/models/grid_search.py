@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.models.feature_store import series_fingerprint
+
+
+DEFAULT_LAGS = (2, 3, 5, 8, 10, 15, 20)
+DEFAULT_VOL_WINDOWS = (5, 10, 20, 30, 60)
+DEFAULT_MOMENTUM_LOOKBACKS = (5, 10, 20, 40, 60, 120)
+
+_RESULTS: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+_RESULTS_MAX = 16
+_RESULTS_LOCK = threading.Lock()
+
+# Feature columns shared with worker processes (set once per worker by the initializer)
+_SHARED: dict = {}
+
+
+def _init_worker(shared: dict) -> None:
+    global _SHARED
+    _SHARED = shared
+
+
+def _score_shared(combos: list[tuple[int, int, int]], test_size: int, min_train_rows: int) -> list[dict]:
+    # process pool entry point: columns come from the worker initializer
+    return _score_combos(_SHARED, combos, test_size, min_train_rows)
+
+
+def _precompute_columns(
+    close: np.ndarray,
+    lags_grid: Sequence[int],
+    vol_grid: Sequence[int],
+    mom_grid: Sequence[int],
+) -> dict:
+    """
+    Base returns computed once; every feature column needed by any combo computed once.
+    Same definitions as compute_daily_features.
+    """
+    s = pd.Series(close)
+    r = np.log(s / s.shift(1))
+    return {
+        "lag": {k: r.shift(k).to_numpy() for k in range(1, max(lags_grid) + 1)},
+        "vol": {w: r.rolling(w).std().shift(1).to_numpy() for w in set(vol_grid)},
+        "mom": {m: (s / s.shift(m) - 1.0).to_numpy() for m in set(mom_grid)},
+        # target: next-day log return
+        "y": np.log(s.shift(-1) / s).to_numpy(),
+    }
+
+
+def _score_combos(cols: dict, combos: list[tuple[int, int, int]], test_size: int, min_train_rows: int) -> list[dict]:
+    """
+    Out-of-sample score of each (lags, vol_window, momentum_lookback) combo, from
+    the _precompute_columns output `cols`.
+    The last `test_size` rows with an observed target are held out; the model is
+    fit by OLS on every earlier complete row.
+    """
+    y = cols["y"]
+    y_ok = np.isfinite(y)
+    test_idx = np.flatnonzero(y_ok)[-test_size:]
+    test_start = test_idx[0]
+
+    rows = []
+    for lags, vol_window, momentum_lookback in combos:
+        X = np.column_stack(
+            [np.ones(len(y))]
+            + [cols["lag"][k] for k in range(1, lags + 1)]
+            + [cols["vol"][vol_window], cols["mom"][momentum_lookback]]
+        )
+        x_ok = np.isfinite(X).all(axis=1)
+        train = x_ok & y_ok
+        train[test_start:] = False
+        test = test_idx[x_ok[test_idx]]
+
+        n_train = int(train.sum())
+        if n_train < max(min_train_rows, X.shape[1] + 1) or len(test) == 0:
+            continue
+
+        beta, *_ = np.linalg.lstsq(X[train], y[train], rcond=None)
+        err = y[test] - X[test] @ beta
+        rows.append(
+            {
+                "lags": lags,
+                "vol_window": vol_window,
+                "momentum_lookback": momentum_lookback,
+                "rmse": float(np.sqrt(np.mean(err ** 2))),
+                "mae": float(np.mean(np.abs(err))),
+                "n_train": n_train,
+                "n_test": int(len(test)),
+            }
+        )
+    return rows
+
+
+def grid_search_ols(
+    daily_close: pd.Series,
+    lags_grid: Sequence[int] = DEFAULT_LAGS,
+    vol_grid: Sequence[int] = DEFAULT_VOL_WINDOWS,
+    mom_grid: Sequence[int] = DEFAULT_MOMENTUM_LOOKBACKS,
+    test_size: int = 60,
+    min_train_rows: int = 60,
+    n_jobs: Optional[int] = 1,
+    processes: bool = False,
+) -> pd.DataFrame:
+    """
+    Rank forecast settings by out-of-sample next-day RMSE (best first).
+
+    Combos are scored in-process by default: the default grid (210 combos)
+    takes ~0.05-0.15s, less than starting a process pool, and a dashboard
+    rerun shouldn't claim every core. With `n_jobs` > 1 they are scored in
+    batches by a thread pool (lstsq releases the GIL), or by a process pool
+    with `processes=True` for much larger grids. Rankings are cached per
+    (close data, grid, test_size), so repeated calls with unchanged data
+    return instantly.
+    """
+    close = daily_close.astype(float).dropna().sort_index()
+    grid = (tuple(sorted(set(lags_grid))), tuple(sorted(set(vol_grid))), tuple(sorted(set(mom_grid))))
+    key = (series_fingerprint(close), grid, test_size, min_train_rows)
+
+    with _RESULTS_LOCK:
+        cached = _RESULTS.get(key)
+        if cached is not None:
+            _RESULTS.move_to_end(key)
+            return cached
+
+    if close.size < test_size + min_train_rows:
+        raise ValueError(
+            f"Not enough daily points ({close.size}) for test_size={test_size} "
+            f"and min_train_rows={min_train_rows}."
+        )
+
+    shared = _precompute_columns(close.to_numpy(), *grid)
+    combos = list(itertools.product(*grid))
+
+    n_jobs = n_jobs or 1
+    if n_jobs <= 1:
+        rows = _score_combos(shared, combos, test_size, min_train_rows)
+    else:
+        # A few batches per worker keeps scheduling overhead low
+        n_batches = min(len(combos), n_jobs * 4)
+        batches = [combos[i::n_batches] for i in range(n_batches)]
+        if processes:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(shared,)) as ex:
+                futures = [ex.submit(_score_shared, b, test_size, min_train_rows) for b in batches]
+                rows = [row for f in futures for row in f.result()]
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as ex:
+                futures = [ex.submit(_score_combos, shared, b, test_size, min_train_rows) for b in batches]
+                rows = [row for f in futures for row in f.result()]
+
+    ranked = (
+        pd.DataFrame(rows, columns=["lags", "vol_window", "momentum_lookback", "rmse", "mae", "n_train", "n_test"])
+        .sort_values(["rmse", "lags", "vol_window", "momentum_lookback"])
+        .reset_index(drop=True)
+    )
+
+    with _RESULTS_LOCK:
+        _RESULTS[key] = ranked
+        while len(_RESULTS) > _RESULTS_MAX:
+            _RESULTS.popitem(last=False)
+    return ranked
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
+
+from src.data.bars import PriceBars
+from src.models.feature_store import FeatureStore, compute_daily_features
+from src.tracing import traced
 
 
 @dataclass
@@ -23,19 +26,20 @@ class ForecastResult:
 
     n_train: int
     model_r2: Optional[float] = None
+    horizon_days: int = 1
 
 
 def _ensure_datetime_index(df: pd.DataFrame, timestamp_col: str = "timestamp") -> pd.DataFrame:
     """
     Ensure a DatetimeIndex exists. Accepts either:
       - a column named `timestamp_col`, or
-      - an existing DatetimeIndex
+      - an existing DatetimeIndex (returned as is when already sorted)
+    The result is only read, never modified in place.
     """
-    out = df.copy()
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df if df.index.is_monotonic_increasing else df.sort_index()
 
-    if isinstance(out.index, pd.DatetimeIndex):
-        out = out.sort_index()
-        return out
+    out = df.copy()
 
     if timestamp_col not in out.columns:
         raise ValueError(
@@ -48,57 +52,65 @@ def _ensure_datetime_index(df: pd.DataFrame, timestamp_col: str = "timestamp") -
     return out
 
 
-def intraday_to_daily_close(df_intraday: pd.DataFrame, close_col: str = "close") -> pd.Series:
+def intraday_to_daily_close(df_intraday: pd.DataFrame | PriceBars, close_col: str = "close") -> pd.Series:
     """
     Convert intraday candles to daily closes (last close of each calendar day).
     """
-    df = _ensure_datetime_index(df_intraday)
-
-    if close_col not in df.columns:
-        raise ValueError(f"Missing '{close_col}' column. Available: {list(df.columns)}")
-
-    daily_close = df[close_col].resample("1D").last().dropna()
+    if isinstance(df_intraday, PriceBars) and close_col == "close":
+        close = df_intraday.close_series()
+    else:
+        df = _ensure_datetime_index(df_intraday.frame if isinstance(df_intraday, PriceBars) else df_intraday)
+        if close_col not in df.columns:
+            raise ValueError(f"Missing '{close_col}' column. Available: {list(df.columns)}")
+        close = df[close_col]
+
+    daily_close = close.resample("1D").last().dropna()
     daily_close.name = "close"
     return daily_close
 
 
+@traced()
 def build_daily_features_and_target(
     daily_close: pd.Series,
     lags: int = 5,
     vol_window: int = 10,
     momentum_lookback: int = 10,
     horizon_days: int = 1,
+    feature_store: Optional[FeatureStore] = None,
 ) -> tuple[pd.DataFrame, pd.Series]:
     """
     Features at time t (no look-ahead), target is future log return over `horizon_days`.
     y_t = log(close_{t+h} / close_t)
+
+    If `feature_store` is given, the feature matrix is served from (and added to)
+    that cache; only the target is recomputed.
     """
-    close = daily_close.astype(float).copy()
-    close = close.dropna()
+    # read-only below: no copy when the closes are already float
+    close = daily_close.astype(float, copy=False)
+    if close.hasnans:
+        close = close.dropna()
     if close.size < 30:
         raise ValueError(f"Not enough daily points ({close.size}). Need ~60+ for decent intervals.")
 
-    r = np.log(close / close.shift(1))
     # Target: future log-return
     y = np.log(close.shift(-horizon_days) / close)
 
-    X = pd.DataFrame(index=close.index)
-    # Lagged returns (use only past info)
-    for k in range(1, lags + 1):
-        X[f"r_lag_{k}"] = r.shift(k)
-
-    # Rolling vol (use only past info: shift by 1)
-    X["vol"] = r.rolling(vol_window).std().shift(1)
-
-    # Momentum (based on past close)
-    X["mom"] = (close / close.shift(momentum_lookback) - 1.0)
+    if feature_store is not None:
+        X = feature_store.features(
+            close, lags=lags, vol_window=vol_window, momentum_lookback=momentum_lookback
+        )
+    else:
+        X = compute_daily_features(
+            close, lags=lags, vol_window=vol_window, momentum_lookback=momentum_lookback
+        )
 
     # Align and drop NaNs for training rows
     return X, y
 
 
+@traced()
 def forecast_next_day_ols(
-    df_intraday: pd.DataFrame,
+    df_intraday: pd.DataFrame | PriceBars,
     close_col: str = "close",
     timestamp_col: str = "timestamp",
     lags: int = 5,
@@ -106,13 +118,15 @@ def forecast_next_day_ols(
     momentum_lookback: int = 10,
     alpha: float = 0.05,
     min_train_rows: int = 40,
+    feature_store: Optional[FeatureStore] = None,
 ) -> ForecastResult:
     """
     Forecast next-day close using OLS on daily features.
     Uses statsmodels prediction interval (obs_ci_lower/upper).
     """
     # 1) Daily close series
-    df_intraday = _ensure_datetime_index(df_intraday, timestamp_col=timestamp_col)
+    if not isinstance(df_intraday, PriceBars):
+        df_intraday = _ensure_datetime_index(df_intraday, timestamp_col=timestamp_col)
     daily_close = intraday_to_daily_close(df_intraday, close_col=close_col)
 
     # 2) Features & target
@@ -122,6 +136,7 @@ def forecast_next_day_ols(
         vol_window=vol_window,
         momentum_lookback=momentum_lookback,
         horizon_days=1,
+        feature_store=feature_store,
     )
 
     # Last feature row we want to predict from (typically the last available day)
@@ -140,7 +155,9 @@ def forecast_next_day_ols(
             f"Try increasing history (daily) or reducing lags/windows."
         )
 
-    # 3) Fit OLS
+    # 3) Fit OLS (statsmodels is slow to import: load it on first fit)
+    import statsmodels.api as sm
+
     X_train_c = sm.add_constant(X_train, has_constant="add")
     model = sm.OLS(y_train, X_train_c).fit()
 
@@ -170,24 +187,39 @@ def forecast_next_day_ols(
         model_r2=float(model.rsquared) if model.rsquared is not None else None,
     )
 def daily_df_to_close_series(
-    df_daily: pd.DataFrame,
+    df_daily: pd.DataFrame | PriceBars,
     date_col: str = "date",
     close_col: str = "close",
 ) -> pd.Series:
     """
-    Accepts a daily DataFrame with columns like [date, close] and returns
-    a daily close Series with a DatetimeIndex.
+    Accepts a daily DataFrame with columns like [date, close] (or PriceBars) and
+    returns a daily close Series with a DatetimeIndex. Already parsed, sorted and
+    clean input is wrapped without copying.
     """
-    df = df_daily.copy()
+    if isinstance(df_daily, PriceBars):
+        return df_daily.close_series()
 
-    if isinstance(df.index, pd.DatetimeIndex) and close_col in df.columns:
-        s = df[close_col].astype(float).sort_index().dropna()
+    if isinstance(df_daily.index, pd.DatetimeIndex) and close_col in df_daily.columns:
+        s = df_daily[close_col].astype(float).sort_index().dropna()
         s.name = "close"
         return s
 
-    if date_col not in df.columns or close_col not in df.columns:
-        raise ValueError(f"Daily DF must contain '{date_col}' and '{close_col}'. Got {list(df.columns)}")
+    if date_col not in df_daily.columns or close_col not in df_daily.columns:
+        raise ValueError(f"Daily DF must contain '{date_col}' and '{close_col}'. Got {list(df_daily.columns)}")
+
+    dates, closes = df_daily[date_col], df_daily[close_col]
+    if (
+        pd.api.types.is_datetime64_any_dtype(dates)
+        and closes.dtype == np.float64
+        and not dates.hasnans
+        and not closes.hasnans
+        and dates.is_monotonic_increasing
+        and dates.is_unique
+    ):
+        # e.g. load_csv_cached(parse_dates=[date], numeric=[close], sort_by=date)
+        return pd.Series(closes.to_numpy(), index=pd.DatetimeIndex(dates), name="close", copy=False)
 
+    df = df_daily.copy()
     df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
     df = df.dropna(subset=[date_col, close_col]).sort_values(date_col)
     s = df.set_index(date_col)[close_col].astype(float)
@@ -196,6 +228,7 @@ def daily_df_to_close_series(
     return s
 
 
+@traced()
 def forecast_next_day_ols_from_daily(
     df_daily: pd.DataFrame,
     date_col: str = "date",
@@ -205,6 +238,7 @@ def forecast_next_day_ols_from_daily(
     momentum_lookback: int = 10,
     alpha: float = 0.05,
     min_train_rows: int = 60,
+    feature_store: Optional[FeatureStore] = None,
 ) -> ForecastResult:
     """
     Same model as forecast_next_day_ols but uses daily close data directly.
@@ -217,6 +251,7 @@ def forecast_next_day_ols_from_daily(
         vol_window=vol_window,
         momentum_lookback=momentum_lookback,
         horizon_days=1,
+        feature_store=feature_store,
     )
 
     X_last = X_all.dropna().iloc[-1:]
@@ -232,6 +267,8 @@ def forecast_next_day_ols_from_daily(
             f"Not enough training rows ({len(X_train)}). Need at least {min_train_rows}."
         )
 
+    import statsmodels.api as sm
+
     X_train_c = sm.add_constant(X_train, has_constant="add")
     model = sm.OLS(y_train, X_train_c).fit()
 
@@ -259,3 +296,104 @@ def forecast_next_day_ols_from_daily(
         n_train=len(X_train),
         model_r2=float(model.rsquared) if model.rsquared is not None else None,
     )
+
+
+@traced()
+def forecast_multi_horizon_ols_from_daily(
+    df_daily: pd.DataFrame,
+    date_col: str = "date",
+    close_col: str = "close",
+    horizons: Sequence[int] = (1, 5, 10, 20),
+    lags: int = 5,
+    vol_window: int = 10,
+    momentum_lookback: int = 10,
+    alpha: float = 0.05,
+    min_train_rows: int = 60,
+    feature_store: Optional[FeatureStore] = None,
+) -> dict[int, ForecastResult]:
+    """
+    Forecast the close `h` trading days ahead for every h in `horizons` in one pass.
+
+    X is built once and all targets y_h = log(close_{t+h} / close_t) are solved as a
+    single multi-output least-squares problem sharing one QR factorization of X.
+    Training rows are the rows where every horizon's target is observed, so the
+    h=1 result can differ slightly from forecast_next_day_ols_from_daily.
+    Returns {horizon: ForecastResult}, ordered by horizon.
+    """
+    from scipy import linalg, stats
+
+    horizons = sorted(set(int(h) for h in horizons))
+    if not horizons or horizons[0] < 1:
+        raise ValueError(f"Horizons must be positive integers. Got {horizons}")
+
+    daily_close = daily_df_to_close_series(df_daily, date_col=date_col, close_col=close_col)
+
+    X_all, _ = build_daily_features_and_target(
+        daily_close,
+        lags=lags,
+        vol_window=vol_window,
+        momentum_lookback=momentum_lookback,
+        horizon_days=horizons[0],
+        feature_store=feature_store,
+    )
+    close = daily_close.loc[X_all.index]
+    Y_all = pd.DataFrame(
+        {h: np.log(close.shift(-h) / close) for h in horizons}, index=X_all.index
+    )
+
+    X_last = X_all.dropna().iloc[-1:]
+    as_of_date = X_last.index[-1].date().isoformat()
+    last_close = float(daily_close.loc[X_last.index[-1]])
+
+    train_mask = X_all.notna().all(axis=1) & Y_all.notna().all(axis=1)
+    n = int(train_mask.sum())
+    if n < min_train_rows:
+        raise ValueError(
+            f"Not enough training rows ({n}) for horizons up to {horizons[-1]}. "
+            f"Need at least {min_train_rows}."
+        )
+
+    # Design matrix with constant, same layout as sm.add_constant
+    X = np.column_stack([np.ones(n), X_all.loc[train_mask].to_numpy(dtype=float)])
+    Y = Y_all.loc[train_mask].to_numpy(dtype=float)
+    x0 = np.concatenate([[1.0], X_last.to_numpy(dtype=float)[0]])
+    p = X.shape[1]
+    dof = n - p
+    if dof <= 0:
+        raise ValueError(f"Not enough training rows ({n}) for {p} parameters.")
+
+    # One factorization for all targets: X = QR, beta = R^-1 Q'Y
+    Q, R = np.linalg.qr(X)
+    beta = linalg.solve_triangular(R, Q.T @ Y)
+    resid = Y - X @ beta
+    rss = (resid ** 2).sum(axis=0)
+    tss = ((Y - Y.mean(axis=0)) ** 2).sum(axis=0)
+    s2 = rss / dof
+
+    # x0' (X'X)^-1 x0 = ||R^-T x0||^2
+    v = linalg.solve_triangular(R, x0, trans="T")
+    leverage = float(v @ v)
+    t_crit = float(stats.t.ppf(1.0 - alpha / 2.0, dof))
+
+    means = x0 @ beta
+    half_widths = t_crit * np.sqrt(s2 * (1.0 + leverage))
+
+    results = {}
+    for j, h in enumerate(horizons):
+        mean = float(means[j])
+        lower_r = mean - float(half_widths[j])
+        upper_r = mean + float(half_widths[j])
+        results[h] = ForecastResult(
+            as_of_date=as_of_date,
+            last_close=last_close,
+            pred_return=mean,
+            lower_return=lower_r,
+            upper_return=upper_r,
+            pred_close=last_close * float(np.exp(mean)),
+            lower_close=last_close * float(np.exp(lower_r)),
+            upper_close=last_close * float(np.exp(upper_r)),
+            n_train=n,
+            model_r2=float(1.0 - rss[j] / tss[j]) if tss[j] > 0 else None,
+            horizon_days=h,
+        )
+    return results
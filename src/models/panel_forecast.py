@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.tracing import traced
+
+
+@traced()
+def build_panel_features_and_target(
+    closes: pd.DataFrame,
+    lags: int = 5,
+    vol_window: int = 10,
+    momentum_lookback: int = 10,
+    horizon_days: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Same features/target as build_daily_features_and_target, for every column of a
+    wide close matrix (index: date, columns: tickers) at once.
+
+    Returns (X, y) with X of shape (n_tickers, n_dates, 1 + lags + 2) including the
+    constant, and y of shape (n_tickers, n_dates). A missing close makes the rows
+    that depend on it NaN (returns are not bridged across gaps).
+    """
+    close = closes.astype(float)
+    r = np.log(close / close.shift(1))
+    y = np.log(close.shift(-horizon_days) / close)
+
+    feats = [np.ones(close.shape)]
+    # Lagged returns (use only past info)
+    for k in range(1, lags + 1):
+        feats.append(r.shift(k).to_numpy())
+    # Rolling vol (use only past info: shift by 1)
+    feats.append(r.rolling(vol_window).std().shift(1).to_numpy())
+    # Momentum (based on past close)
+    feats.append((close / close.shift(momentum_lookback) - 1.0).to_numpy())
+
+    # (dates, tickers, p) -> (tickers, dates, p)
+    X = np.stack(feats, axis=-1).transpose(1, 0, 2)
+    return X, y.to_numpy().T
+
+
+@traced()
+def forecast_universe_ols(
+    closes: pd.DataFrame,
+    lags: int = 5,
+    vol_window: int = 10,
+    momentum_lookback: int = 10,
+    alpha: float = 0.05,
+    min_train_rows: int = 60,
+) -> pd.DataFrame:
+    """
+    Next-day OLS forecast for every ticker of a wide daily close matrix.
+
+    One regression per ticker, fitted as a batched solve: rows that are not usable
+    for a ticker are zeroed (they then contribute nothing to its least-squares
+    problem) and all tickers are factorized in one stacked QR.
+
+    Returns one row per ticker with columns:
+    as_of_date, last_close, pred_return, lower_return, upper_return,
+    pred_close, lower_close, upper_close, r2, n_train.
+    Tickers with fewer than `min_train_rows` usable rows are dropped.
+    """
+    from scipy import stats
+
+    X, y = build_panel_features_and_target(
+        closes, lags=lags, vol_window=vol_window, momentum_lookback=momentum_lookback, horizon_days=1
+    )
+    n_tickers, n_dates, p = X.shape
+
+    x_ok = np.isfinite(X).all(axis=2)
+    train = x_ok & np.isfinite(y)
+    n_train = train.sum(axis=1)
+
+    # Prediction row: last date with a complete feature row
+    has_row = x_ok.any(axis=1)
+    last_idx = n_dates - 1 - np.argmax(x_ok[:, ::-1], axis=1)
+
+    keep = has_row & (n_train >= max(min_train_rows, p + 1))
+    if not keep.any():
+        return pd.DataFrame(
+            columns=[
+                "as_of_date", "last_close", "pred_return", "lower_return", "upper_return",
+                "pred_close", "lower_close", "upper_close", "r2", "n_train",
+            ]
+        ).rename_axis("ticker")
+
+    X, y, train = X[keep], y[keep], train[keep]
+    n_train, last_idx = n_train[keep], last_idx[keep]
+    tickers = closes.columns[keep]
+    k = np.arange(len(tickers))
+
+    x0 = X[k, last_idx]                                   # (N, p)
+    Xm = np.where(train[..., None], X, 0.0)               # (N, T, p)
+    ym = np.where(train, y, 0.0)                          # (N, T)
+
+    # Batched QR: beta = R^-1 Q'y for every ticker
+    Q, R = np.linalg.qr(Xm)
+    qty = np.einsum("ntp,nt->np", Q, ym)
+    beta = np.linalg.solve(R, qty[..., None])[..., 0]     # (N, p)
+
+    resid = np.where(train, ym - np.einsum("ntp,np->nt", Xm, beta), 0.0)
+    rss = (resid ** 2).sum(axis=1)
+    y_mean = ym.sum(axis=1) / n_train
+    tss = (np.where(train, ym - y_mean[:, None], 0.0) ** 2).sum(axis=1)
+
+    dof = n_train - p
+    s2 = rss / dof
+    # x0' (X'X)^-1 x0 = ||R^-T x0||^2
+    v = np.linalg.solve(np.swapaxes(R, 1, 2), x0[..., None])[..., 0]
+    leverage = (v ** 2).sum(axis=1)
+    t_crit = stats.t.ppf(1.0 - alpha / 2.0, dof)
+
+    pred = (x0 * beta).sum(axis=1)
+    half = t_crit * np.sqrt(s2 * (1.0 + leverage))
+    lower, upper = pred - half, pred + half
+
+    last_close = closes.to_numpy(dtype=float)[last_idx, np.flatnonzero(keep)]
+    as_of = pd.DatetimeIndex(closes.index[last_idx]).date
+
+    out = pd.DataFrame(
+        {
+            "as_of_date": [d.isoformat() for d in as_of],
+            "last_close": last_close,
+            "pred_return": pred,
+            "lower_return": lower,
+            "upper_return": upper,
+            "pred_close": last_close * np.exp(pred),
+            "lower_close": last_close * np.exp(lower),
+            "upper_close": last_close * np.exp(upper),
+            "r2": np.where(tss > 0, 1.0 - rss / np.where(tss > 0, tss, 1.0), np.nan),
+            "n_train": n_train,
+        },
+        index=pd.Index(tickers, name="ticker"),
+    )
+    return out
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import sysconfig
+import time
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+
+def fingerprint(obj: Any) -> str:
+    """
+    Content hash of a stage input/output.
+    DataFrames/Series are hashed by values, index, columns and dtypes;
+    JSON-able values by their canonical JSON; anything else by its pickle.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        if isinstance(obj, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in obj.columns]).encode())
+            h.update(json.dumps([str(t) for t in obj.dtypes]).encode())
+        else:
+            h.update(str(obj.dtype).encode())
+    elif isinstance(obj, dict):
+        for k in sorted(obj, key=str):
+            h.update(str(k).encode())
+            h.update(fingerprint(obj[k]).encode())
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            h.update(fingerprint(item).encode())
+    else:
+        try:
+            h.update(json.dumps(obj, sort_keys=True).encode())
+        except TypeError:
+            h.update(pickle.dumps(obj))
+    return h.hexdigest()
+
+
+# Installed code (stdlib, site-packages) is not hashed into code versions
+_INSTALLED = tuple(
+    Path(p).resolve() for p in {sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib", "purelib", "platlib")}
+)
+
+
+def _source(obj: Any) -> str:
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return getattr(obj, "__qualname__", repr(obj))
+
+
+def _local_module(obj: Any) -> Optional[types.ModuleType]:
+    # module defining `obj` if it is this project's code, else None
+    module = obj if isinstance(obj, types.ModuleType) else inspect.getmodule(obj)
+    path = getattr(module, "__file__", None)
+    if path is None:
+        return None
+    path = Path(path).resolve()
+    if any(path.is_relative_to(root) for root in _INSTALLED):
+        return None
+    return module
+
+
+def _referenced(func: Callable) -> list[Any]:
+    # globals named anywhere in func's code (nested functions included) and closure values
+    names, stack = set(), [func.__code__]
+    while stack:
+        code = stack.pop()
+        names.update(code.co_names)
+        stack.extend(c for c in code.co_consts if isinstance(c, types.CodeType))
+    objs = [func.__globals__[n] for n in sorted(names) if n in func.__globals__]
+    for cell in func.__closure__ or ():
+        try:
+            objs.append(cell.cell_contents)
+        except ValueError:  # empty cell
+            pass
+    return objs
+
+
+@functools.lru_cache(maxsize=None)
+def _module_digest(name: str) -> str:
+    # per process: the code that runs is the code that was imported
+    module = sys.modules.get(name)
+    try:
+        data = Path(module.__file__).read_bytes()
+    except (AttributeError, OSError, TypeError):
+        data = name.encode()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _code_version(func: Callable) -> str:
+    """
+    Hash of the stage function's source and of every project module it
+    uses, directly or through their own imports: editing a helper the stage
+    calls invalidates its cached outputs. Installed packages are not hashed
+    (see Stage.version).
+    """
+    while isinstance(func, functools.partial):
+        func = func.func
+    func = inspect.unwrap(func)
+    h = hashlib.blake2b(_source(func).encode(), digest_size=8)
+    if not isinstance(func, types.FunctionType):
+        return h.hexdigest()
+
+    seen: set[str] = set()
+    todo = [m for m in map(_local_module, _referenced(func)) if m is not None]
+    while todo:
+        module = todo.pop()
+        if module.__name__ in seen:
+            continue
+        seen.add(module.__name__)
+        for value in list(vars(module).values()):
+            if isinstance(value, (types.ModuleType, type, types.FunctionType)):
+                dep = _local_module(value)
+                if dep is not None and dep.__name__ not in seen:
+                    todo.append(dep)
+    for name in sorted(seen):
+        h.update(name.encode())
+        h.update(_module_digest(name).encode())
+    return h.hexdigest()
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step: func(*dep_outputs, **params).
+    `always_run` stages (e.g. network fetches) execute every time; downstream stages
+    are still skipped when the fetched content hashes the same as last time.
+    `version` is mixed into the input hash: bump it when outputs change for a
+    reason the code hash can't see (an upgraded dependency, external data).
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    params: dict = field(default_factory=dict)
+    always_run: bool = False
+    version: str = ""
+
+
+@dataclass
+class StageRun:
+    name: str
+    input_hash: str
+    output_hash: str
+    executed: bool
+    seconds: float
+
+
+class Pipeline:
+    """
+    Small DAG runner with content-hashed, persisted stage outputs.
+
+    A stage's input hash covers its name, params, version, code (see
+    _code_version) and the output hashes of its dependencies. If an output for that input hash is on disk the stage is
+    skipped (and its output only loaded if a downstream stage has to run).
+    Without `cache_dir` every stage executes and nothing is persisted.
+    """
+
+    def __init__(self, stages: list[Stage], cache_dir: Optional[str | Path] = None, keep: int = 3):
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique.")
+        for s in stages:
+            missing = [d for d in s.deps if d not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{s.name}' depends on unknown stages {missing}")
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.keep = keep
+        self.runs: dict[str, StageRun] = {}
+        self._outputs: dict[str, Any] = {}
+
+    # --- persistence -------------------------------------------------------
+
+    def _stage_dir(self, name: str) -> Path:
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        return self.cache_dir / safe
+
+    def _lookup(self, name: str, input_hash: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+        meta = self._stage_dir(name) / f"{input_hash}.json"
+        if not meta.exists() or not meta.with_suffix(".pkl").exists():
+            return None
+        meta.touch()  # recently used entries survive pruning
+        return json.loads(meta.read_text(encoding="utf-8"))["output_hash"]
+
+    def _store(self, name: str, input_hash: str, output: Any, output_hash: str) -> None:
+        if self.cache_dir is None:
+            return
+        d = self._stage_dir(name)
+        d.mkdir(parents=True, exist_ok=True)
+        for path, payload in (
+            (d / f"{input_hash}.pkl", pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)),
+            (d / f"{input_hash}.json", json.dumps({"output_hash": output_hash, "stored_at": time.time()}).encode()),
+        ):
+            tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+
+        # prune old entries of this stage
+        metas = sorted(d.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for old in metas[self.keep:]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".pkl").unlink(missing_ok=True)
+
+    def _load(self, name: str) -> Any:
+        if name not in self._outputs:
+            run = self.runs[name]
+            path = self._stage_dir(name) / f"{run.input_hash}.pkl"
+            self._outputs[name] = pickle.loads(path.read_bytes())
+        return self._outputs[name]
+
+    # --- execution ---------------------------------------------------------
+
+    def _order(self) -> list[str]:
+        order, state = [], {}
+
+        def visit(n: str) -> None:
+            if state.get(n) == "done":
+                return
+            if state.get(n) == "visiting":
+                raise ValueError(f"Cycle detected at stage '{n}'")
+            state[n] = "visiting"
+            for d in self.stages[n].deps:
+                visit(d)
+            state[n] = "done"
+            order.append(n)
+
+        for n in self.stages:
+            visit(n)
+        return order
+
+    def run(self, targets: Optional[list[str]] = None) -> dict[str, Any]:
+        """
+        Run (or skip) every stage; returns the outputs of `targets`
+        (default: stages nothing depends on).
+        """
+        for name in self._order():
+            stage = self.stages[name]
+            t0 = time.perf_counter()
+            dep_hashes = [self.runs[d].output_hash for d in stage.deps]
+            input_hash = fingerprint(
+                [name, stage.params, stage.version, _code_version(stage.func), dep_hashes]
+            )
+
+            output_hash = None if stage.always_run else self._lookup(name, input_hash)
+            executed = output_hash is None
+            if executed:
+                output = stage.func(*[self._load(d) for d in stage.deps], **stage.params)
+                output_hash = fingerprint(output)
+                self._outputs[name] = output
+                if self._lookup(name, input_hash) != output_hash:
+                    self._store(name, input_hash, output, output_hash)
+
+            self.runs[name] = StageRun(name, input_hash, output_hash, executed, time.perf_counter() - t0)
+
+        if targets is None:
+            used = {d for s in self.stages.values() for d in s.deps}
+            targets = [n for n in self.stages if n not in used]
+        return {n: self._load(n) for n in targets}
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{r.name}={'run' if r.executed else 'skip'}({r.seconds * 1000:.0f}ms)" for r in self.runs.values()
+        )
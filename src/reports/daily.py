@@ -0,0 +1,180 @@
+import multiprocessing as mp
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+from src import telemetry
+from src.data.yahoo import get_candles_yahoo
+from src.strategies.buy_hold import buy_and_hold
+from src.metrics.performance import compute_metrics
+from src.pipeline.dag import Pipeline, Stage
+from src.reports.render import REPORT_FORMATS, render_asset, render_index, sparkline_points
+
+
+# Limits concurrent provider downloads across all workers (set per worker process)
+_FETCH_SLOTS = threading.BoundedSemaphore(4)
+
+
+def _init_worker(fetch_slots) -> None:
+    global _FETCH_SLOTS
+    _FETCH_SLOTS = fetch_slots
+
+
+def _fetch(asset: str, interval: str, period: str):
+    with _FETCH_SLOTS:
+        return get_candles_yahoo(asset, interval=interval, period=period)
+
+
+def _strategy(prices):
+    return buy_and_hold(prices, initial_value=100.0)
+
+
+def _summary(out) -> dict:
+    return {
+        "first_close": float(out["close"].iloc[0]),
+        "last_close": float(out["close"].iloc[-1]),
+        "metrics": compute_metrics(out, equity_col="equity_bh", ret_col="ret"),
+        "spark": sparkline_points(out["equity_bh"]),
+    }
+
+
+def _render(summary: dict, asset: str, today: str, interval: str, period: str, formats: tuple) -> dict:
+    return {
+        fmt: render_asset(fmt, asset=asset, today=today, interval=interval, period=period, **summary)
+        for fmt in formats
+    }
+
+
+def asset_report_pipeline(
+    asset: str,
+    interval: str,
+    period: str,
+    today: str,
+    cache_dir: Optional[str] = None,
+    formats: tuple = ("md",),
+) -> Pipeline:
+    """
+    fetch -> strategy -> metrics -> render for one asset.
+    The fetch always runs; the other stages are skipped when the fetched candles
+    hash the same as on the previous run.
+    """
+    return Pipeline(
+        [
+            Stage(f"fetch:{asset}", _fetch, params={"asset": asset, "interval": interval, "period": period}, always_run=True),
+            Stage(f"strategy:{asset}", _strategy, deps=(f"fetch:{asset}",)),
+            Stage(f"metrics:{asset}", _summary, deps=(f"strategy:{asset}",)),
+            Stage(
+                f"render:{asset}",
+                _render,
+                deps=(f"metrics:{asset}",),
+                params={"asset": asset, "today": today, "interval": interval, "period": period, "formats": list(formats)},
+            ),
+        ],
+        cache_dir=cache_dir,
+    )
+
+
+def run_asset_report(
+    asset: str,
+    interval: str,
+    period: str,
+    out_dir: str,
+    today: str,
+    cache_dir: Optional[str] = None,
+    formats: tuple = ("md",),
+) -> dict:
+    """
+    fetch -> buy_and_hold -> compute_metrics -> report files (one per format) for one asset.
+    With `cache_dir`, unchanged stages are served from the previous run.
+    Never raises: failures are returned as {"status": "error", ...} so one bad
+    ticker doesn't stop the batch.
+    """
+    t0 = time.perf_counter()
+    try:
+        pipe = asset_report_pipeline(asset, interval, period, today, cache_dir=cache_dir, formats=tuple(formats))
+        out = pipe.run(targets=[f"metrics:{asset}", f"render:{asset}"])
+        summary, texts = out[f"metrics:{asset}"], out[f"render:{asset}"]
+
+        paths = []
+        for fmt, text in texts.items():
+            out_path = Path(out_dir) / f"{today}_{asset}{REPORT_FORMATS[fmt]}"
+            if not out_path.exists() or out_path.read_text(encoding="utf-8") != text:
+                out_path.write_text(text, encoding="utf-8")
+            paths.append(str(out_path))
+        return {
+            "asset": asset,
+            "status": "ok",
+            "path": paths[0],
+            "paths": paths,
+            **summary,
+            "stages": pipe.summary(),
+            "seconds": time.perf_counter() - t0,
+            "telemetry": telemetry.drain(),
+        }
+    except Exception as e:
+        return {
+            "asset": asset,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "seconds": time.perf_counter() - t0,
+            "telemetry": telemetry.drain(),
+        }
+
+
+def generate_reports(
+    assets: list[str],
+    interval: str,
+    period: str,
+    out_dir: str,
+    today: str,
+    workers: Optional[int] = None,
+    fetch_concurrency: int = 4,
+    cache_dir: Optional[str] = None,
+    formats: tuple = ("md",),
+) -> list[dict]:
+    """
+    Run run_asset_report for every asset across a process pool.
+    At most `fetch_concurrency` downloads are in flight at any time, whatever the
+    number of workers. Results come back in `assets` order; the workers' telemetry
+    is merged into this process. If a worker process dies (OOM kill, segfault),
+    the assets it left unfinished are reported as failed and the batch goes on.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    workers = workers or mp.cpu_count()
+
+    if workers <= 1 or len(assets) <= 1:
+        _init_worker(threading.BoundedSemaphore(fetch_concurrency))
+        results = [run_asset_report(a, interval, period, out_dir, today, cache_dir, formats) for a in assets]
+    else:
+        ctx = mp.get_context()
+        fetch_slots = ctx.BoundedSemaphore(fetch_concurrency)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(assets)),
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(fetch_slots,),
+        ) as ex:
+            futures = [ex.submit(run_asset_report, a, interval, period, out_dir, today, cache_dir, formats) for a in assets]
+            results = []
+            for asset, f in zip(assets, futures):
+                try:
+                    results.append(f.result())
+                except BrokenProcessPool as e:
+                    # the pool is unusable: every asset still pending ends up here
+                    results.append({"asset": asset, "status": "error", "error": f"BrokenProcessPool: {e}"})
+
+    for r in results:
+        telemetry.merge(r.pop("telemetry", None))
+    return results
+
+
+def write_index(results: list[dict], out_dir: str, today: str, interval: str, period: str, fmt: str = "md") -> Path:
+    """
+    Summary page linking every per-asset report, failures listed at the end.
+    """
+    out_path = Path(out_dir) / f"{today}_index{REPORT_FORMATS[fmt]}"
+    out_path.write_text(render_index(results, today, interval, period, fmt=fmt), encoding="utf-8")
+    return out_path
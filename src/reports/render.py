@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import base64
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from src.viz.downsample import lttb_indices
+
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+# Report formats -> file suffix
+REPORT_FORMATS = {"md": ".md", "html": ".html"}
+
+
+def sparkline_points(values: Sequence[float], n_points: int = 60) -> list[float]:
+    """
+    Equity curve reduced to `n_points` (LTTB, shape preserving), as plain floats
+    small enough to carry around in metric dicts.
+    """
+    y = np.asarray(values, dtype=float)
+    y = y[np.isfinite(y)]
+    idx = lttb_indices(np.arange(len(y), dtype=float), y, n_points)
+    return [float(v) for v in y[idx]]
+
+
+def sparkline_svg(values: Sequence[float], width: int = 120, height: int = 24, stroke: str = "auto") -> str:
+    """
+    Inline SVG polyline of `values` (no axes), scaled to width x height.
+    stroke="auto": green if the curve ends above its start, red otherwise.
+    """
+    y = np.asarray(values, dtype=float)
+    if len(y) < 2:
+        return ""
+    lo, hi = float(y.min()), float(y.max())
+    span = hi - lo or 1.0
+    xs = np.linspace(1, width - 1, len(y))
+    ys = (height - 1) - (y - lo) / span * (height - 2)
+    points = " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(xs, ys))
+    if stroke == "auto":
+        stroke = "#2ca02c" if y[-1] >= y[0] else "#d62728"
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<polyline fill="none" stroke="{stroke}" stroke-width="1.5" points="{points}"/></svg>'
+    )
+
+
+_BLOCKS = "▁▂▃▄▅▆▇█"
+
+
+def sparkline_text(values: Sequence[float]) -> str:
+    """
+    Unicode block sparkline, for plain-text reports.
+    """
+    y = np.asarray(values, dtype=float)
+    if len(y) < 2:
+        return ""
+    span = float(y.max() - y.min()) or 1.0
+    levels = ((y - y.min()) / span * (len(_BLOCKS) - 1)).round().astype(int)
+    return "".join(_BLOCKS[i] for i in levels)
+
+
+def _data_uri(svg: str) -> str:
+    # markdown viewers drop raw <svg>, but render it as an image
+    return "data:image/svg+xml;base64," + base64.b64encode(svg.encode()).decode()
+
+
+def _pct(x: float, digits: int = 2) -> str:
+    return f"{x * 100:.{digits}f}%"
+
+
+def _num(x: float, digits: int = 2) -> str:
+    return f"{x:.{digits}f}"
+
+
+def _build_env() -> Environment:
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(enabled_extensions=("html", "html.j2"), default_for_string=False),
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=False,
+        auto_reload=False,
+    )
+    env.filters.update(pct=_pct, num=_num, sparkline=sparkline_svg, sparkline_text=sparkline_text, data_uri=_data_uri)
+    return env
+
+
+# One environment per process: each template is compiled on first use, then reused
+_ENV = _build_env()
+
+
+def render(template: str, **context) -> str:
+    return _ENV.get_template(template).render(**context)
+
+
+def render_asset(fmt: str = "md", **context) -> str:
+    """
+    Per-asset report. Context: asset, today, interval, period, first_close,
+    last_close, metrics (compute_metrics dict), spark (sparkline_points, optional).
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format '{fmt}'. Expected one of {list(REPORT_FORMATS)}")
+    context.setdefault("spark", None)
+    return render(f"asset{REPORT_FORMATS[fmt]}.j2", **context)
+
+
+def render_index(results: Iterable[dict], today: str, interval: str, period: str, fmt: str = "md") -> str:
+    """
+    Summary page of run_asset_report results: ok assets ranked by total return, failures last.
+    """
+    results = list(results)
+    ok = sorted((r for r in results if r["status"] == "ok"), key=lambda r: r["metrics"]["total_return"], reverse=True)
+    failed = [r for r in results if r["status"] != "ok"]
+    return render(
+        f"index{REPORT_FORMATS[fmt]}.j2",
+        ok=ok,
+        failed=failed,
+        n_assets=len(results),
+        today=today,
+        interval=interval,
+        period=period,
+        suffix=REPORT_FORMATS[fmt],
+    )
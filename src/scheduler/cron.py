@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+
+# (min, max) per field: minute hour day-of-month month day-of-week
+_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+def _parse_field(expr: str, lo: int, hi: int, dow: bool = False) -> frozenset[int]:
+    values = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_s = part.split("/", 1)
+            step = int(step_s)
+            if step <= 0:
+                raise ValueError(f"Invalid step in cron field '{expr}'")
+        if part == "*":
+            start, end = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, end = int(a), int(b)
+        else:
+            start = int(part)
+            end = hi if step > 1 else start
+        # 7 is Sunday too
+        top = 7 if dow else hi
+        if not (lo <= start <= top and lo <= end <= top and start <= end):
+            raise ValueError(f"Cron field '{expr}' out of range {lo}-{hi}")
+        values.update(v % 7 if dow else v for v in range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """
+    Standard 5-field cron expression (minute hour day-of-month month day-of-week),
+    with *, lists, ranges and steps. Like cron, when both day fields are restricted
+    a day matches if either does.
+    """
+
+    def __init__(self, expr: str):
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got '{expr}'")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(p, lo, hi, dow=(i == 4)) for i, (p, (lo, hi)) in enumerate(zip(parts, _FIELDS))
+        )
+        self._any_day = parts[2] == "*"
+        self._any_weekday = parts[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays  # cron: 0 = Sunday
+        if self._any_day or self._any_weekday:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, dt: datetime) -> datetime:
+        """
+        First matching minute strictly after `dt` (same tzinfo as `dt`).
+        """
+        t = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = t + timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months or not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression '{self.expr}' never matches")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expr!r})"
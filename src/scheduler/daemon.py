@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from tenacity import Retrying, retry_if_not_exception_type, stop_after_attempt, stop_any, wait_exponential_jitter
+
+from src.scheduler.cron import CronSchedule
+
+
+class JobTimeout(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    """
+    A callable run on a cron schedule.
+      - jitter_seconds: random delay added to every run (spreads provider load)
+      - retries: extra attempts after a failure, with exponential backoff
+      - timeout_seconds: wall-clock budget of one run, retries included
+    """
+    name: str
+    schedule: CronSchedule
+    func: Callable[[], object]
+    jitter_seconds: float = 0.0
+    retries: int = 0
+    backoff_seconds: float = 5.0
+    timeout_seconds: Optional[float] = None
+    next_run: Optional[datetime] = None
+    _busy: bool = field(default=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+
+_SCRIPTS: dict[str, object] = {}
+
+
+def load_script(path: str | Path):
+    """
+    Import a script file once and keep the module (its imports and caches stay warm).
+    """
+    path = Path(path).resolve()
+    key = str(path)
+    if key not in _SCRIPTS:
+        spec = importlib.util.spec_from_file_location(f"scheduled_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _SCRIPTS[key] = module
+    return _SCRIPTS[key]
+
+
+def script_job(path: str | Path, args: Optional[list[str]] = None) -> Callable[[], object]:
+    """
+    Callable running `main(args)` of a script module, like `python <path> <args>` would.
+    A non-zero exit code (returned or via SystemExit) is an error.
+    """
+    def run():
+        main = load_script(path).main
+        try:
+            rc = main(args) if args is not None else main()
+        except SystemExit as e:
+            rc = e.code
+        if rc not in (None, 0):
+            raise RuntimeError(f"{Path(path).name} exited with status {rc}")
+        return rc
+    return run
+
+
+class Scheduler:
+    """
+    Long-running scheduler: jobs run in threads of this process, at most
+    `max_concurrency` at once, and every run is appended to `log_path` as one JSON line.
+
+    Python threads cannot be killed: a run that exceeds its timeout is logged as
+    "timeout" and abandoned. It keeps its concurrency slot, and the job is not
+    started again, until that run ends.
+    """
+
+    def __init__(self, jobs: list[Job], max_concurrency: int = 2, log_path: Optional[str | Path] = None):
+        names = [j.name for j in jobs]
+        if len(set(names)) != len(names):
+            raise ValueError("Job names must be unique.")
+        self.jobs = jobs
+        self.max_concurrency = max_concurrency
+        self.log_path = Path(log_path) if log_path else None
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="job")
+        self._log_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # --- logging -----------------------------------------------------------
+
+    def _log(self, record: dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._log_lock:
+            if self.log_path is not None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            print(line, flush=True)
+
+    # --- running -----------------------------------------------------------
+
+    def _attempt(self, job: Job, deadline: Optional[float]) -> None:
+        box = {}
+
+        def target():
+            try:
+                job.func()
+            except BaseException as e:  # noqa: BLE001 - reported to the caller thread
+                box["error"] = e
+
+        t = threading.Thread(target=target, name=f"job-{job.name}", daemon=True)
+        job._thread = t
+        t.start()
+        t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if t.is_alive():
+            raise JobTimeout(f"timed out after {job.timeout_seconds}s")
+        if "error" in box:
+            raise box["error"]
+
+    def run_job(self, job: Job, scheduled_for: Optional[datetime] = None) -> dict:
+        """
+        Run one job now (retries and timeout included) and log the outcome.
+        """
+        started = datetime.now()
+        t0 = time.monotonic()
+        deadline = t0 + job.timeout_seconds if job.timeout_seconds else None
+        attempts = 0
+        status, error = "ok", None
+        backoff = wait_exponential_jitter(initial=job.backoff_seconds, max=job.backoff_seconds * 16, jitter=job.backoff_seconds)
+
+        def wait(retry_state) -> float:
+            # never sleep past the budget
+            sleep = backoff(retry_state)
+            return sleep if deadline is None else max(0.0, min(sleep, deadline - time.monotonic()))
+
+        def out_of_budget(retry_state) -> bool:
+            # no budget left after the backoff: report the last error, not a timeout
+            return deadline is not None and time.monotonic() + retry_state.upcoming_sleep >= deadline
+
+        try:
+            for attempt in Retrying(
+                stop=stop_any(stop_after_attempt(job.retries + 1), out_of_budget),
+                wait=wait,
+                retry=retry_if_not_exception_type(JobTimeout),
+                reraise=True,
+            ):
+                with attempt:
+                    attempts += 1
+                    self._attempt(job, deadline)
+        except JobTimeout as e:
+            status, error = "timeout", str(e)
+        except BaseException as e:  # noqa: BLE001
+            status, error = "error", f"{type(e).__name__}: {e}"
+        finally:
+            job._busy = False
+
+        record = {
+            "job": job.name,
+            "status": status,
+            "scheduled_for": scheduled_for.isoformat() if scheduled_for else None,
+            "started_at": started.isoformat(),
+            "duration_s": round(time.monotonic() - t0, 3),
+            "attempts": attempts,
+            "error": error,
+        }
+        self._log(record)
+        return record
+
+    def _schedule_next(self, job: Job, now: datetime) -> None:
+        nxt = job.schedule.next_after(now)
+        if job.jitter_seconds:
+            nxt += timedelta(seconds=random.uniform(0.0, job.jitter_seconds))
+        job.next_run = nxt
+
+    def _dispatch(self, job: Job, scheduled_for: datetime) -> None:
+        if job._busy or (job._thread is not None and job._thread.is_alive()):
+            self._log({"job": job.name, "status": "skipped", "scheduled_for": scheduled_for.isoformat(),
+                       "error": "previous run still in progress"})
+            return
+        job._busy = True
+        self._pool.submit(self._run_in_slot, job, scheduled_for)
+
+    def _run_in_slot(self, job: Job, scheduled_for: datetime) -> None:
+        self.run_job(job, scheduled_for)
+        # a timed-out run still uses a worker: keep its slot until it really ends
+        if job._thread is not None:
+            job._thread.join()
+
+    def run_forever(self, poll_seconds: float = 30.0) -> None:
+        # naive local time, like cron (the VM runs on Europe/Paris)
+        now = datetime.now()
+        for job in self.jobs:
+            self._schedule_next(job, now)
+            self._log({"job": job.name, "status": "scheduled", "next_run": job.next_run.isoformat()})
+
+        while not self._stop.is_set():
+            now = datetime.now()
+            for job in self.jobs:
+                if job.next_run <= now:
+                    due = job.next_run
+                    self._schedule_next(job, now)
+                    self._dispatch(job, due)
+            wake = min(j.next_run for j in self.jobs)
+            self._stop.wait(max(0.1, min(poll_seconds, (wake - datetime.now()).total_seconds())))
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stop(self) -> None:
+        self._stop.set()
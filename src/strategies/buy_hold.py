@@ -1,13 +1,21 @@
+from __future__ import annotations
+
 import pandas as pd
 
+from src.data.bars import PriceBars, working_frame
+from src.tracing import span, traced
+
 
-def buy_and_hold(prices: pd.DataFrame, initial_value: float = 100.0) -> pd.DataFrame:
+@traced()
+def buy_and_hold(prices: pd.DataFrame | PriceBars, initial_value: float = 100.0) -> pd.DataFrame:
     """
     Buy & Hold equity curve from close prices.
-    Expected columns: timestamp, close
+    Expected columns: timestamp, close (PriceBars: used without copying or sorting)
     Output columns: ret, equity_bh
     """
-    df = prices.copy().sort_values("timestamp").reset_index(drop=True)
-    df["ret"] = df["close"].pct_change().fillna(0.0)
-    df["equity_bh"] = initial_value * (1.0 + df["ret"]).cumprod()
+    with span("buy_and_hold.copy_sort"):
+        df = working_frame(prices)
+    with span("buy_and_hold.compute"):
+        df["ret"] = df["close"].pct_change().fillna(0.0)
+        df["equity_bh"] = initial_value * (1.0 + df["ret"]).cumprod()
     return df
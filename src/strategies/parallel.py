@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.bars import PriceBars, working_frame
+from src.strategies.buy_hold import buy_and_hold
+from src.strategies.momentum import momentum_strategy
+from src.tracing import span, traced
+
+# Columns each strategy adds, and the one holding its per-bar return
+_STRATEGIES = {
+    "buy_and_hold": (("ret",), "ret", "equity_bh"),
+    "momentum": (("ret", "mom", "signal", "signal_lag", "strat_ret"), "strat_ret", "equity_mom"),
+}
+
+
+def partition_bounds(timestamps: pd.Series, freq: str = "QS") -> list[tuple[int, int]]:
+    """
+    [start, end) row ranges of consecutive calendar periods (pandas offset alias:
+    "YS", "QS", "MS", "W", ...). `timestamps` must be sorted.
+    """
+    ts = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if len(ts) == 0:
+        return []
+    starts = pd.date_range(ts[0].normalize(), ts[-1], freq=freq)
+    cuts = np.unique(ts.searchsorted(starts, side="left"))
+    edges = [0, *[int(c) for c in cuts if 0 < c < len(ts)], len(ts)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _run_partition(strategy: str, frame: pd.DataFrame, warmup: int, lookback: int) -> dict:
+    """
+    Worker: run the in-memory strategy on one partition preceded by `warmup`
+    rows, drop the warm-up, and return the new columns plus the local growth
+    (equity / equity at the partition start).
+    """
+    columns, ret_col, _ = _STRATEGIES[strategy]
+    if strategy == "momentum":
+        out = momentum_strategy(frame, lookback=lookback, initial_value=1.0)
+    else:
+        out = buy_and_hold(frame, initial_value=1.0)
+    out = out.iloc[warmup:]
+    cols = {c: out[c].to_numpy() for c in columns}
+    cols["growth"] = np.cumprod(1.0 + out[ret_col].to_numpy(dtype=float))
+    return cols
+
+
+@traced()
+def parallel_backtest(
+    prices: pd.DataFrame | PriceBars,
+    strategy: str = "momentum",
+    lookback: int = 20,
+    initial_value: float = 100.0,
+    freq: str = "QS",
+    n_jobs: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Single-asset backtest split by calendar period (`freq`) across a process pool.
+
+    Each partition is computed with `lookback + 1` rows of the previous one
+    prepended (first return, momentum window, lagged signal), then the global
+    equity is stitched by chaining the partitions' growth factors.
+    Same rows and columns as buy_and_hold / momentum_strategy; equity equal up
+    to float rounding. n_jobs: workers (default: all cores, 1 = in-process).
+    """
+    if strategy not in _STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}' (buy_and_hold | momentum)")
+    columns, _, equity_col = _STRATEGIES[strategy]
+
+    with span("parallel_backtest.copy_sort"):
+        df = working_frame(prices)
+    bounds = partition_bounds(df["timestamp"], freq)
+    warmup = (lookback if strategy == "momentum" else 0) + 1
+
+    # workers only need what the strategy reads
+    base = df[["timestamp", "close"]]
+    tasks = []
+    for start, end in bounds:
+        w = min(warmup, start)
+        tasks.append((strategy, base.iloc[start - w:end], w, lookback))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    with span("parallel_backtest.partitions", partitions=len(tasks), n_jobs=n_jobs):
+        if n_jobs <= 1 or len(tasks) <= 1:
+            parts = [_run_partition(*t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(tasks))) as ex:
+                parts = list(ex.map(_run_partition, *zip(*tasks)))
+
+    with span("parallel_backtest.stitch"):
+        for c in columns:
+            df[c] = np.concatenate([p[c] for p in parts]) if parts else np.empty(0)
+        # equity = initial * (growth at the end of every earlier partition) * local growth
+        carried = np.cumprod([1.0] + [p["growth"][-1] for p in parts[:-1]])
+        growth = np.concatenate([c * p["growth"] for c, p in zip(carried, parts)]) if parts else np.empty(0)
+        df[equity_col] = initial_value * growth
+    return df
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.metrics.online import OnlineMetrics
+from src.tracing import span
+
+
+@dataclass
+class StreamState:
+    """
+    What a strategy needs from previous chunks to continue exactly where it stopped.
+    """
+    last_close: Optional[float] = None
+    tail: np.ndarray = field(default_factory=lambda: np.empty(0))  # last `lookback` closes
+    last_signal: int = 0
+    growth: float = 1.0  # cumulative product of (1 + return); equity = initial_value * growth
+    last_ts: Optional[pd.Timestamp] = None
+    n_rows: int = 0
+
+
+def _check_order(df: pd.DataFrame, state: StreamState) -> None:
+    ts = df["timestamp"]
+    if not ts.is_monotonic_increasing or (state.last_ts is not None and ts.iloc[0] < state.last_ts):
+        raise ValueError("Chunks must be sorted by timestamp (and fed in time order).")
+    state.last_ts = ts.iloc[-1]
+
+
+def _returns(close: np.ndarray, state: StreamState) -> np.ndarray:
+    prev = np.concatenate([[np.nan if state.last_close is None else state.last_close], close[:-1]])
+    ret = close / prev - 1.0
+    if state.last_close is None:
+        ret[0] = 0.0
+    return ret
+
+
+def _compound(ret: np.ndarray, state: StreamState) -> np.ndarray:
+    # carried product first, so each step is the same multiplication as the in-memory cumprod
+    growth = np.cumprod(np.concatenate([[state.growth], 1.0 + ret]))[1:]
+    state.growth = float(growth[-1])
+    return growth
+
+
+def stream_buy_and_hold(
+    chunks: Iterable[pd.DataFrame],
+    initial_value: float = 100.0,
+    state: Optional[StreamState] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    buy_and_hold over time-ordered chunks: yields each chunk with ret, equity_bh.
+    Concatenated output equals buy_and_hold on the whole history.
+    """
+    state = state or StreamState()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        df = chunk.reset_index(drop=True)
+        _check_order(df, state)
+        with span("stream.buy_and_hold.chunk", rows=len(df)):
+            close = df["close"].to_numpy(dtype=float)
+            ret = _returns(close, state)
+            df["ret"] = ret
+            df["equity_bh"] = initial_value * _compound(ret, state)
+            state.last_close = float(close[-1])
+            state.n_rows += len(df)
+        yield df
+
+
+def stream_momentum(
+    chunks: Iterable[pd.DataFrame],
+    lookback: int = 20,
+    initial_value: float = 100.0,
+    state: Optional[StreamState] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    momentum_strategy over time-ordered chunks: yields each chunk with
+    ret, mom, signal, signal_lag, strat_ret, equity_mom.
+    The last `lookback` closes and the last signal are carried to the next chunk.
+    """
+    state = state or StreamState()
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        df = chunk.reset_index(drop=True)
+        _check_order(df, state)
+        with span("stream.momentum.chunk", rows=len(df)):
+            close = df["close"].to_numpy(dtype=float)
+            ret = _returns(close, state)
+            df["ret"] = ret
+
+            # past return over lookback periods, the carried tail supplies the first rows
+            n_tail = len(state.tail)
+            extended = np.concatenate([state.tail, close])
+            df["mom"] = pd.Series(extended).pct_change(lookback).to_numpy()[n_tail:]
+
+            signal = (df["mom"] > 0).astype(int)
+            df["signal"] = signal
+            df["signal_lag"] = np.concatenate([[state.last_signal], signal.to_numpy()[:-1]]).astype(int)
+
+            df["strat_ret"] = df["signal_lag"] * df["ret"]
+            df["equity_mom"] = initial_value * _compound(df["strat_ret"].to_numpy(dtype=float), state)
+
+            state.last_close = float(close[-1])
+            state.tail = extended[-lookback:] if lookback > 0 else np.empty(0)
+            state.last_signal = int(signal.iloc[-1])
+            state.n_rows += len(df)
+        yield df
+
+
+def streaming_backtest(
+    chunks: Iterable[pd.DataFrame],
+    strategy: str = "buy_and_hold",
+    lookback: int = 20,
+    initial_value: float = 100.0,
+    sink=None,
+) -> dict:
+    """
+    Run a strategy over chunks and return compute_metrics-style metrics
+    (plus "rows"). Only one chunk is in memory at a time; `sink(chunk)`
+    receives each output chunk (e.g. to append it to a file).
+    """
+    if strategy == "buy_and_hold":
+        outputs = stream_buy_and_hold(chunks, initial_value=initial_value)
+        acc = OnlineMetrics(equity_col="equity_bh", ret_col="ret")
+    elif strategy == "momentum":
+        outputs = stream_momentum(chunks, lookback=lookback, initial_value=initial_value)
+        acc = OnlineMetrics(equity_col="equity_mom", ret_col="strat_ret")
+    else:
+        raise ValueError(f"Unknown strategy '{strategy}' (buy_and_hold | momentum)")
+
+    for out in outputs:
+        acc.update(out)
+        if sink is not None:
+            sink(out)
+    return {**acc.result(), "rows": acc.n_rows}
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence
+
+
+# Latency buckets (seconds): cache reads are sub-ms, provider calls 0.1-10s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels_key(labelnames: Sequence[str], labels: dict) -> tuple:
+    if set(labels) != set(labelnames):
+        raise ValueError(f"Expected labels {list(labelnames)}, got {sorted(labels)}")
+    return tuple(str(labels[n]) for n in labelnames)
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(labelnames: Sequence[str], key: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(labelnames, key)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_labels_key(self.labelnames, labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items]
+        return lines
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict) -> None:
+        with self._lock:
+            for k, v in values.items():
+                self._values[k] = self._values.get(k, 0.0) + v
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels_key(self.labelnames, labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            row[i] += 1
+            row[-1] += value
+
+    def count(self, **labels) -> int:
+        row = self._values.get(_labels_key(self.labelnames, labels))
+        return int(sum(row[:-1])) if row else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        for key, row in items:
+            cumulative = 0.0
+            for bound, n in zip(list(self.buckets) + [math.inf], row[:-1]):
+                cumulative += n
+                le = f'le="{_fmt_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {_fmt_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(row[-1])}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {_fmt_value(cumulative)}")
+        return lines
+
+    def drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: dict) -> None:
+        with self._lock:
+            for k, row in values.items():
+                mine = self._values.setdefault(k, [0.0] * (len(self.buckets) + 2))
+                for i, v in enumerate(row):
+                    mine[i] += v
+
+
+# --- metrics ---------------------------------------------------------------
+
+FETCH_REQUESTS = Counter("quant_fetch_requests_total", "Provider requests by outcome.", ("provider", "op", "symbol", "status"))
+FETCH_LATENCY = Histogram("quant_fetch_latency_seconds", "Provider request latency.", ("provider", "op"))
+FETCH_ROWS = Counter("quant_fetch_rows_total", "Rows returned by providers.", ("provider", "op"))
+FETCH_BYTES = Counter("quant_fetch_bytes_total", "Bytes returned by providers (payload or frame size).", ("provider", "op"))
+FETCH_EVENTS = Counter("quant_fetch_middleware_events_total", "Fetch middleware retries, hedges, coalesced calls and deadline misses.", ("provider", "event"))
+CACHE_REQUESTS = Counter("quant_cache_requests_total", "Cache lookups by result (hit/miss).", ("cache", "result"))
+STORAGE_OPS = Counter("quant_storage_ops_total", "Storage operations by outcome.", ("op", "status"))
+STORAGE_LATENCY = Histogram("quant_storage_latency_seconds", "Storage operation latency.", ("op",))
+STORAGE_ROWS = Counter("quant_storage_rows_total", "Rows read or written by the storage layer.", ("op",))
+STORAGE_BYTES = Counter("quant_storage_bytes_total", "Bytes read or written by the storage layer.", ("op",))
+
+METRICS = (
+    FETCH_REQUESTS, FETCH_LATENCY, FETCH_ROWS, FETCH_BYTES, FETCH_EVENTS, CACHE_REQUESTS,
+    STORAGE_OPS, STORAGE_LATENCY, STORAGE_ROWS, STORAGE_BYTES,
+)
+
+
+class _Observation:
+    __slots__ = ("rows", "bytes")
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+
+
+@contextmanager
+def observe_fetch(provider: str, op: str, symbol: str = ""):
+    """
+    with observe_fetch("yahoo", "candles", symbol) as obs: ...; obs.rows = len(df)
+    Records latency, outcome, rows and bytes; exceptions are counted and re-raised.
+    """
+    obs = _Observation()
+    t0 = time.perf_counter()
+    try:
+        yield obs
+    except Exception:
+        FETCH_REQUESTS.inc(provider=provider, op=op, symbol=symbol, status="error")
+        raise
+    finally:
+        FETCH_LATENCY.observe(time.perf_counter() - t0, provider=provider, op=op)
+    FETCH_REQUESTS.inc(provider=provider, op=op, symbol=symbol, status="ok")
+    FETCH_ROWS.inc(obs.rows, provider=provider, op=op)
+    FETCH_BYTES.inc(obs.bytes, provider=provider, op=op)
+
+
+@contextmanager
+def observe_storage(op: str):
+    obs = _Observation()
+    t0 = time.perf_counter()
+    try:
+        yield obs
+    except Exception:
+        STORAGE_OPS.inc(op=op, status="error")
+        raise
+    finally:
+        STORAGE_LATENCY.observe(time.perf_counter() - t0, op=op)
+    STORAGE_OPS.inc(op=op, status="ok")
+    STORAGE_ROWS.inc(obs.rows, op=op)
+    STORAGE_BYTES.inc(obs.bytes, op=op)
+
+
+def fetch_event(provider: str, event: str) -> None:
+    FETCH_EVENTS.inc(provider=provider, event=event)
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+_LOOKUPS = threading.local()
+
+
+@contextmanager
+def cache_lookup(cache: str):
+    """
+    Count hits/misses of a memoized call whose body we can't observe from outside
+    (st.cache_data / st.cache_resource): the cached function calls cache_miss() in
+    its body, so a lookup that finishes without it was a hit.
+    """
+    stack = _LOOKUPS.__dict__.setdefault("stack", [])
+    stack.append([False])
+    try:
+        yield
+    finally:
+        missed = stack.pop()[0]
+        cache_result(cache, hit=not missed)
+
+
+def cache_miss() -> None:
+    stack = getattr(_LOOKUPS, "stack", None)
+    if stack:
+        stack[-1][0] = True
+
+
+# --- export ----------------------------------------------------------------
+
+def render_prometheus() -> str:
+    lines = []
+    for m in METRICS:
+        lines += m.render()
+    return "\n".join(lines) + "\n"
+
+
+def drain() -> dict:
+    """
+    Take and reset this process's values (worker processes send them to the parent).
+    """
+    return {m.name: m.drain() for m in METRICS}
+
+
+def merge(values: dict) -> None:
+    by_name = {m.name: m for m in METRICS}
+    for name, v in (values or {}).items():
+        by_name[name].merge(v)
+
+
+def dump(title: str = "metrics") -> None:
+    """
+    Print the metrics in Prometheus text format (cron jobs: lands in the cron log).
+    """
+    print(f"# --- {title} ({time.strftime('%Y-%m-%d %H:%M:%S')}) ---")
+    print(render_prometheus(), end="", flush=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # keep the app/cron logs clean
+        pass
+
+
+_SERVER: Optional[ThreadingHTTPServer] = None
+_SERVER_LOCK = threading.Lock()
+
+
+def start_http_server(port: int = 9108, addr: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve /metrics from a daemon thread (once per process).
+    """
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            _SERVER = ThreadingHTTPServer((addr, port), _Handler)
+            threading.Thread(target=_SERVER.serve_forever, name="metrics-http", daemon=True).start()
+        return _SERVER
+
+
+def start_http_server_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    Start the endpoint if QUANT_METRICS_PORT is set (QUANT_METRICS_ADDR, default 127.0.0.1).
+    """
+    port = os.getenv("QUANT_METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return start_http_server(int(port), os.getenv("QUANT_METRICS_ADDR", "127.0.0.1"))
+    except OSError:
+        # another process (e.g. a second Streamlit worker) already serves this port
+        return None
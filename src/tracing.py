@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+
+class Trace:
+    """
+    Spans recorded while this trace is active (see `collect`).
+    Each event: name, start/duration (ns, relative to the trace start), thread,
+    nesting depth and self time (duration minus child spans).
+    """
+
+    def __init__(self, name: str = "trace"):
+        self.name = name
+        self.t0 = time.perf_counter_ns()
+        self.events: list[dict] = []
+        self._stacks: dict[int, list[list]] = {}
+        self._lock = threading.Lock()
+
+    def _begin(self) -> list:
+        stack = self._stacks.setdefault(threading.get_ident(), [])
+        frame = [0]  # accumulated child time (ns)
+        stack.append(frame)
+        return frame
+
+    def _end(self, name: str, start_ns: int, end_ns: int, frame: list, args: dict) -> None:
+        tid = threading.get_ident()
+        stack = self._stacks[tid]
+        stack.pop()
+        dur = end_ns - start_ns
+        if stack:
+            stack[-1][0] += dur
+        event = {
+            "name": name,
+            "start_ns": start_ns - self.t0,
+            "dur_ns": dur,
+            "self_ns": dur - frame[0],
+            "depth": len(stack),
+            "tid": tid,
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    # --- export ------------------------------------------------------------
+
+    def to_chrome(self) -> dict:
+        """
+        Chrome trace event format (open in chrome://tracing or ui.perfetto.dev).
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": e["name"],
+                "ph": "X",
+                "ts": e["start_ns"] / 1000.0,
+                "dur": e["dur_ns"] / 1000.0,
+                "pid": pid,
+                "tid": e["tid"],
+                "args": {k: str(v) for k, v in e["args"].items()},
+            }
+            for e in sorted(self.events, key=lambda e: e["start_ns"])
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace": self.name}}
+
+    def write_chrome(self, path: str | Path) -> Path:
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(self.to_chrome()), encoding="utf-8")
+        return p
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-span-name breakdown: calls, total and self time (ms), share of the trace wall time.
+        """
+        cols = ["calls", "total_ms", "self_ms", "share"]
+        if not self.events:
+            return pd.DataFrame(columns=cols).rename_axis("span")
+        df = pd.DataFrame(self.events)
+        wall_ns = max(e["start_ns"] + e["dur_ns"] for e in self.events) - min(e["start_ns"] for e in self.events)
+        out = df.groupby("name").agg(calls=("dur_ns", "size"), total_ms=("dur_ns", "sum"), self_ms=("self_ns", "sum"))
+        out[["total_ms", "self_ms"]] = out[["total_ms", "self_ms"]] / 1e6
+        out["share"] = out["self_ms"] / (wall_ns / 1e6) if wall_ns > 0 else 0.0
+        return out.sort_values("self_ms", ascending=False).rename_axis("span")
+
+
+# Active trace of the current context (Streamlit rerun, script run...), None = tracing off
+_ACTIVE: ContextVar[Optional[Trace]] = ContextVar("active_trace", default=None)
+
+
+class _Span:
+    __slots__ = ("trace", "name", "args", "start", "frame")
+
+    def __init__(self, trace: Trace, name: str, args: dict):
+        self.trace, self.name, self.args = trace, name, args
+
+    def __enter__(self):
+        self.frame = self.trace._begin()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace._end(self.name, self.start, time.perf_counter_ns(), self.frame, self.args)
+        return False
+
+
+_NOOP = nullcontext()
+
+
+def span(name: str, **args):
+    """
+    Time a block: `with span("fetch.yahoo", symbol=s): ...`.
+    Without an active trace this returns a shared no-op context manager.
+    """
+    trace = _ACTIVE.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, args)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording every call of the function as a span (default name: module.function).
+    """
+    def deco(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*a, **kw):
+            trace = _ACTIVE.get()
+            if trace is None:
+                return func(*a, **kw)
+            with _Span(trace, span_name, {}):
+                return func(*a, **kw)
+        return wrapper
+    return deco
+
+
+def start(name: str = "trace") -> Trace:
+    """
+    Activate a new trace for the rest of the current context (e.g. a Streamlit rerun).
+    """
+    trace = Trace(name)
+    _ACTIVE.set(trace)
+    return trace
+
+
+def stop() -> None:
+    _ACTIVE.set(None)
+
+
+def active() -> Optional[Trace]:
+    return _ACTIVE.get()
+
+
+@contextmanager
+def collect(name: str = "trace"):
+    """
+    with collect() as trace: ...   -> spans inside the block are recorded in `trace`.
+    """
+    trace = Trace(name)
+    token = _ACTIVE.set(trace)
+    try:
+        yield trace
+    finally:
+        _ACTIVE.reset(token)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def points_budget(width_px: int, points_per_px: float = 2.0, minimum: int = 200) -> int:
+    """
+    Number of points worth sending for a chart `width_px` wide.
+    More than ~2 points per horizontal pixel are not visible.
+    """
+    return max(minimum, int(width_px * points_per_px))
+
+
+def _as_float(x) -> np.ndarray:
+    """
+    Numeric view of an x axis (datetimes -> int64 nanoseconds).
+    """
+    if isinstance(x, (pd.Series, pd.Index)) and (
+        pd.api.types.is_datetime64_any_dtype(x.dtype)
+    ):
+        return pd.DatetimeIndex(x).asi8.astype(float)
+    arr = np.asarray(x)
+    if np.issubdtype(arr.dtype, np.datetime64):
+        return arr.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return arr.astype(float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that keep the visual
+    shape of the line. First and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket edges for the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        # triangle area between selected point a, candidate, next-bucket average
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max envelope: for each of n_out/2 buckets keep the lowest and highest point.
+    Preserves spikes exactly (useful for drawdowns), first and last points kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(int)
+    keep = [np.array([0, n - 1])]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi <= lo:
+            continue
+        seg = y[lo:hi]
+        keep.append(np.array([lo + np.argmin(seg), lo + np.argmax(seg)]))
+    return np.unique(np.concatenate(keep))
+
+
+def downsample_xy(
+    x: Sequence,
+    y: Sequence,
+    n_out: int,
+    method: str = "lttb",
+    x_range: Optional[tuple] = None,
+) -> tuple[pd.Series, pd.Series]:
+    """
+    Downsample one trace for plotting.
+
+    - x_range: optional (start, end) zoom window; only points inside it are kept,
+      so zooming re-samples the window at the full point budget.
+    - method: "lttb" (shape preserving) or "minmax" (envelope, keeps extremes).
+    NaN values in y are dropped. Returns (x, y) as Series.
+    """
+    xs = pd.Series(x).reset_index(drop=True)
+    ys = pd.Series(y).reset_index(drop=True).astype(float)
+
+    ok = ys.notna()
+    if x_range is not None:
+        lo, hi = x_range
+        if pd.api.types.is_datetime64_any_dtype(xs.dtype):
+            tz = xs.dt.tz
+            lo, hi = pd.Timestamp(lo), pd.Timestamp(hi)
+            if tz is not None:
+                lo = lo.tz_localize(tz) if lo.tzinfo is None else lo.tz_convert(tz)
+                hi = hi.tz_localize(tz) if hi.tzinfo is None else hi.tz_convert(tz)
+        ok &= (xs >= lo) & (xs <= hi)
+    xs, ys = xs[ok].reset_index(drop=True), ys[ok].reset_index(drop=True)
+
+    if len(ys) <= n_out:
+        return xs, ys
+
+    if method == "lttb":
+        idx = lttb_indices(_as_float(xs), ys.to_numpy(), n_out)
+    elif method == "minmax":
+        idx = minmax_indices(ys.to_numpy(), n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return xs.iloc[idx], ys.iloc[idx]
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from typing import Optional
+
+from src import tracing
+from src.tracing import Trace
+
+# session_state key of the sidebar toggle
+PERF_KEY = "perf_trace"
+
+
+def start_page_trace(page: str) -> Optional[Trace]:
+    """
+    Start recording spans for this rerun if the "Performance" toggle is on.
+    Call at the top of the page, before any work, so the breakdown covers the whole rerun.
+    """
+    import streamlit as st
+
+    # reruns of a session reuse the script thread: never inherit the previous rerun's trace
+    tracing.stop()
+    if st.session_state.get(PERF_KEY):
+        return tracing.start(page)
+    return None
+
+
+def performance_toggle() -> bool:
+    import streamlit as st
+
+    return st.sidebar.toggle("Performance breakdown", key=PERF_KEY, help="Time every stage of this rerun")
+
+
+def performance_expander(trace: Optional[Trace]) -> None:
+    """
+    "Performance" expander: per-span totals of the current rerun and a Chrome trace download.
+    """
+    if trace is None:
+        return
+    import streamlit as st
+
+    tracing.stop()
+    summary = trace.summary()
+    with st.expander("Performance", expanded=True):
+        if summary.empty:
+            st.caption("No spans recorded in this rerun.")
+            return
+        top = [e for e in trace.events if e["depth"] == 0]
+        wall_ms = sum(e["dur_ns"] for e in top) / 1e6
+        st.caption(f"{len(trace.events)} spans, {wall_ms:,.1f} ms in traced top-level stages.")
+        st.dataframe(
+            summary.style.format({"total_ms": "{:,.2f}", "self_ms": "{:,.2f}", "share": "{:.1%}"}),
+            width="stretch",
+        )
+        st.download_button(
+            "⬇️ Chrome trace (JSON)",
+            data=json.dumps(trace.to_chrome()),
+            file_name=f"{trace.name}_trace.json",
+            mime="application/json",
+            help="Open in chrome://tracing or ui.perfetto.dev",
+        )